@@ -1,296 +1,440 @@
+import functools
+
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
 
 # Set page config
 st.set_page_config(page_title="Sales Dashboard", layout="wide")
 
-# --- Data Generation ---
-def generate_mock_data1():
-    np.random.seed(42)
-    dates = pd.date_range(start='2024-01-01', periods=90, freq='D')
-    salespeople = ['Alice', 'Bob', 'Charlie', 'David', 'Eva']
-    regions = ['North', 'South', 'East', 'West']
-    stages = ['Prospecting', 'First Contact', 'Qualified Leads', 'Demo', 'Closed Won', 'Closed Lost']
-    companies = ["Company A", "Company B", "Company C", "Company D", "Company E"]
-    data = []
-    probabilities = [0.2, 0.2, 0.2, 0.2, 0.1, 0.1]
-    for date in dates:
-        for salesperson in salespeople:
-            data.append({
-                'Date': date,
-                'Salesperson': salesperson,
-                'Region': np.random.choice(regions),
-                'Revenue': np.random.randint(1000, 10000),
-                'Deals Closed': np.random.randint(0, 5),
-                'Pipeline Stage': np.random.choice(stages, p=probabilities),
-                'First Contact Made': np.random.randint(1, 20),
-                'Company': np.random.choice(companies),
-                'Opportunity Value': np.random.randint(5000, 50000),
-                'Orders Placed': np.random.randint(0, 5),
-                'Invoices Issued': np.random.randint(0, 5)
-            })
-    return pd.DataFrame(data)
-
-def generate_competition_data(num_days=30, salespeople=None):
-    if salespeople is None:
-        salespeople = ['Alice', 'Bob', 'Charlie', 'David', 'Eva']
-    dates = pd.date_range(end=pd.Timestamp.now(), periods=num_days)
-    data = []
-    for date in dates:
-        for salesperson in salespeople:
-            sales = np.random.randint(0, 10)
-            revenue = np.random.randint(1000, 10000) * sales
-            leads = np.random.randint(0, 5)
-            customer_reviews = np.random.randint(0, 3)
-            data.append({
-                "Date": date,
-                "Salesperson": salesperson,
-                "Sales": sales,
-                "Revenue": revenue,
-                "Leads": leads,
-                "Customer Reviews": customer_reviews
-            })
-    return pd.DataFrame(data)
-
-def generate_activity_data(num_days=30, salespeople=None):
-    if salespeople is None:
-        salespeople = ['Alice', 'Bob', 'Charlie', 'David', 'Eva']
-    dates = pd.date_range(end=pd.Timestamp.now(), periods=num_days)
-    data = []
-    for date in dates:
-        for salesperson in salespeople:
-            calls = np.random.randint(5, 20)
-            emails = np.random.randint(10, 30)
-            demos = np.random.randint(0, 3)
-            social_interactions = np.random.randint(2, 15)
-            data.append({
-                "Date": date,
-                "Salesperson": salesperson,
-                "Calls": calls,
-                "Emails": emails,
-                "Demos": demos,
-                "Social Interactions": social_interactions,
-            })
-    return pd.DataFrame(data)
-
-
-def generate_opportunities_data(num_opportunities=100, salespeople=None):
-    if salespeople is None:
-        salespeople = ['Alice', 'Bob', 'Charlie', 'David', 'Eva']
-    stages = ['Prospecting', 'First Contact', 'Qualified Leads', 'Demo', 'Closed Won', 'Closed Lost']
-    sources = ['Webinar', 'Referral', 'Cold Call', 'Social Media', 'Advertisement']
-    data = []
-    for i in range(num_opportunities):
-        data.append({
-            'Opportunity ID': f'OPP-{i+1:03}',
-            'Salesperson': np.random.choice(salespeople),
-            'Stage': np.random.choice(stages),
-            'Value': np.random.randint(10000, 100000),
-            'Source': np.random.choice(sources),
-            'Weighted Value': 0,  # Placeholder, will be calculated later
-        })
-    df = pd.DataFrame(data)
-    # Calculate weighted value
-    stage_weights = {'Prospecting': 0.1, 'First Contact': 0.25, 'Qualified Leads': 0.5, 'Demo': 0.75, 'Closed Won': 1.0, 'Closed Lost': 0.0}
-    df['Weighted Value'] = df.apply(lambda row: row['Value'] * stage_weights[row['Stage']], axis=1)
-    return df
-
-def generate_recruitment_data(num_jobs=5, num_applicants=100):
-    jobs = [f'Job {i+1}' for i in range(num_jobs)]
-    stages = ['Applied', 'Screening', 'Interview', 'Offer', 'Hired']
-    sources = ['LinkedIn', 'Indeed', 'Company Website', 'Referral']
-    data = []
-    for i in range(num_applicants):
-        job = np.random.choice(jobs)
-        stage = np.random.choice(stages)
-        source = np.random.choice(sources)
-        days_to_hire = np.random.randint(10, 60)
-        data.append({
-            'Applicant ID': f'APP-{i+1:03}',
-            'Job': job,
-            'Stage': stage,
-            'Source': source,
-            'Days to Hire': days_to_hire,
-        })
-    return pd.DataFrame(data)
-
-def generate_aircall_data(num_calls=200, salespeople=None):
-    if salespeople is None:
-        salespeople = ['Alice', 'Bob', 'Charlie', 'David', 'Eva']
-    data = []
-    for i in range(num_calls):
-        data.append({
-            'Call ID': f'CALL-{i+1:03}',
-            'Salesperson': np.random.choice(salespeople),
-            'Call Time (seconds)': np.random.randint(30, 300),
-            'Wait Time (seconds)': np.random.randint(0, 60),
-            'Missed Call': np.random.choice([True, False], p=[0.1, 0.9]),
-        })
-    return pd.DataFrame(data)
-
-def generate_product_performance_data():
-    np.random.seed(42)
-    dates = pd.date_range(start='2024-01-01', periods=12, freq='MS')  # Monthly data
-    products = ['Product_1', 'Product_2', 'Product_3', 'Product_4', 'Product_5']
-    data = []
-    for date in dates:
-        for product in products:
-            revenue = np.random.randint(50000, 300000)  # Random revenue per month
-            data.append({'Date': date, 'Product': product, 'Revenue': revenue})
-    return pd.DataFrame(data)
-
-
-df_pipeline = generate_mock_data1()
-df_competition = generate_competition_data()
-df_activity = generate_activity_data()
-df_opportunities = generate_opportunities_data()
-df_recruitment = generate_recruitment_data()
-df_aircall = generate_aircall_data()
-df_product_performance = generate_product_performance_data()
-
-
 # --- Sidebar Filters ---
+# Drawn before the data layer, pandas and the chart modules are imported, so
+# the sidebar appears while a new process is still importing them; Plotly is
+# only imported by the first chart (chart_rendering.px).
 st.sidebar.header("Filters")
 tab_select = st.sidebar.radio(
     "Select Dashboard:", ("Sales Pipeline", "Sales Competition", "Sales Activity", "Sales Opportunities", "Sales Recruitment", "Aircall", "Product Performance")
 )
 
+import pandas as pd
+
+# --- Data Access ---
+# Tables are loaded lazily inside each tab branch through a process-wide cache,
+# so a rerun only materializes the tables of the selected tab. Each tab asks
+# only for the columns it uses and passes its filters down to the source.
+from data_layer import (
+    begin_rerun,
+    cached_result,
+    inflight_stats,
+    load_competition_rollup,
+    load_contingency,
+    load_forecast_engine,
+    load_pipeline_cube,
+    load_roster,
+    load_stream,
+    load_transition_index,
+    load_table,
+    load_weighting_engine,
+    pipeline_query,
+    result_cache,
+    table_bounds,
+    table_cache,
+    table_values,
+)
+from competition_state import competition_state
+from snapshot import record_figure, snapshot_reader
+from panels import Panels, once
+from scenarios import SCENARIO_DIMENSIONS, Scenario, ScenarioEngine
+from forecasting import FORECAST_INTERVAL
+
+# With SALES_DASHBOARD_BACKEND=duckdb the stage, leaderboard, activity and
+# product totals are computed in SQL instead (sql_backend.py).
+from sql_backend import sql_backend
+
+# With SALES_DASHBOARD_WORKERS=N the Sales Pipeline cube queries run on N
+# worker processes (aggregation_service.py).
+from aggregation_service import aggregation_service
+
+rerun_stats = begin_rerun()
+
+# --- Chart Rendering ---
+# Long line series are downsampled and histograms pre-binned before a figure
+# is built; show_chart() records each figure's serialized size.
+from chart_rendering import downsample, figure_bytes, figure_points, histogram_bins, histogram_figure, px
+
+chart_payloads = []
+
+
+def show_chart(fig, container=st, **kwargs):
+    title = fig.layout.title.text or kwargs.get("key", "Chart")
+    with profiler.stage(f"render: {title}"):
+        chart_payloads.append((title, figure_points(fig), figure_bytes(fig)))
+        record_figure(tab_select, title, fig)
+        container.plotly_chart(fig, **kwargs)
+
+
+# --- Profiling ---
+# Stages below are timed only when profiling is on (SALES_DASHBOARD_PROFILE=1
+# or ?profile=1); otherwise profiler.stage() is a shared no-op.
+from profiling import PROFILE_ENV, Profiler
+
+profiler = Profiler(
+    enabled=PROFILE_ENV or st.query_params.get("profile") == "1", tab=tab_select
+)
+
+# --- Salesperson Filter ---
+# Salespeople are picked through the roster hierarchy: rep region, then team,
+# then salesperson, each narrowing the options of the next. An empty level
+# means all of it, so the widgets hold only what was picked; the selection is
+# expanded to the member salespeople here, on the server.
+def salesperson_filter(table, salespeople, key):
+    roster = load_roster(table, salespeople)
+    regions = st.sidebar.multiselect(
+        "Select Rep Region", roster.regions, key=f"{key}_rep_regions", placeholder="All regions"
+    )
+    teams = st.sidebar.multiselect(
+        "Select Team", roster.team_options(regions), key=f"{key}_teams", placeholder="All teams"
+    )
+    chosen = st.sidebar.multiselect(
+        "Select Salesperson",
+        roster.salesperson_options(regions, teams),
+        key=f"{key}_salespeople",
+        placeholder="All salespeople",
+    )
+    return roster.expand(regions, teams, chosen)
+
+
 if tab_select == "Sales Pipeline":
     # ... (Sales Pipeline Dashboard code remains the same)
-    start_date = st.sidebar.date_input("Start Date", df_pipeline["Date"].min())
-    end_date = st.sidebar.date_input("End Date", df_pipeline["Date"].max())
-    selected_sales_rep = st.sidebar.multiselect(
-        "Select Sales Rep",
-        df_pipeline["Salesperson"].unique(),
-        default=df_pipeline["Salesperson"].unique(),
-    )
+    pipeline_start, pipeline_end = table_bounds("pipeline")
+    pipeline_reps = table_values("pipeline", "Salesperson")
+    pipeline_regions = table_values("pipeline", "Region")
+    start_date = st.sidebar.date_input("Start Date", pipeline_start)
+    end_date = st.sidebar.date_input("End Date", pipeline_end)
+    selected_sales_rep = salesperson_filter("pipeline", pipeline_reps, "pipeline")
     selected_region = st.sidebar.multiselect(
         "Select Region",
-        df_pipeline["Region"].unique(),
-        default=df_pipeline["Region"].unique(),
+        pipeline_regions,
+        default=pipeline_regions,
     )
 
     # Apply Filters
-    df_filtered = df_pipeline[
-        (df_pipeline["Salesperson"].isin(selected_sales_rep))
-        & (df_pipeline["Region"].isin(selected_region))
-        & (df_pipeline["Date"] >= pd.Timestamp(start_date))
-        & (df_pipeline["Date"] <= pd.Timestamp(end_date))
-    ].copy()
+    # Every chart below is answered from the rollup cube, not the raw rows,
+    # and served from the result cache when this filter state was seen
+    # before; the cube is only queried on a miss, on the aggregation
+    # service's workers when SALES_DASHBOARD_WORKERS is set. Figures are
+    # cached the same way, so sessions on the same filters build each once.
+    with profiler.stage("load") as stage:
+        pipeline_cube = load_pipeline_cube()
+        stage.rows(len(pipeline_cube.cells))
+    pipeline_filters = {
+        "Salesperson": selected_sales_rep,
+        "Region": selected_region,
+        "Date": (start_date, end_date),
+    }
+
+    @once
+    def filtered_cells():
+        with profiler.stage("filter", rows_in=len(pipeline_cube.cells)) as stage:
+            cells = pipeline_cube.select(selected_sales_rep, selected_region, start_date, end_date)
+            stage.rows(len(cells))
+        return cells
+
+    def pipeline_result(name, compute, **params):
+        return cached_result(
+            "Sales Pipeline", name, ["pipeline"], {**pipeline_filters, **params}, compute
+        )
+
+    # Close ratio, sales cycle, conversion and time in stage come from the
+    # stage-transition history over the same window and selection.
+    cycle_window = {
+        "start": start_date,
+        "end": end_date,
+        "salespeople": selected_sales_rep,
+        "regions": selected_region,
+    }
+
+    def cycle_result(name, compute):
+        return cached_result("Sales Pipeline", name, ["stage_transitions"], pipeline_filters, compute)
+
+    # Each section below is a panel: its aggregate and figure are built on
+    # the panel pool while the page already shows every heading, and it is
+    # drawn as soon as it is ready (see panels.py). Scenario Analysis and
+    # Orders vs. Invoices are below the fold and only built while open.
+    # Profiled reruns compute the panels serially, so each stage's traced
+    # memory is its own.
+    panels = Panels(serial=profiler.enabled)
 
     # Weekly Sales Activity
     st.subheader("📈 First Contacts")
-    df_monthly_contacts = (
-        df_filtered.resample("ME", on="Date").sum().reset_index()
-    )
-    fig_contacts = px.line(
-        df_monthly_contacts,
-        x="Date",
-        y="First Contact Made",
-        title="First Contacts Made",
-        markers=True,
-    )
-    st.plotly_chart(fig_contacts, use_container_width=True)
+
+    def first_contacts_panel():
+        with profiler.stage("aggregate: first contacts") as stage:
+            df_monthly_contacts = pipeline_result(
+                "first contacts",
+                lambda: pipeline_query("cube_monthly", pipeline_filters, column="First Contact Made"),
+            )
+            stage.rows(len(df_monthly_contacts))
+        with profiler.stage("figure: First Contacts Made"):
+            return pipeline_result(
+                "first contacts figure",
+                lambda: px.line(
+                    df_monthly_contacts,
+                    x="Date",
+                    y="First Contact Made",
+                    title="First Contacts Made",
+                    markers=True,
+                ),
+            )
+
+    panels.add("First Contacts", first_contacts_panel, lambda fig: show_chart(fig, width="stretch"))
 
     # Demo by Rep
     st.subheader("🎥 Demos by Sales Rep")
     selected_demo_rep = st.selectbox(
-        "Select Sales Rep for Demos", df_pipeline["Salesperson"].unique()
-    )
-    demo_data = (
-        df_filtered[df_filtered["Salesperson"] == selected_demo_rep]
-        .groupby(["Salesperson", "Company"])
-        .agg({"Revenue": "sum", "Deals Closed": "sum"})
-        .reset_index()
+        "Select Sales Rep for Demos", pipeline_reps
     )
-    st.dataframe(demo_data, use_container_width=True)
+
+    def demos_panel():
+        with profiler.stage("aggregate: demos") as stage:
+            demo_data = pipeline_result(
+                "demos",
+                lambda: pipeline_query(
+                    "cube_totals",
+                    {
+                        **pipeline_filters,
+                        "Salesperson": [rep for rep in selected_sales_rep if rep == selected_demo_rep],
+                    },
+                    keys=["Salesperson", "Company"],
+                    columns=["Revenue", "Deals Closed"],
+                ),
+                demo_rep=selected_demo_rep,
+            )
+            stage.rows(len(demo_data))
+        return demo_data
+
+    panels.add("Demos", demos_panel, lambda demo_data: st.dataframe(demo_data, width="stretch"))
 
     # Highest Value Opportunity
     st.subheader("💰 Highest Value Opportunity")
-    highest_opportunity = df_filtered.loc[
-        df_filtered["Opportunity Value"].idxmax()
-    ]
-    st.metric("Company", highest_opportunity["Company"])
-    st.metric("Value", f"₹{highest_opportunity['Opportunity Value']:,.2f}")
+
+    def draw_highest_opportunity(highest_opportunity):
+        st.metric("Company", highest_opportunity["Company"])
+        st.metric("Value", f"₹{highest_opportunity['Opportunity Value']:,.2f}")
+
+    panels.add(
+        "Highest Value Opportunity",
+        lambda: pipeline_result("highest opportunity", lambda: pipeline_query("cube_highest", pipeline_filters)),
+        draw_highest_opportunity,
+    )
 
     # Performance This Quarter
     st.subheader("📊 Performance This Quarter")
-    pipeline_data = (
-        df_filtered.groupby("Pipeline Stage")["Revenue"].sum().reset_index()
-    )
-    fig_pipeline = px.bar(
-        pipeline_data,
-        x="Pipeline Stage",
-        y="Revenue",
-        title="Pipeline Breakdown by Stage",
-        color="Pipeline Stage",
-    )
-    st.plotly_chart(fig_pipeline, use_container_width=True)
+
+    def stages_panel():
+        with profiler.stage("aggregate: stages") as stage:
+            pipeline_data = pipeline_result(
+                "stages",
+                lambda: sql_backend.stage_totals(pipeline_filters)
+                if sql_backend.enabled
+                else pipeline_query("cube_totals", pipeline_filters, keys="Pipeline Stage", columns="Revenue"),
+            )
+            stage.rows(len(pipeline_data))
+        with profiler.stage("figure: Pipeline Breakdown by Stage"):
+            return pipeline_result(
+                "stages figure",
+                lambda: px.bar(
+                    pipeline_data,
+                    x="Pipeline Stage",
+                    y="Revenue",
+                    title="Pipeline Breakdown by Stage",
+                    color="Pipeline Stage",
+                ),
+            )
+
+    panels.add("Pipeline Breakdown", stages_panel, lambda fig: show_chart(fig, width="stretch"))
 
     # Close Ratio & Average Sales Cycle
     st.subheader("🔍 Key Performance Indicators")
-    total_deals = df_filtered["Deals Closed"].sum()
-    closed_won_deals = df_filtered[
-        df_filtered["Pipeline Stage"] == "Closed Won"
-    ]["Deals Closed"].sum()
-    close_ratio = (
-        (closed_won_deals / total_deals) * 100 if total_deals > 0 else 0
-    )
-    average_cycle_length = np.random.randint(30, 90)
-
-    col6, col7 = st.columns([2, 1])
-    fig_donut = px.pie(
-        values=[close_ratio, 100 - close_ratio],
-        names=["Closed Won", "Others"],
-        title="Close Ratio",
-        hole=0.5,
-    )
-    col6.plotly_chart(fig_donut, use_container_width=True)
-    col7.metric("⏳ Avg Sales Cycle (days)", f"{average_cycle_length}", delta=None)
-
-    st.subheader("🔮 Scenario Analysis: Revenue Comparison")
-    adjusted_growth = st.slider("Expected Revenue Growth (%)", -50, 100, 10)
-    df_filtered.loc[:, "Projected Revenue"] = df_filtered["Revenue"] * (
-        1 + adjusted_growth / 100
-    )
-
-    melted_projection = df_filtered[
-        ["Salesperson", "Revenue", "Projected Revenue"]
-    ].melt(id_vars="Salesperson", var_name="Revenue Type", value_name="Revenue Value")
 
-    fig_comparison = px.bar(
-        melted_projection,
-        x="Salesperson",
-        y="Revenue Value",
-        color="Revenue Type",
-        barmode="group",
-        title="Original vs. Projected Revenue by Salesperson",
-        labels={
-            "Revenue Value": "Revenue",
-            "Salesperson": "Salesperson",
-            "Revenue Type": "Revenue Type",
-        },
-    )
-    st.plotly_chart(
-        fig_comparison, use_container_width=True, key="projection_comparison_chart"
-    )
+    def kpi_panel():
+        with profiler.stage("aggregate: close ratio"):
+            close_ratio = cycle_result(
+                "close ratio", lambda: load_transition_index().close_ratio(**cycle_window)
+            )["close_ratio"]
+        with profiler.stage("aggregate: sales cycle") as stage:
+            cycle_lengths = cycle_result(
+                "cycle lengths", lambda: load_transition_index().cycle_lengths(**cycle_window)
+            )
+            stage.rows(len(cycle_lengths))
+        average_cycle_length = f"{cycle_lengths.mean():.1f}" if len(cycle_lengths) else "–"
+        fig_donut = px.pie(
+            values=[close_ratio, 100 - close_ratio],
+            names=["Closed Won", "Others"],
+            title="Close Ratio",
+            hole=0.5,
+        )
+        return fig_donut, average_cycle_length
+
+    def draw_kpis(kpis):
+        fig_donut, average_cycle_length = kpis
+        col6, col7 = st.columns([2, 1])
+        show_chart(fig_donut, container=col6, width="stretch")
+        col7.metric("⏳ Avg Sales Cycle (days)", f"{average_cycle_length}", delta=None)
+
+    panels.add("Key Performance Indicators", kpi_panel, draw_kpis)
+
+    cycle_section = panels.deferred("⏱️ Sales Cycle", key="pipeline_cycle")
+    if cycle_section is not None:
+        def cycle_panel():
+            with profiler.stage("aggregate: sales cycle details"):
+                transitions = load_transition_index()
+                cycle_bins = cycle_result(
+                    "cycle length bins",
+                    lambda: histogram_bins(transitions.cycle_lengths(**cycle_window)).rename(
+                        columns={"Bin Start": "Cycle Length (days)"}
+                    ),
+                )
+                conversion = cycle_result("conversion rates", lambda: transitions.conversion_rates(**cycle_window))
+                time_in_stage = cycle_result("time in stage", lambda: transitions.time_in_stage(**cycle_window))
+                by_salesperson = cycle_result(
+                    "cycle by salesperson", lambda: transitions.summary_by("Salesperson", **cycle_window)
+                )
+            with profiler.stage("figure: Sales Cycle"):
+                fig_cycle = histogram_figure(cycle_bins, "Cycle Length (days)", "Won Deal Cycle Length")
+                fig_conversion = px.bar(
+                    conversion, x="Stage", y="Conversion Rate", title="Stage Conversion Rate (%)"
+                )
+                fig_time_in_stage = px.bar(
+                    time_in_stage, x="Stage", y=["Mean Days", "Median Days"], barmode="group", title="Time in Stage"
+                )
+            return fig_cycle, fig_conversion, fig_time_in_stage, by_salesperson
+
+        def draw_cycle(cycle):
+            fig_cycle, fig_conversion, fig_time_in_stage, by_salesperson = cycle
+            show_chart(fig_cycle, width="stretch")
+            col8, col9 = st.columns(2)
+            show_chart(fig_conversion, container=col8, width="stretch")
+            show_chart(fig_time_in_stage, container=col9, width="stretch")
+            st.dataframe(by_salesperson, width="stretch", hide_index=True)
+
+        panels.add("Sales Cycle", cycle_panel, draw_cycle, container=cycle_section)
+
+    scenario_section = panels.deferred("🔮 Scenario Analysis: Revenue Comparison", key="pipeline_scenarios")
+    if scenario_section is not None:
+        with scenario_section:
+            adjusted_growth = st.slider("Expected Revenue Growth (%)", -50, 100, 10)
+            # Further scenarios and per-rep / per-region adjustments
+            # (percentage points on top of every scenario's rate); all of it
+            # runs on the pre-aggregated revenue, so editing costs nothing
+            # per row.
+            with st.popover("🧪 Scenario Settings"):
+                growth_range = st.slider("Growth Range (± %)", 0, 50, 0)
+                extra_scenarios = st.data_editor(
+                    pd.DataFrame({
+                        "Scenario": pd.Series(dtype=str),
+                        "Growth (%)": pd.Series(dtype=float),
+                        "Range (± %)": pd.Series(dtype=float),
+                    }),
+                    num_rows="dynamic",
+                    hide_index=True,
+                    key="scenario_extra",
+                )
+                rep_growth, region_growth = (
+                    st.data_editor(
+                        pd.DataFrame({dimension: table_values("pipeline", dimension), "Adjustment (%)": 0.0}),
+                        disabled=[dimension],
+                        hide_index=True,
+                        key=f"scenario_{dimension}",
+                    )
+                    for dimension in SCENARIO_DIMENSIONS
+                )
+        adjustments = {
+            "rep_growth": dict(zip(rep_growth["Salesperson"], rep_growth["Adjustment (%)"].fillna(0))),
+            "region_growth": dict(zip(region_growth["Region"], region_growth["Adjustment (%)"].fillna(0))),
+        }
+        scenarios = [Scenario("Projected Revenue", adjusted_growth, growth_range, **adjustments)] + [
+            Scenario(row["Scenario"], row["Growth (%)"], abs(row["Range (± %)"]), **adjustments)
+            for row in extra_scenarios.fillna({"Growth (%)": 0.0, "Range (± %)": 0.0}).to_dict("records")
+            if row["Scenario"]
+        ]
+
+        def scenario_panel():
+            with profiler.stage("aggregate: scenario engine") as stage:
+                scenario_engine = pipeline_result("scenario engine", lambda: ScenarioEngine(filtered_cells()))
+                stage.rows(len(scenario_engine.revenue_by_rep))
+            with profiler.stage("aggregate: scenario") as stage:
+                # Cached per scenario set, like the engine per filter state.
+                melted_projection = pipeline_result(
+                    "scenario comparison",
+                    lambda: scenario_engine.comparison(scenarios),
+                    scenarios=tuple(
+                        (
+                            scenario.name,
+                            scenario.growth,
+                            scenario.spread,
+                            tuple(sorted(scenario.rep_growth.items())),
+                            tuple(sorted(scenario.region_growth.items())),
+                        )
+                        for scenario in scenarios
+                    ),
+                )
+                stage.rows(len(melted_projection))
+            with_range = bool(melted_projection["Range Above"].any() or melted_projection["Range Below"].any())
+
+            with profiler.stage("figure: Original vs. Projected Revenue by Salesperson"):
+                return px.bar(
+                    melted_projection,
+                    x="Salesperson",
+                    y="Revenue Value",
+                    color="Revenue Type",
+                    barmode="group",
+                    error_y="Range Above" if with_range else None,
+                    error_y_minus="Range Below" if with_range else None,
+                    title="Original vs. Projected Revenue by Salesperson",
+                    labels={
+                        "Revenue Value": "Revenue",
+                        "Salesperson": "Salesperson",
+                        "Revenue Type": "Revenue Type",
+                    },
+                )
+
+        panels.add(
+            "Scenario Analysis",
+            scenario_panel,
+            lambda fig: show_chart(fig, width="stretch", key="projection_comparison_chart"),
+            container=scenario_section,
+        )
 
     # Order vs. Invoice Tracking
-    st.subheader("📑 Orders vs. Invoices")
-    order_invoice_data = df_filtered.groupby("Date").agg(
-        {"Orders Placed": "sum", "Invoices Issued": "sum"}
-    ).reset_index()
-
-    fig_area = px.area(
-        order_invoice_data,
-        x="Date",
-        y=["Orders Placed", "Invoices Issued"],
-        labels={"value": "Count", "Date": "Date"},
-    )
+    orders_section = panels.deferred("📑 Orders vs. Invoices", key="pipeline_orders")
+    if orders_section is not None:
+        def orders_panel():
+            with profiler.stage("aggregate: orders vs invoices") as stage:
+                order_invoice_data = pipeline_result(
+                    "orders vs invoices",
+                    lambda: pipeline_query(
+                        "cube_totals", pipeline_filters, keys="Date", columns=["Orders Placed", "Invoices Issued"]
+                    ),
+                )
+                stage.rows(len(order_invoice_data))
+            with profiler.stage("figure: Orders vs. Invoices"):
+                return pipeline_result(
+                    "orders vs invoices figure",
+                    lambda: px.area(
+                        order_invoice_data,
+                        x="Date",
+                        y=["Orders Placed", "Invoices Issued"],
+                        labels={"value": "Count", "Date": "Date"},
+                    ),
+                )
+
+        panels.add(
+            "Orders vs. Invoices",
+            orders_panel,
+            lambda fig: show_chart(fig, width="stretch", key="orders_area_chart"),
+            container=orders_section,
+        )
 
-    st.plotly_chart(fig_area, use_container_width=True, key="orders_area_chart")
+    panels.render()
     st.success("🚀 Dashboard updated with enhanced pipeline insights!")
 
 elif tab_select == "Sales Competition":
@@ -300,106 +444,141 @@ elif tab_select == "Sales Competition":
         ["Sales Leaderboard", "Individual Performance", "Raffle/Golf", "Team A vs Team B"],
     )
     selected_date_range = st.sidebar.date_input(
-        "Date Range", [df_competition["Date"].min(), df_competition["Date"].max()]
+        "Date Range", list(table_bounds("competition"))
     )
     start_date, end_date = selected_date_range
 
-    df_filtered = df_competition[
-        (df_competition["Date"] >= pd.Timestamp(start_date))
-        & (df_competition["Date"] <= pd.Timestamp(end_date))
-    ]
+    # Every view reads the competition rollup: prefix sums per day and
+    # salesperson, so a date range's totals are a subtraction per
+    # salesperson, however many days the competition has run. Figures are
+    # cached with the frames they draw, so sessions viewing the same range
+    # build each once.
+    with profiler.stage("load") as stage:
+        competition = load_competition_rollup()
+        stage.rows(competition.num_days)
 
     if competition_type == "Sales Leaderboard":
         st.subheader("📊 Sales Leaderboard")
-        leaderboard = (
-            df_filtered.groupby("Salesperson")
-            .agg({"Revenue": "sum", "Sales": "sum"})
-            .sort_values(by="Revenue", ascending=False)
-            .reset_index()
-        )
-        st.dataframe(leaderboard, use_container_width=True)
-
-        fig_leaderboard = px.bar(
-            leaderboard, x="Salesperson", y="Revenue", title="Revenue Leaderboard"
-        )
-        st.plotly_chart(fig_leaderboard, use_container_width=True)
+        with profiler.stage("aggregate: leaderboard") as stage:
+            leaderboard = cached_result(
+                "Sales Competition",
+                "leaderboard",
+                ["competition"],
+                {"Date": (start_date, end_date)},
+                lambda: sql_backend.leaderboard(start_date, end_date)
+                if sql_backend.enabled
+                else competition.leaderboard(start_date, end_date),
+            )
+            stage.rows(len(leaderboard))
+        st.dataframe(leaderboard, width="stretch")
+
+        with profiler.stage("figure: Revenue Leaderboard"):
+            fig_leaderboard = cached_result(
+                "Sales Competition",
+                "leaderboard figure",
+                ["competition"],
+                {"Date": (start_date, end_date)},
+                lambda: px.bar(leaderboard, x="Salesperson", y="Revenue", title="Revenue Leaderboard"),
+            )
+        show_chart(fig_leaderboard, width="stretch")
 
     elif competition_type == "Individual Performance":
         st.subheader("📈 Individual Performance")
         selected_salesperson = st.selectbox(
-            "Select Salesperson", df_filtered["Salesperson"].unique()
+            "Select Salesperson", competition.salespeople_in(start_date, end_date)
         )
-        individual_data = df_filtered[
-            df_filtered["Salesperson"] == selected_salesperson
-        ].set_index("Date")
+        with profiler.stage("aggregate: salesperson") as stage:
+            individual_data = competition.daily(start_date, end_date, [selected_salesperson])
+            stage.rows(len(individual_data))
 
         st.write(f"### {selected_salesperson}'s Performance")
         col1, col2 = st.columns(2)
         col1.metric("Total Revenue", f"₹{individual_data['Revenue'].sum():,.2f}")
         col2.metric("Total Sales", individual_data["Sales"].sum())
 
-        fig_revenue = px.line(
-            individual_data,
-            y="Revenue",
-            title=f"{selected_salesperson} Revenue Over Time",
-        )
-        st.plotly_chart(fig_revenue, use_container_width=True)
-
-        fig_sales = px.line(
-            individual_data,
-            y="Sales",
-            title=f"{selected_salesperson} Sales Over Time",
-        )
-        st.plotly_chart(fig_sales, use_container_width=True)
+        with profiler.stage("figure: Revenue Over Time", rows_in=len(individual_data)):
+            fig_revenue = px.line(
+                downsample(individual_data, "Date", "Revenue"),
+                x="Date",
+                y="Revenue",
+                title=f"{selected_salesperson} Revenue Over Time",
+            )
+        show_chart(fig_revenue, width="stretch")
+
+        with profiler.stage("figure: Sales Over Time", rows_in=len(individual_data)):
+            fig_sales = px.line(
+                downsample(individual_data, "Date", "Sales"),
+                x="Date",
+                y="Sales",
+                title=f"{selected_salesperson} Sales Over Time",
+            )
+        show_chart(fig_sales, width="stretch")
 
     elif competition_type == "Raffle/Golf":
         st.subheader("🎟️ Raffle/Golf Competition")
-        golf_balls = (
-            df_filtered[df_filtered["Revenue"] > 5000]
-            .groupby("Salesperson")["Revenue"]
-            .count()
-            .reset_index()
-        )
-        golf_balls.rename(columns={"Revenue": "Golf Balls"}, inplace=True)
-        st.dataframe(golf_balls, use_container_width=True)
+        with profiler.stage("aggregate: golf balls") as stage:
+            golf_balls = competition.golf_balls(start_date, end_date)
+            stage.rows(len(golf_balls))
+        st.dataframe(golf_balls, width="stretch")
 
+        # One golf ball is one raffle ticket. The draw for this date range is
+        # persisted, so reruns and other sessions show the same winner.
         st.write("### Putt-Putt Golf Leaderboard")
-        winner = golf_balls.sample(n=1)
-        st.write(f"The winner is {winner['Salesperson'].values[0]}!")
+        if st.button("🎲 Redraw Winner"):
+            draw = competition_state.redraw(
+                start_date, end_date, golf_balls["Salesperson"], golf_balls["Golf Balls"]
+            )
+        else:
+            draw = competition_state.current_draw(
+                start_date, end_date, golf_balls["Salesperson"], golf_balls["Golf Balls"]
+            )
+        if draw["winner"] is None:
+            st.write("No golf balls in this date range.")
+        else:
+            st.write(f"The winner is {draw['winner']}!")
+        st.caption(f"Draw #{draw['id']}: {draw['tickets']:,} tickets, seed {draw['seed']}")
 
     elif competition_type == "Team A vs Team B":
         st.subheader("⚔️ Team A vs Team B")
-        salespeople = df_filtered["Salesperson"].unique()
-        team_a = np.random.choice(
-            salespeople, size=len(salespeople) // 2, replace=False
-        )
-        team_b = [person for person in salespeople if person not in team_a]
-
-        team_a_data = (
-            df_filtered[df_filtered["Salesperson"].isin(team_a)]
-            .groupby("Date")
-            .agg({"Revenue": "sum"})
-            .reset_index()
-        )
-        team_b_data = (
-            df_filtered[df_filtered["Salesperson"].isin(team_b)]
-            .groupby("Date")
-            .agg({"Revenue": "sum"})
-            .reset_index()
-        )
-
-        team_a_data["Team"] = "Team A"
-        team_b_data["Team"] = "Team B"
-        team_data = pd.concat([team_a_data, team_b_data])
-
-        fig_team = px.line(
-            team_data,
-            x="Date",
-            y="Revenue",
-            color="Team",
-            title="Team A vs Team B Revenue",
-        )
-        st.plotly_chart(fig_team, use_container_width=True)
+        # Teams come from the persisted roster; the series are cached per
+        # roster and date range.
+        salespeople = table_values("competition", "Salesperson")
+        if st.button("🔀 Reshuffle Teams"):
+            roster = competition_state.new_roster(salespeople)
+        else:
+            roster = competition_state.roster(salespeople)
+        team_a, team_b = roster["teams"]["Team A"], roster["teams"]["Team B"]
+        st.caption(f"Roster #{roster['id']} (seed {roster['seed']}): " + ", ".join(team_a) + " vs " + ", ".join(team_b))
+
+        with profiler.stage("aggregate: team revenue") as stage:
+            team_a_data, team_b_data = (
+                cached_result(
+                    "Sales Competition",
+                    f"{team} revenue",
+                    ["competition"],
+                    {"Date": (start_date, end_date), "roster": roster["id"]},
+                    lambda: competition.daily(start_date, end_date, members)[["Date", "Revenue"]],
+                )
+                for team, members in (("Team A", team_a), ("Team B", team_b))
+            )
+            team_data = pd.concat([team_a_data.assign(Team="Team A"), team_b_data.assign(Team="Team B")])
+            stage.rows(len(team_data))
+
+        with profiler.stage("figure: Team A vs Team B Revenue", rows_in=len(team_data)):
+            fig_team = cached_result(
+                "Sales Competition",
+                "team figure",
+                ["competition"],
+                {"Date": (start_date, end_date), "roster": roster["id"]},
+                lambda: px.line(
+                    downsample(team_data, "Date", "Revenue", color="Team"),
+                    x="Date",
+                    y="Revenue",
+                    color="Team",
+                    title="Team A vs Team B Revenue",
+                ),
+            )
+        show_chart(fig_team, width="stretch")
 
         team_a_total = team_a_data["Revenue"].sum()
         team_b_total = team_b_data["Revenue"].sum()
@@ -413,36 +592,61 @@ elif tab_select == "Sales Competition":
             st.write("Team B Wins!")
         else:
             st.write("It's a Tie!")
+
+    with st.expander("📜 Competition Audit Trail"):
+        st.dataframe(competition_state.audit(limit=20).iloc[::-1], width="stretch", hide_index=True)
     # --- Sales Activity Dashboard ---
 elif tab_select == "Sales Activity":
     st.title("🎯 Sales Activity Dashboard")
 
     # Filters
+    # Activity is answered from running daily aggregates that new events are
+    # folded into as they arrive.
+    with profiler.stage("load") as stage:
+        activity = load_stream("activity").aggregates
+        stage.rows(len(activity.daily))
+    activity_start, activity_end = activity.bounds()
+    activity_reps = activity.salespeople()
     start_date_activity = st.sidebar.date_input(
-        "Start Date", df_activity["Date"].min()
+        "Start Date", activity_start
     )
     end_date_activity = st.sidebar.date_input(
-        "End Date", df_activity["Date"].max()
-    )
-    selected_salespeople_activity = st.sidebar.multiselect(
-        "Select Salesperson",
-        df_activity["Salesperson"].unique(),
-        default=df_activity["Salesperson"].unique(),
+        "End Date", activity_end
     )
+    selected_salespeople_activity = salesperson_filter("activity", activity_reps, "activity")
 
     # Apply Filters
-    df_activity_filtered = df_activity[
-        (df_activity["Date"] >= pd.Timestamp(start_date_activity))
-        & (df_activity["Date"] <= pd.Timestamp(end_date_activity))
-        & (df_activity["Salesperson"].isin(selected_salespeople_activity))
-    ].copy()
+    # Results are cached per filter state and stream version; the daily
+    # aggregates are only filtered on a miss.
+    activity_filters = {
+        "Date": (start_date_activity, end_date_activity),
+        "Salesperson": selected_salespeople_activity,
+    }
+
+    @functools.cache
+    def filtered_activity():
+        with profiler.stage("filter", rows_in=len(activity.daily)) as stage:
+            rows = activity.select(
+                start_date_activity, end_date_activity, selected_salespeople_activity
+            )
+            stage.rows(len(rows))
+        return rows
+
+    def activity_result(name, compute):
+        return cached_result("Sales Activity", name, ["activity"], activity_filters, compute)
 
     # Aggregated Activity Metrics
     st.subheader("📊 Aggregated Activity")
-    total_calls = df_activity_filtered["Calls"].sum()
-    total_emails = df_activity_filtered["Emails"].sum()
-    total_demos = df_activity_filtered["Demos"].sum()
-    total_social = df_activity_filtered["Social Interactions"].sum()
+    activity_totals = activity_result(
+        "totals",
+        lambda: sql_backend.activity_totals(activity_filters)
+        if sql_backend.enabled
+        else filtered_activity()[["Calls", "Emails", "Demos", "Social Interactions"]].sum(),
+    )
+    total_calls = activity_totals["Calls"]
+    total_emails = activity_totals["Emails"]
+    total_demos = activity_totals["Demos"]
+    total_social = activity_totals["Social Interactions"]
 
     col1, col2, col3, col4 = st.columns(4)
     col1.metric("Total Calls", total_calls)
@@ -452,70 +656,116 @@ elif tab_select == "Sales Activity":
 
     # Activity Over Time
     st.subheader("📈 Activity Over Time")
-    activity_over_time = df_activity_filtered.groupby("Date").agg(
-        {"Calls": "sum", "Emails": "sum", "Demos": "sum", "Social Interactions": "sum"}
-    ).reset_index()
-    activity_over_time_melted = activity_over_time.melt(
-        id_vars="Date",
-        var_name="Activity Type",
-        value_name="Activity Count",
-    )
-    fig_activity_over_time = px.line(
-        activity_over_time_melted,
-        x="Date",
-        y="Activity Count",
-        color="Activity Type",
-        title="Sales Activity Over Time",
-    )
-    st.plotly_chart(fig_activity_over_time, use_container_width=True)
+    with profiler.stage("aggregate: activity over time") as stage:
+        activity_over_time_melted = activity_result(
+            "over time",
+            lambda: filtered_activity().groupby("Date").agg(
+                {"Calls": "sum", "Emails": "sum", "Demos": "sum", "Social Interactions": "sum"}
+            ).reset_index().melt(
+                id_vars="Date",
+                var_name="Activity Type",
+                value_name="Activity Count",
+            ),
+        )
+        stage.rows(len(activity_over_time_melted))
+    with profiler.stage("figure: Sales Activity Over Time"):
+        fig_activity_over_time = px.line(
+            downsample(activity_over_time_melted, "Date", "Activity Count", color="Activity Type"),
+            x="Date",
+            y="Activity Count",
+            color="Activity Type",
+            title="Sales Activity Over Time",
+        )
+    show_chart(fig_activity_over_time, width="stretch")
 
     # Activity by Salesperson
     st.subheader("🧑‍💼 Activity by Salesperson")
-    activity_by_salesperson = df_activity_filtered.groupby("Salesperson").agg(
-        {"Calls": "sum", "Emails": "sum", "Demos": "sum", "Social Interactions": "sum"}
-    ).reset_index()
-    activity_by_salesperson_melted = activity_by_salesperson.melt(
-        id_vars="Salesperson", var_name="Activity Type", value_name="Activity Count"
-    )
-    fig_activity_by_salesperson = px.bar(
-        activity_by_salesperson_melted,
-        x="Salesperson",
-        y="Activity Count",
-        color="Activity Type",
-        title="Sales Activity by Salesperson",
-    )
-    st.plotly_chart(fig_activity_by_salesperson, use_container_width=True)
+    with profiler.stage("aggregate: activity by salesperson") as stage:
+        activity_by_salesperson_melted = activity_result(
+            "by salesperson",
+            lambda: filtered_activity().groupby("Salesperson").agg(
+                {"Calls": "sum", "Emails": "sum", "Demos": "sum", "Social Interactions": "sum"}
+            ).reset_index().melt(
+                id_vars="Salesperson", var_name="Activity Type", value_name="Activity Count"
+            ),
+        )
+        stage.rows(len(activity_by_salesperson_melted))
+    with profiler.stage("figure: Sales Activity by Salesperson"):
+        fig_activity_by_salesperson = px.bar(
+            activity_by_salesperson_melted,
+            x="Salesperson",
+            y="Activity Count",
+            color="Activity Type",
+            title="Sales Activity by Salesperson",
+        )
+    show_chart(fig_activity_by_salesperson, width="stretch")
 
 elif tab_select == "Sales Opportunities":
     st.title("💰 Sales Opportunities Dashboard")
 
     # Filters
-    selected_salespeople_opp = st.sidebar.multiselect("Select Salesperson", df_opportunities["Salesperson"].unique(), default=df_opportunities["Salesperson"].unique())
-    selected_stages_opp = st.sidebar.multiselect("Select Stage", df_opportunities["Stage"].unique(), default=df_opportunities["Stage"].unique())
-    selected_sources_opp = st.sidebar.multiselect("Select Source", df_opportunities["Source"].unique(), default=df_opportunities["Source"].unique())
+    # Every breakdown is a slice of the opportunities' contingency tensor
+    # (counts and sums over Salesperson x Stage x Source), never a row scan.
+    with profiler.stage("load"):
+        opportunity_tensor = load_contingency("opportunities")
+    opp_reps = opportunity_tensor.labels["Salesperson"]
+    opp_stages = opportunity_tensor.labels["Stage"]
+    opp_sources = opportunity_tensor.labels["Source"]
+    selected_salespeople_opp = salesperson_filter("opportunities", opp_reps, "opportunities")
+    selected_stages_opp = st.sidebar.multiselect("Select Stage", opp_stages, default=opp_stages)
+    selected_sources_opp = st.sidebar.multiselect("Select Source", opp_sources, default=opp_sources)
+
+    # Weights are per session: a copy of the shared engine, re-copied when the
+    # opportunities table changes, with the sidebar edits applied to it.
+    opportunity_engine = load_weighting_engine()
+    weights = st.session_state.get("opportunity_weights")
+    if weights is None or weights.values is not opportunity_engine.values:
+        weights = opportunity_engine.copy()
+        st.session_state["opportunity_weights"] = weights
+    with st.sidebar.expander("⚖️ Opportunity Weights"):
+        for dimension in ("Stage", "Source", "Salesperson"):
+            edited = st.data_editor(
+                weights.weight_table(dimension),
+                disabled=[dimension],
+                hide_index=True,
+                key=f"weights_{dimension}",
+            )
+            weights.set_weights(dimension, dict(zip(edited[dimension], edited["Weight"])))
+
+    opportunity_filters = {
+        "Salesperson": selected_salespeople_opp,
+        "Stage": selected_stages_opp,
+        "Source": selected_sources_opp,
+    }
+
+    def opportunity_counts(column):
+        return cached_result(
+            "Sales Opportunities",
+            f"by {column}",
+            ["opportunities"],
+            opportunity_filters,
+            lambda: opportunity_tensor.counts_by(column, opportunity_filters),
+        )
 
-    df_opportunities_filtered = df_opportunities[
-        (df_opportunities["Salesperson"].isin(selected_salespeople_opp)) &
-        (df_opportunities["Stage"].isin(selected_stages_opp)) &
-        (df_opportunities["Source"].isin(selected_sources_opp))
-    ].copy()
+    with profiler.stage("aggregate: weighted totals"):
+        opportunity_totals = weights.totals(selected_salespeople_opp, selected_stages_opp, selected_sources_opp)
 
     # Total Opportunities
     st.subheader("Total Opportunities")
-    st.metric("Number of Opportunities", len(df_opportunities_filtered))
+    st.metric("Number of Opportunities", opportunity_totals["count"])
 
     # Total Value and Weighted Value
     st.subheader("Total Value and Weighted Value")
-    total_value = df_opportunities_filtered["Value"].sum()
-    total_weighted_value = df_opportunities_filtered["Weighted Value"].sum()
+    total_value = opportunity_totals["value"]
+    total_weighted_value = opportunity_totals["weighted_value"]
     col1, col2 = st.columns(2)
     col1.metric("Total Value", f"₹{total_value:,.2f}")
     col2.metric("Total Weighted Value", f"₹{total_weighted_value:,.2f}")
 
     # Opportunities by Stage (Colorful and Intuitive)
     st.subheader("Opportunities by Stage")
-    stage_counts = df_opportunities_filtered["Stage"].value_counts().reset_index()
-    stage_counts.columns = ["Stage", "Count"]
+    with profiler.stage("aggregate: by stage"):
+        stage_counts = opportunity_counts("Stage")
 
     fig_stage = px.bar(
         stage_counts,
@@ -526,12 +776,12 @@ elif tab_select == "Sales Opportunities":
         color_discrete_sequence=px.colors.qualitative.Pastel1, #added color
         labels={"Count": "Number of Opportunities", "Stage": "Sales Stage"}, #added better labels
     )
-    st.plotly_chart(fig_stage, use_container_width=True)
+    show_chart(fig_stage, width="stretch")
 
     # Opportunities by Source (Colorful and Intuitive)
     st.subheader("Opportunities by Source")
-    source_counts = df_opportunities_filtered["Source"].value_counts().reset_index()
-    source_counts.columns = ["Source", "Count"]
+    with profiler.stage("aggregate: by source"):
+        source_counts = opportunity_counts("Source")
 
     fig_source = px.bar(
         source_counts,
@@ -542,12 +792,12 @@ elif tab_select == "Sales Opportunities":
         color_discrete_sequence=px.colors.qualitative.Set2, #added color
         labels={"Count": "Number of Opportunities", "Source": "Opportunity Source"}, #added better labels
     )
-    st.plotly_chart(fig_source, use_container_width=True)
+    show_chart(fig_source, width="stretch")
 
     # Opportunities by Salesperson (Colorful and Intuitive)
     st.subheader("Opportunities by Salesperson")
-    salesperson_counts = df_opportunities_filtered["Salesperson"].value_counts().reset_index()
-    salesperson_counts.columns = ["Salesperson", "Count"]
+    with profiler.stage("aggregate: by salesperson"):
+        salesperson_counts = opportunity_counts("Salesperson")
 
     fig_salesperson = px.bar(
         salesperson_counts,
@@ -558,31 +808,49 @@ elif tab_select == "Sales Opportunities":
         color_discrete_sequence=px.colors.qualitative.Pastel1, #added color
         labels={"Count": "Number of Opportunities", "Salesperson": "Sales Representative"}, #added better labels
     )
-    st.plotly_chart(fig_salesperson, use_container_width=True)
+    show_chart(fig_salesperson, width="stretch")
 
 elif tab_select == "Sales Recruitment":
     st.title("🤝 Sales Recruitment Dashboard")
 
     # Filters
-    selected_jobs_rec = st.sidebar.multiselect("Select Job", df_recruitment["Job"].unique(), default=df_recruitment["Job"].unique())
-    selected_stages_rec = st.sidebar.multiselect("Select Stage", df_recruitment["Stage"].unique(), default=df_recruitment["Stage"].unique())
-    selected_sources_rec = st.sidebar.multiselect("Select Source", df_recruitment["Source"].unique(), default=df_recruitment["Source"].unique())
-
-    df_recruitment_filtered = df_recruitment[
-        (df_recruitment["Job"].isin(selected_jobs_rec)) &
-        (df_recruitment["Stage"].isin(selected_stages_rec)) &
-        (df_recruitment["Source"].isin(selected_sources_rec))
-    ].copy()
+    # Answered from the recruitment contingency tensor (counts and Days to
+    # Hire sums over Job x Stage x Source).
+    with profiler.stage("load"):
+        recruitment_tensor = load_contingency("recruitment")
+    rec_jobs = recruitment_tensor.labels["Job"]
+    rec_stages = recruitment_tensor.labels["Stage"]
+    rec_sources = recruitment_tensor.labels["Source"]
+    selected_jobs_rec = st.sidebar.multiselect("Select Job", rec_jobs, default=rec_jobs)
+    selected_stages_rec = st.sidebar.multiselect("Select Stage", rec_stages, default=rec_stages)
+    selected_sources_rec = st.sidebar.multiselect("Select Source", rec_sources, default=rec_sources)
+
+    recruitment_filters = {
+        "Job": selected_jobs_rec,
+        "Stage": selected_stages_rec,
+        "Source": selected_sources_rec,
+    }
+
+    def recruitment_result(name, compute):
+        return cached_result("Sales Recruitment", name, ["recruitment"], recruitment_filters, compute)
+
+    def recruitment_counts(column):
+        return recruitment_result(
+            f"by {column}",
+            lambda: recruitment_tensor.counts_by(column, recruitment_filters),
+        )
 
     # Average Days to Hire
     st.subheader("Average Days to Hire")
-    avg_days_to_hire = df_recruitment_filtered["Days to Hire"].mean()
+    avg_days_to_hire = recruitment_result(
+        "average days to hire", lambda: recruitment_tensor.mean("Days to Hire", recruitment_filters)
+    )
     st.metric("Average Days", f"{avg_days_to_hire:.2f} days")
 
     # Applicants by Job (Colorful and Intuitive)
     st.subheader("Applicants by Job")
-    job_counts = df_recruitment_filtered["Job"].value_counts().reset_index()
-    job_counts.columns = ["Job", "Count"]
+    with profiler.stage("aggregate: by job"):
+        job_counts = recruitment_counts("Job")
 
     fig_job = px.bar(
         job_counts,
@@ -593,12 +861,12 @@ elif tab_select == "Sales Recruitment":
         color_discrete_sequence=px.colors.qualitative.T10, #added color
         labels={"Count": "Number of Applicants", "Job": "Job Title"} #added better labels
     )
-    st.plotly_chart(fig_job, use_container_width=True)
+    show_chart(fig_job, width="stretch")
 
     # Applicants by Stage (Colorful and Intuitive)
     st.subheader("Applicants by Stage")
-    stage_counts = df_recruitment_filtered["Stage"].value_counts().reset_index()
-    stage_counts.columns = ["Stage", "Count"]
+    with profiler.stage("aggregate: by stage"):
+        stage_counts = recruitment_counts("Stage")
 
     fig_stage = px.bar(
         stage_counts,
@@ -609,12 +877,12 @@ elif tab_select == "Sales Recruitment":
         color_discrete_sequence=px.colors.qualitative.T10, #added color
         labels={"Count": "Number of Applicants", "Stage": "Recruitment Stage"} #added better labels
     )
-    st.plotly_chart(fig_stage, use_container_width=True)
+    show_chart(fig_stage, width="stretch")
 
     # Applicants by Source (Colorful and Intuitive)
     st.subheader("Applicants by Source")
-    source_counts = df_recruitment_filtered["Source"].value_counts().reset_index()
-    source_counts.columns = ["Source", "Count"]
+    with profiler.stage("aggregate: by source"):
+        source_counts = recruitment_counts("Source")
 
     fig_source = px.bar(
         source_counts,
@@ -625,66 +893,227 @@ elif tab_select == "Sales Recruitment":
         color_discrete_sequence=px.colors.qualitative.T10, #added color
         labels={"Count": "Number of Applicants", "Source": "Application Source"} #added better labels
     )
-    st.plotly_chart(fig_source, use_container_width=True)
+    show_chart(fig_source, width="stretch")
 
 elif tab_select == "Aircall":
     st.title("📞 Aircall Dashboard")
 
     # Filters
-    selected_salespeople_ac = st.sidebar.multiselect("Select Salesperson", df_aircall["Salesperson"].unique(), default=df_aircall["Salesperson"].unique())
-
-    df_aircall_filtered = df_aircall[df_aircall["Salesperson"].isin(selected_salespeople_ac)].copy()
+    # Calls are answered from running per-day, per-salesperson aggregates and
+    # talk/wait-time quantile sketches that new events are folded into as
+    # they arrive.
+    with profiler.stage("load"):
+        aircall = load_stream("aircall").aggregates
+    aircall_start, aircall_end = aircall.bounds()
+    aircall_reps = aircall.salespeople()
+    start_date_ac = st.sidebar.date_input("Start Date", aircall_start)
+    end_date_ac = st.sidebar.date_input("End Date", aircall_end)
+    selected_salespeople_ac = salesperson_filter("aircall", aircall_reps, "aircall")
+
+    # Results are cached per filter state and stream version.
+    aircall_filters = {
+        "Date": (start_date_ac, end_date_ac),
+        "Salesperson": selected_salespeople_ac,
+    }
+    aircall_window = (selected_salespeople_ac, start_date_ac, end_date_ac)
+
+    def aircall_result(name, compute):
+        return cached_result("Aircall", name, ["aircall"], aircall_filters, compute)
 
     # Metrics
     st.subheader("Call Metrics")
-    avg_talk_time = df_aircall_filtered["Call Time (seconds)"].mean()
-    avg_wait_time = df_aircall_filtered["Wait Time (seconds)"].mean()
-    missed_call_rate = df_aircall_filtered["Missed Call"].mean() * 100
+    with profiler.stage("aggregate: call metrics"):
+        call_metrics = aircall_result("metrics", lambda: aircall.metrics(*aircall_window))
+    avg_talk_time = call_metrics["avg_talk_time"]
+    avg_wait_time = call_metrics["avg_wait_time"]
+    missed_call_rate = call_metrics["missed_call_rate"]
 
     col1, col2, col3 = st.columns(3)
     col1.metric("Average Talk Time", f"{avg_talk_time:.2f} seconds")
     col2.metric("Average Wait Time", f"{avg_wait_time:.2f} seconds")
     col3.metric("Missed Call Rate", f"{missed_call_rate:.2f}%")
 
+    # Percentiles
+    # Merged from the (day, salesperson) sketches; each value is within the
+    # sketch accuracy (relative) of the exact percentile.
+    st.subheader("Call Time Percentiles")
+    with profiler.stage("aggregate: percentiles"):
+        call_percentiles = aircall_result("percentiles", lambda: aircall.percentiles(*aircall_window))
+        percentiles_by_salesperson = aircall_result(
+            "percentiles by salesperson", lambda: aircall.percentiles_by("Salesperson", *aircall_window)
+        )
+        percentiles_by_day = aircall_result(
+            "percentiles by day", lambda: aircall.percentiles_by("Date", *aircall_window)
+        )
+    col6, col7 = st.columns(2)
+    col6.dataframe(call_percentiles.round(1), width="stretch")
+    col7.dataframe(percentiles_by_salesperson.round(1), width="stretch")
+    with profiler.stage("figure: Daily Talk Time Percentiles"):
+        daily_talk_time = percentiles_by_day["Talk Time"].reset_index().melt(
+            id_vars="Date", var_name="Percentile", value_name="Talk Time (seconds)"
+        )
+        fig_daily_talk_time = px.line(
+            daily_talk_time, x="Date", y="Talk Time (seconds)", color="Percentile", title="Daily Talk Time Percentiles"
+        )
+    show_chart(fig_daily_talk_time, width="stretch")
+
     # Leaderboards
     st.subheader("Leaderboards")
     col4, col5 = st.columns(2)
 
     # Call Time Leaderboard
-    call_time_leaderboard = df_aircall_filtered.groupby("Salesperson")["Call Time (seconds)"].sum().sort_values(ascending=False).reset_index()
+    with profiler.stage("aggregate: call time leaderboard"):
+        call_time_leaderboard = aircall_result(
+            "call time leaderboard",
+            lambda: sql_backend.call_time_leaderboard(aircall_filters)
+            if sql_backend.enabled
+            else aircall.call_time_leaderboard(*aircall_window),
+        )
     col4.subheader("Call Time")
-    col4.dataframe(call_time_leaderboard, use_container_width=True)
+    col4.dataframe(call_time_leaderboard, width="stretch")
 
     # Total Calls Leaderboard
-    total_calls_leaderboard = df_aircall_filtered["Salesperson"].value_counts().reset_index()
-    total_calls_leaderboard.columns = ["Salesperson", "Total Calls"]
+    with profiler.stage("aggregate: total calls leaderboard"):
+        total_calls_leaderboard = aircall_result(
+            "total calls leaderboard",
+            lambda: sql_backend.total_calls_leaderboard(aircall_filters)
+            if sql_backend.enabled
+            else aircall.total_calls_leaderboard(*aircall_window),
+        )
     col5.subheader("Total Calls")
-    col5.dataframe(total_calls_leaderboard, use_container_width=True)
+    col5.dataframe(total_calls_leaderboard, width="stretch")
 
     # Call Distribution
     st.subheader("Call Distribution")
-    fig_call_time = px.histogram(df_aircall_filtered, x="Call Time (seconds)", title="Call Time Distribution")
-    st.plotly_chart(fig_call_time, use_container_width=True)
+    with profiler.stage("aggregate: call time bins") as stage:
+        call_time_bins = aircall_result("call time bins", lambda: aircall.call_time_histogram(*aircall_window))
+        stage.rows(len(call_time_bins))
+    with profiler.stage("figure: Call Time Distribution"):
+        fig_call_time = histogram_figure(
+            call_time_bins, "Call Time (seconds)", "Call Time Distribution", width=aircall.bin_width
+        )
+    show_chart(fig_call_time, width="stretch")
 
 elif tab_select == "Product Performance":
     st.title("📈 Product Performance Dashboard")
 
     # Filters
-    selected_products = st.sidebar.multiselect("Select Product", df_product_performance["Product"].unique(), default=df_product_performance["Product"].unique())
-
-    df_product_filtered = df_product_performance[df_product_performance["Product"].isin(selected_products)].copy()
+    products = table_values("product_performance", "Product")
+    # No default list: an empty selection means every product, so thousands
+    # of SKUs are not sent back and forth with the widget state.
+    selected_products = st.sidebar.multiselect("Select Product", products, placeholder="All products") or products
+
+    product_filters = {"Product": selected_products}
+
+    @functools.cache
+    def filtered_products():
+        with profiler.stage("load + filter") as stage:
+            rows = load_table(
+                "product_performance",
+                columns=["Date", "Product", "Revenue"],
+                filters=product_filters,
+            )
+            stage.rows(len(rows))
+        return rows
+
+    def product_result(name, compute):
+        return cached_result("Product Performance", name, ["product_performance"], product_filters, compute)
 
     # Total Revenue
-    total_revenue = df_product_filtered["Revenue"].sum()
+    total_revenue = product_result("total revenue", lambda: filtered_products()["Revenue"].sum())
     st.metric("Total Revenue", f"₹{total_revenue:,.2f}")
 
     # Revenue by Product
     st.subheader("Revenue by Product")
-    product_revenue = df_product_filtered.groupby("Product")["Revenue"].sum().reset_index()
-    fig_product_revenue = px.bar(product_revenue, x="Product", y="Revenue", title="Revenue by Product")
-    st.plotly_chart(fig_product_revenue, use_container_width=True)
+    with profiler.stage("aggregate: revenue by product") as stage:
+        product_revenue = product_result(
+            "revenue by product",
+            lambda: sql_backend.product_revenue(product_filters)
+            if sql_backend.enabled
+            else filtered_products().groupby("Product", observed=True)["Revenue"].sum().reset_index(),
+        )
+        stage.rows(len(product_revenue))
+    with profiler.stage("figure: Revenue by Product"):
+        fig_product_revenue = px.bar(product_revenue, x="Product", y="Revenue", title="Revenue by Product")
+    show_chart(fig_product_revenue, width="stretch")
 
     # Revenue Over Time
     st.subheader("Revenue Over Time")
-    fig_revenue_time = px.line(df_product_filtered, x="Date", y="Revenue", color="Product", title="Revenue Over Time")
-    st.plotly_chart(fig_revenue_time, use_container_width=True)
\ No newline at end of file
+    with profiler.stage("figure: Revenue Over Time") as stage:
+        product_points = product_result(
+            "revenue over time", lambda: downsample(filtered_products(), "Date", "Revenue", color="Product")
+        )
+        fig_revenue_time = px.line(product_points, x="Date", y="Revenue", color="Product", title="Revenue Over Time")
+        stage.rows(len(product_points))
+    show_chart(fig_revenue_time, width="stretch")
+
+    # Revenue Forecast
+    # Every product is fitted once per version of the table (forecasting.py);
+    # the selection only sums the fitted forecasts and their variances.
+    st.subheader("Revenue Forecast")
+    with profiler.stage("forecast"):
+        forecast_engine = load_forecast_engine()
+        forecast_total = product_result("forecast total", lambda: forecast_engine.total(selected_products))
+        forecast_summary = product_result("forecast summary", lambda: forecast_engine.summary(selected_products))
+    with profiler.stage("figure: Revenue Forecast"):
+        forecast_points = forecast_total.melt(id_vars="Date", var_name="Series", value_name="Revenue").dropna()
+        fig_forecast = px.line(
+            forecast_points,
+            x="Date",
+            y="Revenue",
+            color="Series",
+            line_dash="Series",
+            line_dash_map={"Actual": "solid", "Forecast": "solid", "Lower": "dot", "Upper": "dot"},
+            title=f"Revenue Forecast ({FORECAST_INTERVAL:.0%} interval)",
+        )
+    show_chart(fig_forecast, width="stretch")
+    st.dataframe(forecast_summary.round(0), width="stretch", hide_index=True)
+
+# --- Data Cache Stats ---
+with st.sidebar.expander("⚙️ Data Cache"):
+    cache_stats = table_cache.stats()
+    st.write(
+        f"This rerun: {rerun_stats.hits} hits, {rerun_stats.misses} misses, "
+        f"{rerun_stats.load_seconds * 1000:.1f} ms loading"
+    )
+    st.write(
+        f"Process: {cache_stats['entries']} tables, {cache_stats['bytes'] / 2**20:.1f} MB, "
+        f"hit rate {cache_stats['hit_rate']:.0%}, {cache_stats['evictions']} evictions"
+    )
+    results_stats = result_cache.stats()
+    st.write(
+        f"Results: {results_stats['entries']} cached, {results_stats['bytes'] / 2**20:.1f} MB, "
+        f"hit rate {results_stats['hit_rate']:.0%}, "
+        f"{inflight_stats['shared']} misses shared with another session"
+    )
+    service_stats = aggregation_service.stats()
+    if service_stats["workers"]:
+        st.write(
+            f"Workers: {service_stats['workers']}, {service_stats['queries']} cube queries, "
+            f"{service_stats['shared_bytes'] / 2**20:.1f} MB shared"
+        )
+    snapshot_stats = snapshot_reader.stats()
+    if snapshot_stats["version"]:
+        st.write(
+            f"Snapshot {snapshot_stats['version']}: {snapshot_stats['results']} results, "
+            f"{snapshot_stats['hits']} served"
+        )
+
+# --- Chart Payloads ---
+with st.sidebar.expander("📦 Chart Payloads"):
+    for title, points, nbytes in chart_payloads:
+        st.write(f"{title}: {points:,} points, {nbytes / 1024:.1f} KB")
+
+# --- Profiler Panel ---
+if profiler.enabled:
+    profiler.finish()
+    profiler.log()
+    with st.sidebar.expander("🩺 Profiler", expanded=True):
+        st.write(f"Rerun: {profiler.elapsed() * 1000:.1f} ms")
+        st.dataframe(
+            pd.DataFrame([stage.to_record() for stage in profiler.stages]).drop(columns="tab"),
+            width="stretch",
+        )
+        st.download_button(
+            "Export JSON", profiler.to_json(), file_name="rerun_profile.json", mime="application/json"
+        )
\ No newline at end of file
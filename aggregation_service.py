@@ -0,0 +1,229 @@
+import atexit
+import os
+import queue
+import socket
+import subprocess
+import sys
+import threading
+from multiprocessing import resource_tracker, shared_memory
+from multiprocessing.connection import Connection
+
+import numpy as np
+import pandas as pd
+
+from pipeline_cube import highest_opportunity, monthly_totals, totals_by
+from table_index import TableIndex
+
+# --- Aggregation Service ---
+# The Sales Pipeline tab's cube queries: select the filtered cells, then group
+# them. With SALES_DASHBOARD_WORKERS=N (opt-in) they run on N worker processes
+# that read the cube from shared memory, so concurrent sessions are not
+# serialized on one core by the GIL; unset or 0, they run on the calling
+# thread. Concurrent identical queries are already shared by cached_result().
+#
+# Workers are plain subprocesses running this file, each talking to the
+# dashboard over its own socket pair. They are not multiprocessing children:
+# a spawned child re-runs the parent's __main__, which under Streamlit is the
+# dashboard script, and Streamlit swaps sys.modules["__main__"] on every run,
+# so it cannot be replaced safely while sessions are running.
+WORKERS = int(os.environ.get("SALES_DASHBOARD_WORKERS", 0))
+
+
+# --- Queries ---
+# Plain functions of (TableIndex, **params) returning a small frame; they run
+# unchanged in-process or in a worker.
+def cube_totals(index, keys, columns, filters=None):
+    return totals_by(index.filter(filters), keys, columns)
+
+
+def cube_monthly(index, column, filters=None):
+    return monthly_totals(index.filter(filters), column)
+
+
+def cube_highest(index, filters=None):
+    return highest_opportunity(index.filter(filters))
+
+
+QUERIES = {
+    "cube_totals": cube_totals,
+    "cube_monthly": cube_monthly,
+    "cube_highest": cube_highest,
+}
+
+
+# --- Shared Tables ---
+class SharedTable:
+    # One shared memory block per column: numpy numeric, bool and datetime
+    # columns as their values, everything else as categorical codes plus
+    # categories. `spec` is the small picklable description a worker
+    # attaches from. A table replaced by a newer version is unlinked once no
+    # query is using it.
+    def __init__(self, df):
+        self.blocks = []
+        self.users = 0
+        self.retired = False
+        spec = []
+        for column in df.columns:
+            series = df[column]
+            categories = None
+            if not isinstance(series.dtype, np.dtype) or series.dtype == object:
+                series = series.astype("category")
+                categories = tuple(series.cat.categories.tolist())
+                values = series.cat.codes.to_numpy()
+            else:
+                values = series.to_numpy()
+            block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+            np.ndarray(values.shape, values.dtype, buffer=block.buf)[:] = values
+            self.blocks.append(block)
+            spec.append((column, block.name, values.dtype.str, len(values), categories))
+        self.spec = tuple(spec)
+
+    @property
+    def nbytes(self):
+        return sum(block.size for block in self.blocks)
+
+    def close(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+# Worker side: an index over the shared blocks, by spec.
+_attached = {}
+MAX_ATTACHED = 4
+
+
+def _attach(spec):
+    entry = _attached.get(spec)
+    if entry is None:
+        if len(_attached) >= MAX_ATTACHED:
+            _attached.pop(next(iter(_attached)))
+        blocks, data = [], {}
+        for column, name, dtype, length, categories in spec:
+            block = shared_memory.SharedMemory(name=name)
+            # The dashboard owns the block; this worker's resource tracker
+            # must not unlink it when the worker exits.
+            resource_tracker.unregister(block._name, "shared_memory")
+            values = np.ndarray((length,), np.dtype(dtype), buffer=block.buf)
+            data[column] = values if categories is None else pd.Categorical.from_codes(values, list(categories))
+            blocks.append(block)
+        entry = (blocks, TableIndex(pd.DataFrame(data, copy=False)))
+        _attached[spec] = entry
+    return entry[1]
+
+
+def serve(connection):
+    # One query at a time until the dashboard closes the connection.
+    while True:
+        try:
+            query, spec, params = connection.recv()
+        except EOFError:
+            return
+        try:
+            reply = (True, QUERIES[query](_attach(spec), **params))
+        except Exception as exc:
+            reply = (False, exc)
+        connection.send(reply)
+
+
+class AggregationService:
+    def __init__(self, workers=WORKERS):
+        self.workers = workers
+        self._idle = queue.Queue()  # connections of workers not running a query
+        self._processes = []
+        self._started = False
+        self._tables = {}  # name -> (version, SharedTable)
+        self._lock = threading.Lock()
+        self.queries = 0
+
+    def _spawn(self):
+        parent, child = socket.socketpair()
+        with child:
+            process = subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), str(child.fileno())], pass_fds=[child.fileno()]
+            )
+        self._processes.append(process)
+        return Connection(parent.detach())
+
+    def _shared(self, name, version, load_index):
+        entry = self._tables.get(name)
+        if entry is None or entry[0] != version:
+            if entry is not None:
+                entry[1].retired = True
+                if not entry[1].users:
+                    entry[1].close()
+            entry = (version, SharedTable(load_index().frame))
+            self._tables[name] = entry
+        return entry[1]
+
+    def query(self, query, name, version, load_index, **params):
+        # `version` identifies the data (e.g. a rollup's table version) and
+        # `load_index` returns its TableIndex; on the pool the index is only
+        # loaded when the version changes.
+        with self._lock:
+            self.queries += 1
+            if not self.workers:
+                shared = None
+            else:
+                if not self._started:
+                    for _ in range(self.workers):
+                        self._idle.put(self._spawn())
+                    self._started = True
+                shared = self._shared(name, version, load_index)
+                shared.users += 1
+        if shared is None:
+            return QUERIES[query](load_index(), **params)
+        try:
+            return self._run(query, shared.spec, params)
+        finally:
+            with self._lock:
+                shared.users -= 1
+                if shared.retired and not shared.users:
+                    shared.close()
+
+    def _run(self, query, spec, params):
+        connection = self._idle.get()
+        try:
+            connection.send((query, spec, params))
+            ok, value = connection.recv()
+        except (EOFError, OSError):
+            # The worker died; start a replacement in its place.
+            connection.close()
+            with self._lock:
+                self._idle.put(self._spawn())
+            raise RuntimeError(f"aggregation worker exited while running {query}")
+        self._idle.put(connection)
+        if not ok:
+            raise value
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queries": self.queries,
+                "shared_bytes": sum(shared.nbytes for _, shared in self._tables.values()),
+            }
+
+    def shutdown(self):
+        # Closing a worker's connection ends its serve() loop.
+        while not self._idle.empty():
+            self._idle.get().close()
+        for process in self._processes:
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self._processes = []
+        for _, shared in self._tables.values():
+            shared.close()
+        self._tables.clear()
+
+
+aggregation_service = AggregationService()
+atexit.register(aggregation_service.shutdown)
+
+
+if __name__ == "__main__":
+    serve(Connection(int(sys.argv[1])))
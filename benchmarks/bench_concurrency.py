@@ -0,0 +1,234 @@
+"""Rerun latency under concurrent sessions: N threads, one per simulated
+session, run the Sales Pipeline charts and the Sales Competition views
+(Sales Leaderboard, Raffle/Golf, Team A vs Team B) the way the dashboard
+does, at the same time, with the aggregation service in-process
+(--workers 0) and on worker processes.
+
+    python benchmarks/bench_concurrency.py
+    python benchmarks/bench_concurrency.py --sessions 10 50 100 --workers 0 4 --scale 1000
+
+AppTest swaps one process-wide Runtime in and out around each run, so
+several AppTests cannot run at once; a simulated rerun instead issues the
+view's queries through data_layer, competition_state and cached_result(),
+and serializes its figures, which is the part of a rerun concurrent
+sessions contend on. Sessions pick from --windows date ranges, so some of
+their views coincide. The result cache is cleared before every round, as
+when a new data version arrives, so each round has misses; coinciding
+misses are computed once and shared.
+
+Each worker count runs in its own process (SALES_DASHBOARD_WORKERS and
+SALES_DASHBOARD_SCALE are read at import), with the competition state in a
+temporary file. Reports p50/p99 rerun latency and how many misses were
+computed vs shared.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+VIEWS = ["Sales Pipeline", "Sales Leaderboard", "Raffle/Golf", "Team A vs Team B"]
+
+
+def pipeline_rerun(filters):
+    from chart_rendering import px
+    from data_layer import cached_result, pipeline_query
+
+    def result(name, compute):
+        return cached_result("Sales Pipeline", name, ["pipeline"], filters, compute)
+
+    stages = result(
+        "stages", lambda: pipeline_query("cube_totals", filters, keys="Pipeline Stage", columns="Revenue")
+    )
+    contacts = result(
+        "first contacts", lambda: pipeline_query("cube_monthly", filters, column="First Contact Made")
+    )
+    orders = result(
+        "orders vs invoices",
+        lambda: pipeline_query("cube_totals", filters, keys="Date", columns=["Orders Placed", "Invoices Issued"]),
+    )
+    result("highest opportunity", lambda: pipeline_query("cube_highest", filters))
+    figures = [
+        result(
+            "stages figure",
+            lambda: px.bar(stages, x="Pipeline Stage", y="Revenue", title="Pipeline Breakdown by Stage", color="Pipeline Stage"),
+        ),
+        result(
+            "first contacts figure",
+            lambda: px.line(contacts, x="Date", y="First Contact Made", title="First Contacts Made", markers=True),
+        ),
+        result(
+            "orders vs invoices figure",
+            lambda: px.area(orders, x="Date", y=["Orders Placed", "Invoices Issued"], labels={"value": "Count"}),
+        ),
+    ]
+    for fig in figures:
+        fig.to_json()
+
+
+def competition_rerun(view, window, salespeople):
+    from chart_rendering import downsample, px
+    from competition_state import competition_state
+    from data_layer import cached_result, load_competition_rollup
+
+    competition = load_competition_rollup()
+    start, end = window
+
+    def result(name, compute, **params):
+        return cached_result("Sales Competition", name, ["competition"], {"Date": window, **params}, compute)
+
+    if view == "Sales Leaderboard":
+        leaderboard = result("leaderboard", lambda: competition.leaderboard(start, end))
+        fig = result(
+            "leaderboard figure", lambda: px.bar(leaderboard, x="Salesperson", y="Revenue", title="Revenue Leaderboard")
+        )
+        fig.to_json()
+    elif view == "Raffle/Golf":
+        golf_balls = competition.golf_balls(start, end)
+        competition_state.current_draw(start, end, golf_balls["Salesperson"], golf_balls["Golf Balls"])
+    else:
+        roster = competition_state.roster(salespeople)
+        team_data = [
+            result(
+                f"{team} revenue",
+                lambda: competition.daily(start, end, members)[["Date", "Revenue"]],
+                roster=roster["id"],
+            ).assign(Team=team)
+            for team, members in roster["teams"].items()
+        ]
+        fig = result(
+            "team figure",
+            lambda: px.line(
+                downsample(pd.concat(team_data), "Date", "Revenue", color="Team"),
+                x="Date",
+                y="Revenue",
+                color="Team",
+                title="Team A vs Team B Revenue",
+            ),
+            roster=roster["id"],
+        )
+        fig.to_json()
+
+
+def session(rerun, rounds, barrier, latencies, errors):
+    for _ in range(rounds):
+        barrier.wait()
+        began = time.perf_counter()
+        try:
+            rerun()
+        except Exception as exc:
+            errors.append(repr(exc))
+        latencies.append(time.perf_counter() - began)
+
+
+def reruns(num_sessions, num_windows):
+    # One rerun function per session, cycling through the views and windows.
+    from data_layer import table_bounds, table_values
+
+    windows = {}
+    for table in ["pipeline", "competition"]:
+        first, last = table_bounds(table)
+        windows[table] = [(first + (last - first) * i / (2 * num_windows), last) for i in range(num_windows)]
+    reps, regions = table_values("pipeline", "Salesperson"), table_values("pipeline", "Region")
+    salespeople = table_values("competition", "Salesperson")
+    functions = []
+    for i in range(num_sessions):
+        view, window = VIEWS[i % len(VIEWS)], i // len(VIEWS) % num_windows
+        if view == "Sales Pipeline":
+            filters = {"Salesperson": reps, "Region": regions, "Date": windows["pipeline"][window]}
+            functions.append(lambda filters=filters: pipeline_rerun(filters))
+        else:
+            window = windows["competition"][window]
+            functions.append(lambda view=view, window=window: competition_rerun(view, window, salespeople))
+    return functions
+
+
+def run(num_sessions, args):
+    from data_layer import inflight_stats, result_cache
+
+    functions = reruns(num_sessions, args.windows)
+    # One untimed pass over every view builds the rollups, starts the
+    # workers and imports Plotly.
+    for rerun in functions[: len(VIEWS)]:
+        rerun()
+    inflight_stats.update(computed=0, shared=0)
+
+    latencies, errors = [], []
+    barrier = threading.Barrier(num_sessions, action=result_cache.clear)
+    threads = [
+        threading.Thread(target=session, args=(rerun, args.rounds, barrier, latencies, errors))
+        for rerun in functions
+    ]
+    began = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return np.array(latencies) * 1000, time.perf_counter() - began, dict(inflight_stats), errors
+
+
+def worker(args):
+    for num_sessions in args.sessions:
+        latencies, wall_seconds, stats, errors = run(num_sessions, args)
+        print(json.dumps({
+            "sessions": num_sessions,
+            "p50": float(np.percentile(latencies, 50)),
+            "p99": float(np.percentile(latencies, 99)),
+            "wall": wall_seconds,
+            **stats,
+            "errors": len(errors),
+            "first_error": errors[0] if errors else None,
+        }), flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", nargs="+", type=int, default=[10, 50])
+    parser.add_argument("--workers", nargs="+", type=int, default=[0, 2], help="aggregation service processes")
+    parser.add_argument("--rounds", type=int, default=3, help="reruns per session")
+    parser.add_argument("--scale", type=float, default=100, help="SALES_DASHBOARD_SCALE")
+    parser.add_argument("--windows", type=int, default=2, help="distinct date ranges across sessions")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        worker(args)
+        return
+
+    print(
+        f"{'workers':>8}{'sessions':>10}{'p50 ms':>10}{'p99 ms':>10}{'wall s':>9}"
+        f"{'computed':>10}{'shared':>8}{'errors':>8}"
+    )
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as directory:
+            env = {
+                **os.environ,
+                "SALES_DASHBOARD_WORKERS": str(workers),
+                "SALES_DASHBOARD_SCALE": str(args.scale),
+                "SALES_DASHBOARD_STATE_PATH": os.path.join(directory, "competition_state.json"),
+            }
+            command = [sys.executable, os.path.abspath(__file__), "--worker", "--sessions"]
+            command += [str(n) for n in args.sessions]
+            command += ["--rounds", str(args.rounds), "--windows", str(args.windows)]
+            output = subprocess.run(command, env=env, stdout=subprocess.PIPE, text=True, check=True).stdout
+        for line in output.splitlines():
+            row = json.loads(line)
+            print(
+                f"{workers:>8}{row['sessions']:>10}{row['p50']:>10.0f}{row['p99']:>10.0f}{row['wall']:>9.1f}"
+                f"{row['computed']:>10}{row['shared']:>8}{row['errors']:>8}",
+                flush=True,
+            )
+            if row["first_error"]:
+                print(f"    first error: {row['first_error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Sales Opportunities / Sales Recruitment breakdowns from contingency tensors
+(contingency.py) against filtering the rows and calling value_counts(): build
+time of the tensors and per-query latency for random multiselect
+combinations as the row count grows.
+
+    python benchmarks/bench_contingency.py
+    python benchmarks/bench_contingency.py --rows 100000 100000000 --queries 50
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contingency import CONTINGENCY_TABLES, ContingencyTensor
+from data_generation import iter_table_chunks, table_params
+from schemas import compact
+
+
+def load(table, num_rows):
+    num_rows, params = table_params(table, num_rows=num_rows)
+    dimensions, measures = CONTINGENCY_TABLES[table]
+    return pd.concat(
+        (compact(table, chunk)[dimensions + measures] for chunk in iter_table_chunks(table, num_rows, **params)),
+        ignore_index=True,
+    )
+
+
+def random_filters(rng, tensor):
+    return {
+        dimension: list(rng.choice(labels, rng.integers(1, len(labels) + 1), replace=False))
+        for dimension, labels in tensor.labels.items()
+    }
+
+
+def rows_breakdown(df, filters, measure):
+    mask = np.logical_and.reduce([df[dimension].isin(chosen).to_numpy() for dimension, chosen in filters.items()])
+    filtered = df[mask]
+    return [filtered[dimension].value_counts() for dimension in filters] + [filtered[measure].mean()]
+
+
+def tensor_breakdown(tensor, filters, measure):
+    return [tensor.counts_by(dimension, filters) for dimension in filters] + [tensor.mean(measure, filters)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", nargs="+", default=list(CONTINGENCY_TABLES))
+    parser.add_argument("--rows", nargs="+", type=int, default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--queries", type=int, default=20, help="random filter combinations per size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'table':<15}{'rows':>12}{'build s':>9}{'tensor ms':>11}{'rows ms':>9}{'speedup':>9}")
+    for table in args.tables:
+        dimensions, measures = CONTINGENCY_TABLES[table]
+        for num_rows in args.rows:
+            df = load(table, num_rows)
+            start = time.perf_counter()
+            tensor = ContingencyTensor(df, dimensions, measures)
+            build_seconds = time.perf_counter() - start
+
+            rng = np.random.default_rng(args.seed)
+            tensor_ms, rows_ms = [], []
+            for _ in range(args.queries):
+                filters = random_filters(rng, tensor)
+                began = time.perf_counter()
+                tensor_breakdown(tensor, filters, measures[0])
+                tensor_ms.append((time.perf_counter() - began) * 1000)
+                began = time.perf_counter()
+                rows_breakdown(df, filters, measures[0])
+                rows_ms.append((time.perf_counter() - began) * 1000)
+            tensor_p50, rows_p50 = np.median(tensor_ms), np.median(rows_ms)
+            print(
+                f"{table:<15}{num_rows:>12,}{build_seconds:>9.2f}{tensor_p50:>11.2f}{rows_p50:>9.1f}"
+                f"{rows_p50 / tensor_p50:>8.0f}x",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
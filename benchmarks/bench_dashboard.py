@@ -0,0 +1,269 @@
+"""End-to-end rerun cost of every tab, measured headlessly: SalesDashboard.py
+is driven through Streamlit's AppTest (no browser, no server, no network)
+for each dashboard tab and each Sales Competition type, and for the Sales
+Pipeline with each of its deferred sections (Sales Cycle, Scenario
+Analysis, Orders vs. Invoices) open.
+
+    python benchmarks/bench_dashboard.py
+    python benchmarks/bench_dashboard.py --scales 1 100 --repeat 5 --output baseline.json
+    python benchmarks/bench_dashboard.py --scales 1 100 --compare baseline.json
+
+Per scenario it records the rerun that switches to the tab, the median and
+best of --repeat further reruns, and one extra rerun with ?profile=1 for the
+profiler's stage timings and the peak memory traced by tracemalloc during
+that rerun. Each scale (SALES_DASHBOARD_SCALE) runs in its own process
+because the scale is read at import and the data caches are process wide.
+--compare exits non-zero when a median rerun is slower than the baseline
+by more than --threshold.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+APP = os.path.join(ROOT, "SalesDashboard.py")
+
+TABS = [
+    "Sales Pipeline",
+    "Sales Competition",
+    "Sales Activity",
+    "Sales Opportunities",
+    "Sales Recruitment",
+    "Aircall",
+    "Product Performance",
+]
+COMPETITION_TYPES = ["Sales Leaderboard", "Individual Performance", "Raffle/Golf", "Team A vs Team B"]
+
+# The Sales Pipeline sections built only while open, by their session_state
+# key; each is also measured open, on its own.
+DEFERRED_PANELS = {
+    "pipeline_cycle": "Sales Cycle",
+    "pipeline_scenarios": "Scenario Analysis",
+    "pipeline_orders": "Orders vs. Invoices",
+}
+
+SCENARIOS = [
+    (tab, competition_type, None)
+    for tab in TABS
+    for competition_type in (COMPETITION_TYPES if tab == "Sales Competition" else [None])
+] + [("Sales Pipeline", None, panel) for panel in DEFERRED_PANELS]
+
+
+# --- Worker (one scale per process) ---
+class _ProfileRecords(logging.Handler):
+    # Collects the JSON records profiling.Profiler.log() emits.
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(json.loads(record.getMessage()))
+
+
+def _timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    return time.perf_counter() - start
+
+
+def _errors(at):
+    return [exception.message for exception in at.exception]
+
+
+def run_scenario(tab, competition_type, panel, repeat, timeout, profile_records):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    if panel is not None:
+        at.session_state[panel] = True
+    at.run()
+    at.sidebar.radio[0].set_value(tab)
+    if competition_type is not None:
+        at.run()
+        next(box for box in at.sidebar.selectbox if box.label == "Competition Type").set_value(competition_type)
+    result = {"tab": tab, "competition_type": competition_type, "panel": panel, "switch_seconds": _timed_run(at)}
+    if at.exception:
+        return {**result, "error": _errors(at)}
+
+    reruns = [_timed_run(at) for _ in range(repeat)]
+    result["rerun_seconds"] = statistics.median(reruns)
+    result["best_rerun_seconds"] = min(reruns)
+
+    # Profiled rerun last, so tracemalloc's overhead stays out of the timings
+    # above.
+    at.query_params["profile"] = "1"
+    del profile_records[:]
+    tracemalloc.start()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    try:
+        at.run()
+        result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1] - start_memory
+    finally:
+        tracemalloc.stop()
+    if at.exception:
+        return {**result, "error": _errors(at)}
+    profile = profile_records[-1] if profile_records else {"total_seconds": None, "stages": []}
+    result["profiled_seconds"] = profile["total_seconds"]
+    result["stages"] = [
+        {key: stage[key] for key in ("stage", "parent", "seconds", "self_seconds", "rows_in", "rows_out", "bytes_allocated")}
+        for stage in profile["stages"]
+    ]
+    return result
+
+
+def worker(args):
+    profile_logger = logging.getLogger("sales_dashboard.profile")
+    profile_logger.setLevel(logging.INFO)
+    profile_records = _ProfileRecords()
+    profile_logger.addHandler(profile_records)
+
+    from streamlit.testing.v1 import AppTest
+
+    # The first run of the process loads and indexes every table it touches.
+    at = AppTest.from_file(APP, default_timeout=args.timeout)
+    cold_start_seconds = _timed_run(at)
+
+    results = []
+    for tab, competition_type, panel in SCENARIOS:
+        result = run_scenario(tab, competition_type, panel, args.repeat, args.timeout, profile_records.records)
+        results.append({"scale": args.scale, **result})
+        print(_format_row(results[-1]), file=sys.stderr, flush=True)
+    with open(args.worker_output, "w") as f:
+        json.dump({"scale": args.scale, "cold_start_seconds": cold_start_seconds, "results": results}, f)
+
+
+# --- Driver ---
+def _scenario_name(result):
+    name = result["tab"]
+    if result.get("competition_type"):
+        name += f" / {result['competition_type']}"
+    if result.get("panel"):
+        name += f" + {DEFERRED_PANELS[result['panel']]}"
+    return name
+
+
+def _format_row(result):
+    if "error" in result:
+        return f"{result['scale']:>8g}  {_scenario_name(result):<45}ERROR {result['error']}"
+    return (
+        f"{result['scale']:>8g}  {_scenario_name(result):<45}"
+        f"{result['switch_seconds'] * 1000:>10.0f}{result['rerun_seconds'] * 1000:>10.0f}"
+        f"{result['best_rerun_seconds'] * 1000:>10.0f}{result['peak_memory_bytes'] / 2**20:>10.1f}"
+    )
+
+
+def _environment():
+    import numpy
+    import pandas
+    import plotly
+    import streamlit
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "streamlit": streamlit.__version__,
+        "pandas": pandas.__version__,
+        "numpy": numpy.__version__,
+        "plotly": plotly.__version__,
+        "data_dir": os.environ.get("SALES_DASHBOARD_DATA_DIR"),
+    }
+
+
+def run_scale(scale, args):
+    env = {**os.environ, "SALES_DASHBOARD_SCALE": str(scale)}
+    env.pop("SALES_DASHBOARD_PROFILE", None)  # profiling only on the profiled rerun
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "scale.json")
+        subprocess.run(
+            [
+                sys.executable, os.path.abspath(__file__), "--worker",
+                "--scale", str(scale), "--repeat", str(args.repeat),
+                "--timeout", str(args.timeout), "--worker-output", output,
+            ],
+            env=env,
+            check=True,
+        )
+        with open(output) as f:
+            return json.load(f)
+
+
+def compare(baseline, current, threshold):
+    # Median rerun time per (scale, tab, competition type, open panel)
+    # against the baseline; returns the number of scenarios slower than the
+    # threshold.
+    def key(result):
+        return result["scale"], result["tab"], result.get("competition_type"), result.get("panel")
+
+    previous = {key(result): result for result in baseline["results"] if "error" not in result}
+    regressions = 0
+    print(f"\n{'scale':>8}  {'scenario':<45}{'base ms':>10}{'now ms':>10}{'ratio':>8}")
+    for result in current["results"]:
+        before = previous.get(key(result))
+        if before is None or "error" in result:
+            continue
+        ratio = result["rerun_seconds"] / before["rerun_seconds"]
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(
+            f"{result['scale']:>8g}  {_scenario_name(result):<45}"
+            f"{before['rerun_seconds'] * 1000:>10.0f}{result['rerun_seconds'] * 1000:>10.0f}"
+            f"{ratio:>7.2f}x{flag}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", nargs="+", type=float, default=[1, 10])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=600, help="seconds allowed per rerun")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON written by an earlier --output")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, 0.2 = 20%%")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--scale", type=float, default=1, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args)
+        return
+
+    print(f"{'scale':>8}  {'scenario':<45}{'switch ms':>10}{'rerun ms':>10}{'best ms':>10}{'peak MB':>10}", file=sys.stderr)
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": _environment(),
+        "repeat": args.repeat,
+        "cold_start_seconds": {},
+        "results": [],
+    }
+    for scale in args.scales:
+        run = run_scale(scale, args)
+        report["cold_start_seconds"][f"{scale:g}"] = run["cold_start_seconds"]
+        report["results"].extend(run["results"])
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    failed = any("error" in result for result in report["results"])
+    if args.compare:
+        with open(args.compare) as f:
+            failed |= compare(json.load(f), report, args.threshold) > 0
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
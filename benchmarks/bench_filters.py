@@ -0,0 +1,83 @@
+"""Sidebar filter cost: the original boolean-mask chain vs the TableIndex path
+(Date slice + categorical bitmap intersection) on the pipeline table.
+
+    python benchmarks/bench_filters.py
+    python benchmarks/bench_filters.py --rows 1000000 5000000 --repeat 10
+
+The 50M-row case needs several GB of RAM for the string columns the mask
+path filters on.
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_generation import iter_table_chunks, table_params
+from table_index import TableIndex
+
+
+def build_pipeline(num_rows):
+    num_rows, params = table_params("pipeline", num_rows=num_rows)
+    return pd.concat(iter_table_chunks("pipeline", num_rows, **params), ignore_index=True)
+
+
+def mask_filter(df, salespeople, regions, start_date, end_date):
+    return df[
+        (df["Salesperson"].isin(salespeople))
+        & (df["Region"].isin(regions))
+        & (df["Date"] >= pd.Timestamp(start_date))
+        & (df["Date"] <= pd.Timestamp(end_date))
+    ].copy()
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", nargs="+", type=int, default=[1_000_000, 50_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # "positions" is the slice + bitmap intersection alone; "index" also
+    # materializes the filtered frame, like the mask path does.
+    print(
+        f"{'rows':>12}{'build s':>10}{'mask ms':>10}{'positions ms':>14}"
+        f"{'index ms':>10}{'speedup':>9}{'matched':>12}"
+    )
+    for num_rows in args.rows:
+        df = build_pipeline(num_rows)
+        start = time.perf_counter()
+        index = TableIndex(df)
+        build_seconds = time.perf_counter() - start
+
+        dates = df["Date"].unique()
+        start_date, end_date = dates[len(dates) // 4], dates[3 * len(dates) // 4]
+        salespeople, regions = ["Alice", "Charlie", "Eva"], ["North", "East", "West"]
+        filters = {"Salesperson": salespeople, "Region": regions, "Date": (start_date, end_date)}
+
+        mask_seconds, expected = best_of(args.repeat, lambda: mask_filter(df, salespeople, regions, start_date, end_date))
+        positions_seconds, _ = best_of(args.repeat, lambda: index.positions(filters))
+        index_seconds, result = best_of(args.repeat, lambda: index.filter(filters))
+        assert len(result) == len(expected)
+        print(
+            f"{num_rows:>12,}{build_seconds:>10.2f}{mask_seconds * 1000:>10.1f}"
+            f"{positions_seconds * 1000:>14.1f}{index_seconds * 1000:>10.1f}"
+            f"{mask_seconds / index_seconds:>8.1f}x{len(result):>12,}",
+            flush=True,
+        )
+        del df, index
+
+
+if __name__ == "__main__":
+    main()
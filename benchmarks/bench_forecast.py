@@ -0,0 +1,69 @@
+"""Product revenue forecasting (forecasting.py) at SKU scale: time to build the
+(product, month) matrix and fit every product in one batched least-squares
+solve, against fitting the same model product by product in a Python loop.
+
+    python benchmarks/bench_forecast.py
+    python benchmarks/bench_forecast.py --products 10000 100000 --months 24 60
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_generation import iter_table_chunks, table_params
+from forecasting import FORECAST_COLUMNS, ForecastEngine
+from schemas import compact
+
+
+def load(num_products, num_months):
+    num_rows, params = table_params("product_performance", num_months=num_months, num_products=num_products)
+    return pd.concat(
+        (compact("product_performance", chunk)[FORECAST_COLUMNS]
+         for chunk in iter_table_chunks("product_performance", num_rows, **params)),
+        ignore_index=True,
+    )
+
+
+def loop_fit(engine):
+    # The same model, one lstsq per product.
+    num_months = engine.revenue.shape[1]
+    history = engine._design(np.arange(num_months))
+    future = engine._design(np.arange(num_months, num_months + engine.horizon))
+    return np.array([future @ np.linalg.lstsq(history, y, rcond=None)[0] for y in engine.revenue])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", nargs="+", type=int, default=[1_000, 10_000])
+    parser.add_argument("--months", nargs="+", type=int, default=[12, 36])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'products':>10}{'months':>8}{'rows':>12}{'model':>10}{'build+fit ms':>14}{'loop ms':>10}{'speedup':>9}")
+    for num_products in args.products:
+        for num_months in args.months:
+            df = load(num_products, num_months)
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                engine = ForecastEngine(df)
+                timings.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            forecasts = loop_fit(engine)
+            loop_ms = (time.perf_counter() - start) * 1000
+            assert np.allclose(forecasts, engine.forecasts)
+            fit_ms = min(timings)
+            print(
+                f"{num_products:>10,}{num_months:>8}{len(df):>12,}{engine.terms:>10}"
+                f"{fit_ms:>14.1f}{loop_ms:>10.1f}{loop_ms / fit_ms:>8.1f}x",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Rows/sec of the batched generators at 10^4 .. 10^8 rows.
+
+    python benchmarks/bench_generation.py
+    python benchmarks/bench_generation.py --tables pipeline aircall --max-exponent 7
+
+Tables larger than --chunk-size are streamed chunk by chunk and discarded,
+so peak memory stays around one chunk regardless of the row count.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_generation import DEFAULT_CHUNK_SIZE, TABLE_BUILDERS, iter_table_chunks, table_params
+
+
+def bench_table(table, num_rows, chunk_size):
+    num_rows, params = table_params(table, num_rows=num_rows)
+    start = time.perf_counter()
+    rows = 0
+    chunk_bytes = 0
+    for chunk in iter_table_chunks(table, num_rows, chunk_size=chunk_size, **params):
+        rows += len(chunk)
+        chunk_bytes = max(chunk_bytes, int(chunk.memory_usage(deep=True).sum()))
+    elapsed = time.perf_counter() - start
+    return rows, elapsed, chunk_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", nargs="+", default=list(TABLE_BUILDERS), choices=list(TABLE_BUILDERS))
+    parser.add_argument("--min-exponent", type=int, default=4)
+    parser.add_argument("--max-exponent", type=int, default=8)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    print(f"{'table':<22}{'rows':>12}{'seconds':>10}{'rows/sec':>14}{'peak chunk MB':>15}")
+    for table in args.tables:
+        for exponent in range(args.min_exponent, args.max_exponent + 1):
+            rows, elapsed, chunk_bytes = bench_table(table, 10 ** exponent, args.chunk_size)
+            print(
+                f"{table:<22}{rows:>12,}{elapsed:>10.2f}{rows / elapsed:>14,.0f}"
+                f"{chunk_bytes / 2 ** 20:>15.1f}",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Talk-time percentiles from merged (day, salesperson) quantile sketches
+(sketches.py) against exact pandas quantiles over the raw calls: build time,
+per-query latency for random date windows and salesperson selections, the
+largest relative error seen per percentile, and bytes held.
+
+    python benchmarks/bench_sketches.py
+    python benchmarks/bench_sketches.py --calls 1000000 50000000 --accuracy 0.005 --queries 50
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_generation import SALESPEOPLE, iter_table_chunks, table_params
+from schemas import compact
+from sketches import SKETCH_ACCURACY, SKETCH_QUANTILES, QuantileSketches, quantile_label
+
+COLUMNS = ["Date", "Salesperson", "Call Time (seconds)"]
+
+
+def build(num_calls, num_days, accuracy):
+    # Sketches fed chunk by chunk, and the raw columns kept for the exact side.
+    num_calls, params = table_params("aircall", num_rows=num_calls, num_days=num_days)
+    sketches = QuantileSketches(accuracy)
+    frames = []
+    seconds = 0.0
+    for chunk in iter_table_chunks("aircall", num_calls, chunk_size=1_000_000, **params):
+        chunk = compact("aircall", chunk)[COLUMNS]
+        chunk["Date"] = chunk["Date"].dt.normalize()
+        start = time.perf_counter()
+        sketches.update(chunk["Date"], chunk["Salesperson"], chunk["Call Time (seconds)"])
+        seconds += time.perf_counter() - start
+        frames.append(chunk)
+    return sketches, pd.concat(frames, ignore_index=True), seconds
+
+
+def random_window(rng, days):
+    start, end = sorted(rng.integers(0, len(days), 2))
+    return days[start], days[end], list(rng.choice(SALESPEOPLE, rng.integers(1, len(SALESPEOPLE) + 1), replace=False))
+
+
+def exact_quantiles(calls, start, end, salespeople):
+    mask = (calls["Date"] >= start) & (calls["Date"] <= end) & calls["Salesperson"].isin(salespeople)
+    values = calls.loc[mask, "Call Time (seconds)"]
+    return values.quantile(list(SKETCH_QUANTILES), interpolation="lower").to_numpy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", nargs="+", type=int, default=[1_000_000, 10_000_000])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--accuracy", type=float, default=SKETCH_ACCURACY)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    labels = [quantile_label(q) for q in SKETCH_QUANTILES]
+    print(
+        f"{'calls':>12}{'build s':>9}{'sketch MB':>11}{'raw MB':>9}"
+        f"{'sketch ms':>11}{'exact ms':>10}" + "".join(f"{'err ' + label:>10}" for label in labels)
+    )
+    for num_calls in args.calls:
+        sketches, calls, build_seconds = build(num_calls, args.days, args.accuracy)
+        days = np.sort(calls["Date"].unique())
+        rng = np.random.default_rng(args.seed)
+        sketch_ms, exact_ms, errors = [], [], []
+        for _ in range(args.queries):
+            start, end, salespeople = random_window(rng, days)
+            began = time.perf_counter()
+            estimate = sketches.quantiles(start=start, end=end, salespeople=salespeople).to_numpy()
+            sketch_ms.append((time.perf_counter() - began) * 1000)
+            began = time.perf_counter()
+            exact = exact_quantiles(calls, start, end, salespeople)
+            exact_ms.append((time.perf_counter() - began) * 1000)
+            errors.append(np.abs(estimate - exact) / exact)
+        worst = np.max(errors, axis=0)
+        raw_mb = calls.memory_usage(index=False, deep=True).sum() / 1e6
+        print(
+            f"{num_calls:>12,}{build_seconds:>9.2f}{sketches.nbytes / 1e6:>11.2f}{raw_mb:>9.1f}"
+            f"{np.median(sketch_ms):>11.1f}{np.median(exact_ms):>10.1f}" + "".join(f"{e:>10.4f}" for e in worst),
+            flush=True,
+        )
+        if (worst > args.accuracy + 1e-9).any():
+            sys.exit(f"relative error above {args.accuracy}")
+
+
+if __name__ == "__main__":
+    main()
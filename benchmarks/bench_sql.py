@@ -0,0 +1,117 @@
+"""Pipeline stage totals from the DuckDB backend (sql_backend.py) against the
+pandas path over the same Parquet file: a random filter state per query
+(salespeople, regions, date window), pandas reading the filtered columns
+with pushdown and grouping them, DuckDB running the GROUP BY over the file.
+The file is written chunk by chunk, so --rows is bounded by disk, not
+memory; pass --skip-pandas at sizes where pandas cannot hold the rows.
+
+    python benchmarks/bench_sql.py
+    python benchmarks/bench_sql.py --rows 100000000 --skip-pandas --memory-limit 4GB
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_generation import REGIONS, iter_table_chunks, table_params
+from data_sources import ParquetSource, register_source
+from schemas import compact
+from sql_backend import SQLBackend
+
+COLUMNS = ["Date", "Salesperson", "Region", "Pipeline Stage", "Revenue"]
+
+
+def write(path, num_rows, num_salespeople):
+    # One row per salesperson and day, so a wide roster keeps the date axis
+    # in range at 100M rows.
+    salespeople = [f"Rep {i + 1}" for i in range(num_salespeople)]
+    num_rows, params = table_params("pipeline", num_rows=num_rows, salespeople=salespeople)
+    writer = None
+    for chunk in iter_table_chunks("pipeline", num_rows, **params):
+        # Dictionary columns are written as plain strings, as an export would.
+        table = pa.Table.from_pandas(compact("pipeline", chunk)[COLUMNS].astype({
+            column: str for column in ["Salesperson", "Region", "Pipeline Stage"]
+        }), preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(path, table.schema)
+        writer.write_table(table)
+    writer.close()
+    return params
+
+
+def random_filters(rng, params):
+    salespeople, dates = params["salespeople"], params["dates"]
+    first, last = sorted(rng.choice(len(dates), 2))
+    return {
+        "Salesperson": list(rng.choice(salespeople, rng.integers(1, len(salespeople) + 1), replace=False)),
+        "Region": list(rng.choice(REGIONS, rng.integers(1, len(REGIONS) + 1), replace=False)),
+        "Date": (dates[first].date(), dates[last].date()),
+    }
+
+
+def pandas_stage_totals(source, filters):
+    rows = source.read(columns=["Pipeline Stage", "Revenue"], filters=filters)
+    return rows.groupby("Pipeline Stage", observed=True)["Revenue"].sum().reset_index()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", nargs="+", type=int, default=[1_000_000, 10_000_000])
+    parser.add_argument("--salespeople", type=int, default=1_000)
+    parser.add_argument("--queries", type=int, default=10, help="random filter states per size")
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--memory-limit", default=None, help='DuckDB memory limit, e.g. "4GB"')
+    parser.add_argument("--skip-pandas", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'rows':>13}{'file MB':>9}{'write s':>9}{'duckdb ms':>11}{'pandas ms':>11}{'speedup':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for num_rows in args.rows:
+            path = os.path.join(directory, f"pipeline_{num_rows}.parquet")
+            start = time.perf_counter()
+            params = write(path, num_rows, args.salespeople)
+            write_seconds = time.perf_counter() - start
+            source = ParquetSource("pipeline", path)
+            register_source("pipeline", source)
+            backend = SQLBackend("duckdb", threads=args.threads, memory_limit=args.memory_limit)
+            backend.stage_totals(None)  # registers the view
+
+            rng = np.random.default_rng(args.seed)
+            duckdb_ms, pandas_ms = [], []
+            for _ in range(args.queries):
+                filters = random_filters(rng, params)
+                began = time.perf_counter()
+                result = backend.stage_totals(filters)
+                duckdb_ms.append((time.perf_counter() - began) * 1000)
+                if not args.skip_pandas:
+                    began = time.perf_counter()
+                    expected = pandas_stage_totals(source, filters)
+                    pandas_ms.append((time.perf_counter() - began) * 1000)
+                    assert np.array_equal(
+                        result.set_index("Pipeline Stage")["Revenue"].sort_index().to_numpy(),
+                        expected.set_index("Pipeline Stage")["Revenue"].sort_index().to_numpy(),
+                    )
+            duckdb_p50 = np.median(duckdb_ms)
+            if pandas_ms:
+                pandas_p50 = np.median(pandas_ms)
+                comparison = f"{pandas_p50:>11.1f}{pandas_p50 / duckdb_p50:>8.1f}x"
+            else:
+                comparison = f"{'-':>11}{'-':>9}"
+            print(
+                f"{num_rows:>13,}{os.path.getsize(path) / 1e6:>9.0f}{write_seconds:>9.1f}{duckdb_p50:>11.1f}"
+                + comparison,
+                flush=True,
+            )
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Cold-start cost of SalesDashboard.py: each run is a fresh Python process
+(python -X importtime) that runs the script once through Streamlit's AppTest
+on its default tab, as a new server worker would.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --top 20 --output startup.json
+
+Per run it records, from the start of the script run, the time to the first
+sidebar paint (the tab selector), to the first chart, and to the end of the
+run, plus whether plotly.express was already imported at the sidebar paint.
+The import breakdown lists the slowest modules imported directly by the
+worker or the script (cumulative, with everything they import), as reported
+by -X importtime and averaged over the runs.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "SalesDashboard.py")
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+# --- Worker (one cold start per process) ---
+def worker(timeout):
+    import streamlit  # first, so its own import time is listed as "streamlit"
+    from streamlit.elements.plotly_chart import PlotlyMixin
+    from streamlit.elements.widgets.radio import RadioMixin
+    from streamlit.testing.v1 import AppTest
+
+    marks = {}
+    started = None
+
+    def mark(name, method):
+        def wrapper(*args, **kwargs):
+            if name not in marks:
+                marks[name] = time.perf_counter() - started
+                marks[f"{name} plotly"] = "plotly.express" in sys.modules
+            return method(*args, **kwargs)
+        return wrapper
+
+    RadioMixin.radio = mark("sidebar", RadioMixin.radio)
+    PlotlyMixin.plotly_chart = mark("chart", PlotlyMixin.plotly_chart)
+
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    started = time.perf_counter()
+    at.run()
+    marks["run"] = time.perf_counter() - started
+    marks["errors"] = [exception.message for exception in at.exception]
+    print(json.dumps(marks))
+
+
+# --- Driver ---
+def top_level_imports(stderr):
+    # Cumulative microseconds of each module imported at depth 0.
+    imports = {}
+    for line in stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match and not match.group(3):
+            imports[match.group(4)] = int(match.group(2))
+    return imports
+
+
+def cold_start(timeout):
+    began = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", __file__, "--worker", "--timeout", str(timeout)],
+        capture_output=True, text=True, cwd=ROOT, check=True,
+    )
+    wall = time.perf_counter() - began
+    marks = json.loads(result.stdout.strip().splitlines()[-1])
+    marks["process"] = wall
+    return marks, top_level_imports(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12, help="modules listed in the import breakdown")
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.timeout)
+        return
+
+    runs, imports = [], {}
+    for _ in range(args.runs):
+        marks, run_imports = cold_start(args.timeout)
+        if marks["errors"]:
+            sys.exit(f"script errors: {marks['errors']}")
+        runs.append(marks)
+        for name, micros in run_imports.items():
+            imports.setdefault(name, []).append(micros)
+
+    print(f"{'':<22}{'median ms':>10}{'min ms':>10}")
+    for name, label in [("sidebar", "first sidebar paint"), ("chart", "first chart"), ("run", "first run"), ("process", "process total")]:
+        values = [marks[name] * 1000 for marks in runs]
+        print(f"{label:<22}{statistics.median(values):>10.0f}{min(values):>10.0f}")
+    print(f"plotly.express imported before the sidebar paint: {any(marks['sidebar plotly'] for marks in runs)}")
+
+    breakdown = sorted(((statistics.mean(v) / 1000, name) for name, v in imports.items()), reverse=True)[:args.top]
+    print(f"\n{'import':<40}{'mean ms':>10}")
+    for millis, name in breakdown:
+        print(f"{name:<40}{millis:>10.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"runs": runs, "imports_ms": {name: millis for millis, name in breakdown}}, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Windowed sales-cycle queries over stage-transition events: build time of the
+sorted TransitionIndex (sales_cycle.py) and per-query latency for random
+date windows and salesperson/region selections.
+
+    python benchmarks/bench_transitions.py
+    python benchmarks/bench_transitions.py --deals 100000 1000000 --queries 50
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_generation import REGIONS, SALESPEOPLE, iter_table_chunks, table_params
+from sales_cycle import TransitionIndex
+from schemas import compact
+
+QUERIES = ["close_ratio", "cycle_lengths", "conversion_rates", "time_in_stage", "summary_by"]
+
+
+def load_events(num_deals):
+    num_deals, params = table_params("stage_transitions", num_rows=num_deals)
+    return pd.concat(
+        (compact("stage_transitions", chunk) for chunk in iter_table_chunks("stage_transitions", num_deals, **params)),
+        ignore_index=True,
+    )
+
+
+def random_window(rng, first, last):
+    start, end = sorted(rng.integers(0, (last - first).days + 1, 2))
+    return {
+        "start": first + pd.Timedelta(days=int(start)),
+        "end": first + pd.Timedelta(days=int(end)),
+        "salespeople": list(rng.choice(SALESPEOPLE, rng.integers(1, len(SALESPEOPLE) + 1), replace=False)),
+        "regions": list(rng.choice(REGIONS, rng.integers(1, len(REGIONS) + 1), replace=False)),
+    }
+
+
+def run_query(index, query, window):
+    if query == "summary_by":
+        return index.summary_by("Salesperson", **window)
+    return getattr(index, query)(**window)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--deals", nargs="+", type=int, default=[100_000, 1_000_000, 3_000_000])
+    parser.add_argument("--queries", type=int, default=20, help="random windows per query type")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'deals':>10}{'events':>12}{'build s':>9}  {'query':<18}{'p50 ms':>9}{'p99 ms':>9}")
+    for num_deals in args.deals:
+        events = load_events(num_deals)
+        start = time.perf_counter()
+        index = TransitionIndex(events)
+        build_seconds = time.perf_counter() - start
+        first, last = events["Date"].min().normalize(), events["Date"].max().normalize()
+        del events
+
+        rng = np.random.default_rng(args.seed)
+        windows = [random_window(rng, first, last) for _ in range(args.queries)]
+        for query in QUERIES:
+            timings = []
+            for window in windows:
+                began = time.perf_counter()
+                run_query(index, query, window)
+                timings.append((time.perf_counter() - began) * 1000)
+            print(
+                f"{num_deals:>10,}{len(index.stays['date']) + len(index.closes['date']):>12,}{build_seconds:>9.2f}  "
+                f"{query:<18}{np.percentile(timings, 50):>9.1f}{np.percentile(timings, 99):>9.1f}",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
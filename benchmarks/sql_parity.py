@@ -0,0 +1,113 @@
+"""Parity of the DuckDB backend (sql_backend.py) with the pandas paths it
+replaces: every SQL aggregation is run next to the dashboard's pandas
+computation for random filter states and the frames compared. Exits
+non-zero on the first mismatch. Point SALES_DASHBOARD_DATA_DIR at Parquet
+files to check the out-of-core path, or set SALES_DASHBOARD_SCALE.
+
+    python benchmarks/sql_parity.py
+    SALES_DASHBOARD_DATA_DIR=data python benchmarks/sql_parity.py --trials 50
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_layer import load_competition_rollup, load_pipeline_cube, load_stream, load_table, table_bounds, table_values
+from pipeline_cube import totals_by
+from sql_backend import SQLBackend
+
+
+def random_subset(rng, values):
+    return list(rng.choice(values, rng.integers(1, len(values) + 1), replace=False))
+
+
+def random_window(rng, start, end):
+    days = pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize())
+    first, last = sorted(rng.choice(len(days), 2))
+    return days[first].date(), days[last].date()
+
+
+def same(sql, expected, keys=None):
+    # Values must agree exactly; row order only where pandas fixes it.
+    if isinstance(expected, pd.Series):
+        return np.array_equal(sql.to_numpy(dtype=np.int64), expected.to_numpy(dtype=np.int64))
+    sql, expected = sql.reset_index(drop=True), expected.reset_index(drop=True)
+    if keys is not None:
+        sql = sql.sort_values(keys, kind="stable").reset_index(drop=True)
+        expected = expected.sort_values(keys, kind="stable").reset_index(drop=True)
+    if list(sql.columns) != list(expected.columns) or len(sql) != len(expected):
+        return False
+    return all(
+        np.array_equal(sql[column].astype(str).to_numpy(), expected[column].astype(str).to_numpy())
+        for column in expected.columns
+    )
+
+
+def checks(rng):
+    pipeline = load_pipeline_cube()
+    start, end = random_window(rng, *table_bounds("pipeline"))
+    filters = {
+        "Salesperson": random_subset(rng, table_values("pipeline", "Salesperson")),
+        "Region": random_subset(rng, table_values("pipeline", "Region")),
+        "Date": (start, end),
+    }
+    cells = pipeline.select(filters["Salesperson"], filters["Region"], start, end)
+    yield "stage totals", lambda backend: backend.stage_totals(filters), totals_by(cells, "Pipeline Stage", "Revenue"), None
+
+    competition = load_competition_rollup()
+    start, end = random_window(rng, *table_bounds("competition"))
+    yield "leaderboard", lambda backend: backend.leaderboard(start, end), competition.leaderboard(start, end), None
+
+    activity = load_stream("activity").aggregates
+    start, end = random_window(rng, *activity.bounds())
+    salespeople = random_subset(rng, activity.salespeople())
+    filters = {"Date": (start, end), "Salesperson": salespeople}
+    totals = activity.select(start, end, salespeople)[["Calls", "Emails", "Demos", "Social Interactions"]].sum()
+    yield "activity totals", lambda backend: backend.activity_totals(filters), totals, None
+
+    aircall = load_stream("aircall").aggregates
+    start, end = random_window(rng, *aircall.bounds())
+    salespeople = random_subset(rng, aircall.salespeople())
+    filters = {"Date": (start, end), "Salesperson": salespeople}
+    # Ties are ordered differently; the totals must match per salesperson.
+    yield (
+        "call time leaderboard", lambda backend: backend.call_time_leaderboard(filters),
+        aircall.call_time_leaderboard(salespeople, start, end), "Salesperson",
+    )
+    yield (
+        "total calls leaderboard", lambda backend: backend.total_calls_leaderboard(filters),
+        aircall.total_calls_leaderboard(salespeople, start, end), "Salesperson",
+    )
+
+    filters = {"Product": random_subset(rng, table_values("product_performance", "Product"))}
+    rows = load_table("product_performance", columns=["Date", "Product", "Revenue"], filters=filters)
+    revenue = rows.groupby("Product", observed=True)["Revenue"].sum().reset_index()
+    yield "product revenue", lambda backend: backend.product_revenue(filters), revenue, "Product"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trials", type=int, default=20, help="random filter states per aggregation")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    backend = SQLBackend("duckdb")
+    rng = np.random.default_rng(args.seed)
+    passed = {}
+    for _ in range(args.trials):
+        for name, query, expected, keys in checks(rng):
+            result = query(backend)
+            if not same(result, expected, keys):
+                print(f"MISMATCH {name}\n--- sql ---\n{result}\n--- pandas ---\n{expected}")
+                sys.exit(1)
+            passed[name] = passed.get(name, 0) + 1
+    for name, count in passed.items():
+        print(f"{name:<26}{count:>4} ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# Batch entry point next to SalesDashboard.py.
+#
+# Snapshot: runs every tab (and every Sales Competition type, with the
+# Sales Pipeline's deferred panels open) headlessly at its default filters
+# and writes the results and figures into a new snapshot bundle (snapshot.py).
+# The app serves those views from the bundle until their data changes.
+#
+#     python build_snapshot.py
+#     python build_snapshot.py --output-dir /srv/sales-dashboard/snapshots
+#
+# Export: writes a table's filtered rows, or its filtered totals per group,
+# to CSV or Parquet batch by batch (exports.py).
+#
+#     python build_snapshot.py export pipeline north.parquet --filter Region=North
+#     python build_snapshot.py export pipeline revenue.csv --by Salesperson --columns Revenue "Deals Closed" \
+#         --filter Date=2024-01-01:2024-03-31
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+APP = os.path.join(ROOT, "SalesDashboard.py")
+
+TABS = [
+    "Sales Pipeline",
+    "Sales Competition",
+    "Sales Activity",
+    "Sales Opportunities",
+    "Sales Recruitment",
+    "Aircall",
+    "Product Performance",
+]
+COMPETITION_TYPES = ["Sales Leaderboard", "Individual Performance", "Raffle/Golf", "Team A vs Team B"]
+DEFERRED_PANELS = ["pipeline_cycle", "pipeline_scenarios", "pipeline_orders"]
+
+
+def run_view(tab, competition_type, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    for key in DEFERRED_PANELS:
+        at.session_state[key] = True
+    at.run()
+    at.sidebar.radio[0].set_value(tab)
+    at.run()
+    if competition_type is not None:
+        next(box for box in at.sidebar.selectbox if box.label == "Competition Type").set_value(competition_type)
+        at.run()
+    return [exception.message for exception in at.exception]
+
+
+def build(args):
+    import snapshot
+
+    writer = snapshot.SnapshotWriter(args.output_dir)
+    failed = False
+    with snapshot.recording(writer):
+        for tab in TABS:
+            for competition_type in COMPETITION_TYPES if tab == "Sales Competition" else [None]:
+                errors = run_view(tab, competition_type, args.timeout)
+                name = tab + (f" / {competition_type}" if competition_type else "")
+                print(f"{name:<45}{'ERROR ' + str(errors) if errors else 'ok'}", file=sys.stderr, flush=True)
+                failed |= bool(errors)
+    if failed:
+        writer.abort()
+        sys.exit(1)
+    path = writer.commit()
+    print(f"{path}: {len(writer.results)} results, {len(writer.figures)} figures")
+
+
+def parse_filter(text):
+    # Column=a,b is membership, Column=start:end a range (either end may
+    # be empty).
+    column, _, condition = text.partition("=")
+    if ":" in condition:
+        start, end = condition.split(":", 1)
+        return column, (start or None, end or None)
+    return column, condition.split(",")
+
+
+def export(args):
+    from exports import export_rows, export_totals
+
+    filters = dict(parse_filter(text) for text in args.filter)
+    if args.by:
+        rows = export_totals(args.table, args.path, args.by, args.columns, filters)
+    else:
+        rows = export_rows(args.table, args.path, args.columns, filters)
+    print(f"{args.path}: {rows:,} rows")
+
+
+def main():
+    import snapshot
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output-dir", default=snapshot.SNAPSHOT_DIR, help="snapshot bundles directory")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds allowed per view")
+    commands = parser.add_subparsers(dest="command")
+    export_parser = commands.add_parser("export", help="stream a table's rows or totals to CSV/Parquet")
+    export_parser.add_argument("table")
+    export_parser.add_argument("path", help="output .csv or .parquet")
+    export_parser.add_argument("--columns", nargs="+", help="columns to export (totals: columns to sum)")
+    export_parser.add_argument("--by", nargs="+", help="group columns; exports totals instead of rows")
+    export_parser.add_argument("--filter", action="append", default=[], help="Column=a,b or Column=start:end")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        if args.by and not args.columns:
+            parser.error("--by needs --columns to sum")
+        export(args)
+    else:
+        build(args)
+
+
+if __name__ == "__main__":
+    main()
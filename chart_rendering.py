@@ -0,0 +1,123 @@
+import importlib
+import os
+
+import numpy as np
+import pandas as pd
+
+# --- Chart Rendering ---
+# Figures are built from at most POINT_BUDGET points per chart: line series
+# are downsampled and histograms are binned before Plotly sees them, so the
+# payload sent to the browser no longer grows with the row count.
+POINT_BUDGET = int(os.environ.get("SALES_DASHBOARD_POINT_BUDGET", 2000))
+HISTOGRAM_BINS = int(os.environ.get("SALES_DASHBOARD_HISTOGRAM_BINS", 50))
+
+
+class _LazyModule:
+    # Imports the module on first attribute access.
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(importlib.import_module(self._name), attr)
+
+
+# plotly.express takes a few hundred milliseconds to import, so it is
+# imported by the first chart drawn rather than at startup.
+px = _LazyModule("plotly.express")
+
+
+def _as_float(values):
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[ns]").astype(np.int64).astype(float)
+    return values.astype(float)
+
+
+def lttb(x, y, threshold):
+    # Largest-Triangle-Three-Buckets: keep the first and last points and, in
+    # each of threshold - 2 buckets, the point forming the largest triangle
+    # with the previous pick and the next bucket's average. Returns indices.
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x, y = _as_float(x), _as_float(y)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area)) if end > start else a
+        selected[i + 1] = a
+    return np.unique(selected)
+
+
+def minmax(x, y, threshold):
+    # Min and max of each of threshold / 2 equal-count buckets, which keeps
+    # every spike visible. Returns indices in x order.
+    n = len(x)
+    if threshold >= n or threshold < 2:
+        return np.arange(n)
+    num_buckets = threshold // 2
+    buckets = np.arange(n) * num_buckets // n
+    order = np.lexsort((_as_float(y), buckets))
+    bucket_of = buckets[order]
+    first = np.flatnonzero(np.r_[True, bucket_of[1:] != bucket_of[:-1]])
+    last = np.r_[first[1:] - 1, n - 1]
+    return np.unique(np.concatenate([order[first], order[last]]))
+
+
+DOWNSAMPLERS = {"lttb": lttb, "minmax": minmax}
+
+
+def downsample(df, x, y, color=None, budget=POINT_BUDGET, method="lttb"):
+    # The budget is shared evenly between the series of a multi-line chart.
+    if len(df) <= budget:
+        return df
+    pick = DOWNSAMPLERS[method]
+    if color is None:
+        df = df.sort_values(x)
+        return df.iloc[pick(df[x].to_numpy(), df[y].to_numpy(), budget)]
+    groups = df.groupby(color, observed=True, sort=False)
+    per_series = max(budget // max(groups.ngroups, 1), 3)
+    parts = []
+    for _, group in groups:
+        group = group.sort_values(x)
+        parts.append(group.iloc[pick(group[x].to_numpy(), group[y].to_numpy(), per_series)])
+    return pd.concat(parts)
+
+
+def histogram_bins(values, bins=HISTOGRAM_BINS):
+    # Bin server-side; the figure then carries one bar per bin.
+    counts, edges = np.histogram(np.asarray(values), bins=bins)
+    return pd.DataFrame({"Bin Start": edges[:-1], "Bin End": edges[1:], "Count": counts})
+
+
+def histogram_figure(binned, x, title, width=None):
+    # Bars drawn edge to edge from bin starts, so pre-binned counts look like
+    # px.histogram output.
+    if width is None:
+        width = float(np.diff(binned[x]).min()) if len(binned) > 1 else 1.0
+    fig = px.bar(binned, x=x, y="Count", title=title)
+    fig.update_traces(offset=0, width=width)
+    fig.update_layout(bargap=0)
+    return fig
+
+
+def figure_bytes(fig):
+    return len(fig.to_json())
+
+
+def figure_points(fig):
+    points = 0
+    for trace in fig.data:
+        values = getattr(trace, "x", None)
+        if values is None:
+            values = getattr(trace, "values", None)
+        points += 0 if values is None else len(values)
+    return points
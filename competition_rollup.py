@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+
+# --- Competition Rollup ---
+# Prefix sums over a (day, salesperson) grid for the Sales Competition tab.
+# Row d of the grid holds, per measure and salesperson, the total over every
+# day before day d, so the totals of any date range are one subtraction of two
+# rows: the leaderboard, golf-ball counts and team totals cost O(salespeople)
+# whatever the length of the competition. Days arriving after the last day are
+# written into spare rows in place; a re-ingested or back-filled day adds its
+# delta to the rows after it.
+ROLLUP_COLUMNS = ["Date", "Salesperson", "Revenue", "Sales"]
+ROLLUP_MEASURES = ["Rows", "Revenue", "Sales", "Golf Balls"]
+GOLF_THRESHOLD = 5000  # a golf ball per day with Revenue above this
+
+
+class CompetitionRollup:
+    def __init__(self, threshold=GOLF_THRESHOLD):
+        self.threshold = threshold
+        self.salespeople = []
+        self.num_days = 0
+        self._days = np.empty(0, dtype="datetime64[ns]")
+        self._prefix = np.zeros((1, len(ROLLUP_MEASURES), 0), dtype=np.int64)
+        self.version = 0
+
+    @classmethod
+    def from_batches(cls, batches, threshold=GOLF_THRESHOLD):
+        rollup = cls(threshold)
+        for batch in batches:
+            rollup.append(batch)
+        return rollup
+
+    @property
+    def days(self):
+        return self._days[:self.num_days]
+
+    @property
+    def last_day(self):
+        return pd.Timestamp(self._days[self.num_days - 1]) if self.num_days else None
+
+    @property
+    def nbytes(self):
+        return self._days.nbytes + self._prefix.nbytes
+
+    def _measure(self, name):
+        return ROLLUP_MEASURES.index(name)
+
+    def _daily(self, df):
+        # Per-day, per-salesperson totals of a batch: (days, grid[day, measure, rep]).
+        days = df["Date"].dt.normalize().to_numpy(dtype="datetime64[ns]")
+        unique_days, day_codes = np.unique(days, return_inverse=True)
+        reps = pd.Categorical(df["Salesperson"], categories=self.salespeople).codes
+        cells = day_codes * len(self.salespeople) + reps
+        size = len(unique_days) * len(self.salespeople)
+        revenue = df["Revenue"].to_numpy(dtype=np.int64)
+        columns = [
+            np.bincount(cells, minlength=size),
+            np.bincount(cells, weights=revenue, minlength=size),
+            np.bincount(cells, weights=df["Sales"].to_numpy(dtype=np.int64), minlength=size),
+            np.bincount(cells, weights=revenue > self.threshold, minlength=size),
+        ]
+        grid = np.stack(columns, axis=1).reshape(len(unique_days), len(self.salespeople), -1)
+        return unique_days, np.rint(grid.transpose(0, 2, 1)).astype(np.int64)
+
+    def _add_salespeople(self, names):
+        new = [name for name in pd.unique(np.asarray(names, dtype=object)) if name not in self.salespeople]
+        if new:
+            self.salespeople = self.salespeople + sorted(new)
+            self._prefix = np.pad(self._prefix, ((0, 0), (0, 0), (0, len(new))))
+
+    def _add_days(self, new_days):
+        n = self.num_days
+        if n == 0 or new_days[0] > self._days[n - 1]:
+            # After the last day: spare rows carry the running total forward.
+            needed = n + len(new_days)
+            if needed + 1 > len(self._prefix):
+                capacity = max(needed, 2 * n, 32)
+                self._prefix = np.resize(self._prefix, (capacity + 1,) + self._prefix.shape[1:])
+                self._days = np.resize(self._days, capacity)
+            self._days[n:needed] = new_days
+            self._prefix[n + 1:needed + 1] = self._prefix[n]
+            self.num_days = needed
+            return
+        # A day before the last one: rebuild, each new row a copy of the
+        # running total of the days before it.
+        days = np.union1d(self.days, new_days)
+        previous = np.searchsorted(self.days, days, side="right")
+        self._prefix = np.concatenate([self._prefix[:1], self._prefix[previous]])
+        self._days = days
+        self.num_days = len(days)
+
+    def append(self, df_new):
+        if len(df_new) == 0:
+            return
+        self._add_salespeople(df_new["Salesperson"])
+        days, grid = self._daily(df_new)
+        new_days = days[~np.isin(days, self.days)]
+        if len(new_days):
+            self._add_days(new_days)
+        positions = np.searchsorted(self.days, days)
+        first = positions[0]
+        delta = np.zeros((self.num_days - first,) + grid.shape[1:], dtype=np.int64)
+        delta[positions - first] = grid
+        self._prefix[first + 1:self.num_days + 1] += np.cumsum(delta, axis=0)
+        self.version += 1
+
+    def replace_from(self, day, df_new):
+        # Drop everything from `day` on and ingest it again.
+        self.num_days = int(np.searchsorted(self.days, pd.Timestamp(day).normalize().to_datetime64()))
+        self.version += 1
+        self.append(df_new)
+
+    def refresh(self, source):
+        since = self.last_day
+        if since is None:
+            self.append(source.read(ROLLUP_COLUMNS))
+            return
+        self.replace_from(since, source.read(ROLLUP_COLUMNS, filters={"Date": (since, None)}))
+
+    # --- Queries ---
+    def _range(self, start=None, end=None):
+        days = self.days
+        lo = 0 if start is None else int(np.searchsorted(days, pd.Timestamp(start).normalize().to_datetime64()))
+        hi = self.num_days
+        if end is not None:
+            hi = int(np.searchsorted(days, pd.Timestamp(end).normalize().to_datetime64(), side="right"))
+        return lo, max(lo, hi)
+
+    def totals(self, start=None, end=None):
+        # (measure, salesperson) totals over [start, end], whole days.
+        lo, hi = self._range(start, end)
+        return self._prefix[hi] - self._prefix[lo]
+
+    def _per_salesperson(self, totals, measures):
+        active = totals[self._measure("Rows")] > 0
+        return pd.DataFrame({
+            "Salesperson": np.array(self.salespeople, dtype=object)[active],
+            **{measure: totals[self._measure(measure)][active] for measure in measures},
+        })
+
+    def leaderboard(self, start=None, end=None):
+        board = self._per_salesperson(self.totals(start, end), ["Revenue", "Sales"])
+        return board.sort_values("Revenue", ascending=False, kind="stable").reset_index(drop=True)
+
+    def golf_balls(self, start=None, end=None):
+        balls = self._per_salesperson(self.totals(start, end), ["Golf Balls"])
+        return balls[balls["Golf Balls"] > 0].reset_index(drop=True)
+
+    def salespeople_in(self, start=None, end=None):
+        return self._per_salesperson(self.totals(start, end), [])["Salesperson"].tolist()
+
+    def daily(self, start=None, end=None, salespeople=None):
+        # Revenue and Sales per day over [start, end], summed over
+        # `salespeople` (everyone when None); days without rows are skipped.
+        lo, hi = self._range(start, end)
+        grid = np.diff(self._prefix[lo:hi + 1], axis=0)
+        if salespeople is not None:
+            chosen = set(salespeople)
+            grid = grid[:, :, [i for i, name in enumerate(self.salespeople) if name in chosen]]
+        grid = grid.sum(axis=2)
+        active = grid[:, self._measure("Rows")] > 0
+        return pd.DataFrame({
+            "Date": self.days[lo:hi][active],
+            "Revenue": grid[active, self._measure("Revenue")],
+            "Sales": grid[active, self._measure("Sales")],
+        })
@@ -0,0 +1,197 @@
+import contextlib
+import hashlib
+import json
+import os
+import secrets
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: one server process only
+    fcntl = None
+
+import numpy as np
+import pandas as pd
+
+# --- Competition State ---
+# Team rosters and raffle draws for the Sales Competition tab, persisted as
+# one JSON file so every rerun and every session sees the same teams and the
+# same winners until someone reshuffles or redraws. Each roster and draw keeps
+# the seed it was made from, so it can be reproduced, and every change is
+# appended to an audit trail. SALES_DASHBOARD_STATE_PATH names the file.
+# Every change is a read-modify-write under an exclusive lock on
+# "<file>.lock", so server processes sharing the file do not lose each
+# other's updates or hand out the same id. Only the latest
+# SALES_DASHBOARD_STATE_HISTORY rosters, draws and audit entries are kept.
+STATE_PATH = os.environ.get(
+    "SALES_DASHBOARD_STATE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "competition_state.json"),
+)
+STATE_HISTORY = int(os.environ.get("SALES_DASHBOARD_STATE_HISTORY", 500))
+TEAMS = ["Team A", "Team B"]
+
+
+def split_teams(salespeople, seed):
+    # Half the roster (rounded down) to Team A, the rest to Team B.
+    order = np.random.default_rng(seed).permutation(len(salespeople))
+    members = [salespeople[i] for i in order]
+    half = len(members) // 2
+    return {TEAMS[0]: sorted(members[:half]), TEAMS[1]: sorted(members[half:])}
+
+
+def weighted_draw(names, tickets, seed):
+    # One winner with probability proportional to its tickets: a uniform
+    # ticket number located in the running ticket total, so no per-ticket
+    # rows are ever built.
+    tickets = np.asarray(tickets, dtype=np.int64)
+    bounds = np.cumsum(tickets)
+    if len(bounds) == 0 or bounds[-1] <= 0:
+        return None, 0
+    ticket = np.random.default_rng(seed).integers(bounds[-1])
+    return names[int(np.searchsorted(bounds, ticket, side="right"))], int(bounds[-1])
+
+
+def _day(value):
+    return None if value is None else pd.Timestamp(value).date().isoformat()
+
+
+def _next_id(records):
+    # Ids keep increasing when the oldest records are pruned.
+    return records[-1]["id"] + 1 if records else 1
+
+
+def entries_digest(names, tickets):
+    return hashlib.sha256(json.dumps([names, tickets.tolist()]).encode()).hexdigest()
+
+
+def _entries(names, tickets):
+    names = [str(name) for name in names]
+    tickets = np.ones(len(names), dtype=np.int64) if tickets is None else np.asarray(tickets, dtype=np.int64)
+    return names, tickets
+
+
+class CompetitionState:
+    def __init__(self, path=STATE_PATH, history=STATE_HISTORY):
+        self.path = path
+        self.history = history
+        self._lock = threading.Lock()
+        self._version = None
+        self._state = {"rosters": [], "draws": [], "audit": []}
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        # This process's threads, then the other processes, one at a time;
+        # the state is re-read inside the lock.
+        with self._lock, open(f"{self.path}.lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._load()
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load(self):
+        # Re-read when another process has replaced the file since.
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if version != self._version:
+            with open(self.path) as f:
+                self._state = json.load(f)
+            self._version = version
+
+    def _save(self):
+        for records in self._state.values():
+            del records[:-self.history]
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._state, f, indent=1)
+        os.replace(tmp, self.path)
+        stat = os.stat(self.path)
+        self._version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _record(self, event, **details):
+        self._state["audit"].append({"at": time.strftime("%Y-%m-%dT%H:%M:%S"), "event": event, **details})
+
+    # --- Rosters ---
+    def roster(self, salespeople):
+        # The current roster, or a new one when nobody has been assigned yet
+        # or the salespeople have changed.
+        with self._transaction():
+            rosters = self._state["rosters"]
+            if rosters and sorted(sum(rosters[-1]["teams"].values(), [])) == sorted(salespeople):
+                return rosters[-1]
+            return self._add_roster(salespeople, None, "salespeople changed" if rosters else "first roster")
+
+    def new_roster(self, salespeople, seed=None, reason="reshuffle"):
+        with self._transaction():
+            return self._add_roster(salespeople, seed, reason)
+
+    def _add_roster(self, salespeople, seed, reason):
+        seed = secrets.randbits(32) if seed is None else int(seed)
+        roster = {
+            "id": _next_id(self._state["rosters"]),
+            "seed": seed,
+            "teams": split_teams(list(salespeople), seed),
+        }
+        self._state["rosters"].append(roster)
+        self._record("roster", id=roster["id"], seed=seed, reason=reason)
+        self._save()
+        return roster
+
+    # --- Raffle Draws ---
+    # `tickets` weights the entrants (one ticket each when None). A draw
+    # stores a digest of its entries, so it can be re-run from the seed and
+    # checked against them.
+    def current_draw(self, start, end, names, tickets=None):
+        # The latest draw for the date range, drawn now if there is none or
+        # if the entries have changed since (the old winner may no longer
+        # be eligible).
+        names, tickets = _entries(names, tickets)
+        digest = entries_digest(names, tickets)
+        with self._transaction():
+            for draw in reversed(self._state["draws"]):
+                if draw["start"] == _day(start) and draw["end"] == _day(end):
+                    if draw["entries_sha256"] == digest:
+                        return draw
+                    return self._add_draw(start, end, names, tickets, digest, None, "entries changed")
+            return self._add_draw(start, end, names, tickets, digest, None, "first draw")
+
+    def redraw(self, start, end, names, tickets=None, seed=None):
+        names, tickets = _entries(names, tickets)
+        digest = entries_digest(names, tickets)
+        with self._transaction():
+            return self._add_draw(start, end, names, tickets, digest, seed, "redraw")
+
+    def _add_draw(self, start, end, names, tickets, digest, seed, reason):
+        seed = secrets.randbits(32) if seed is None else int(seed)
+        winner, total = weighted_draw(names, tickets, seed)
+        draw = {
+            "id": _next_id(self._state["draws"]),
+            "start": _day(start),
+            "end": _day(end),
+            "seed": seed,
+            "entrants": len(names),
+            "tickets": total,
+            "entries_sha256": digest,
+            "winner": winner,
+        }
+        self._state["draws"].append(draw)
+        self._record(
+            "draw", id=draw["id"], seed=seed, winner=winner, start=draw["start"], end=draw["end"], reason=reason
+        )
+        self._save()
+        return draw
+
+    def audit(self, limit=None):
+        with self._lock:
+            self._load()
+            return pd.DataFrame(self._state["audit"][-limit if limit else 0:])
+
+
+competition_state = CompetitionState()
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+# --- Contingency Tensors ---
+# The Sales Opportunities and Sales Recruitment breakdowns are over a few tiny
+# categoricals, so each table is compiled once into dense tensors over those
+# dimensions: one of row counts and one of sums per measure, filled with
+# bincount over the label codes. A multiselect combination is then a slice of
+# the tensors (np.ix_ of the chosen labels) and a breakdown is that slice
+# summed down to one axis, so the cost of a rerun depends on the number of
+# labels, never on the number of rows.
+CONTINGENCY_TABLES = {
+    "opportunities": (["Salesperson", "Stage", "Source"], ["Value", "Weighted Value"]),
+    "recruitment": (["Job", "Stage", "Source"], ["Days to Hire"]),
+}
+
+
+class ContingencyTensor:
+    def __init__(self, df, dimensions, measures):
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+        self.labels = {}
+        codes = []
+        for dimension in self.dimensions:
+            # Labels in order of first appearance, like table_values().
+            dimension_codes, labels = pd.factorize(df[dimension])
+            self.labels[dimension] = list(labels)
+            codes.append(dimension_codes)
+        self.shape = tuple(len(self.labels[dimension]) for dimension in self.dimensions)
+        size = int(np.prod(self.shape))
+        valid = (np.stack(codes) >= 0).all(axis=0)  # rows with a missing label are left out
+        cells = np.ravel_multi_index([c[valid] for c in codes], self.shape)
+        self.counts = np.bincount(cells, minlength=size).reshape(self.shape)
+        self.sums = {
+            measure: np.bincount(
+                cells, weights=df[measure].to_numpy(dtype=np.float64)[valid], minlength=size
+            ).reshape(self.shape)
+            for measure in self.measures
+        }
+
+    @property
+    def nbytes(self):
+        return self.counts.nbytes + sum(tensor.nbytes for tensor in self.sums.values())
+
+    def selection(self, filters=None):
+        # Index of the cells matching {dimension: chosen labels}; dimensions
+        # not in `filters` are taken whole.
+        filters = filters or {}
+        selected = []
+        for dimension in self.dimensions:
+            labels = self.labels[dimension]
+            chosen = filters.get(dimension)
+            if chosen is None:
+                selected.append(np.arange(len(labels)))
+            else:
+                chosen = set(chosen)
+                selected.append(np.array([i for i, label in enumerate(labels) if label in chosen], dtype=np.intp))
+        return np.ix_(*selected)
+
+    def count(self, filters=None):
+        return int(self.counts[self.selection(filters)].sum())
+
+    def total(self, measure, filters=None):
+        return float(self.sums[measure][self.selection(filters)].sum())
+
+    def mean(self, measure, filters=None):
+        cells = self.selection(filters)
+        count = self.counts[cells].sum()
+        return float(self.sums[measure][cells].sum() / count) if count else float("nan")
+
+    def counts_by(self, dimension, filters=None):
+        # Like value_counts() on the filtered rows: labels with rows only,
+        # most frequent first.
+        axis = self.dimensions.index(dimension)
+        cells = self.selection(filters)
+        totals = self.counts[cells].sum(axis=tuple(i for i in range(len(self.dimensions)) if i != axis))
+        labels = np.array(self.labels[dimension], dtype=object)[cells[axis].ravel()]
+        counts = pd.DataFrame({dimension: labels, "Count": totals})
+        counts = counts[counts["Count"] > 0].sort_values("Count", ascending=False, kind="stable")
+        return counts.reset_index(drop=True)
@@ -0,0 +1,310 @@
+import numpy as np
+import pandas as pd
+
+# --- Dimensions ---
+SALESPEOPLE = ['Alice', 'Bob', 'Charlie', 'David', 'Eva']
+REGIONS = ['North', 'South', 'East', 'West']
+PIPELINE_STAGES = ['Prospecting', 'First Contact', 'Qualified Leads', 'Demo', 'Closed Won', 'Closed Lost']
+PIPELINE_STAGE_PROBABILITIES = [0.2, 0.2, 0.2, 0.2, 0.1, 0.1]
+COMPANIES = ["Company A", "Company B", "Company C", "Company D", "Company E"]
+OPPORTUNITY_SOURCES = ['Webinar', 'Referral', 'Cold Call', 'Social Media', 'Advertisement']
+STAGE_WEIGHTS = {'Prospecting': 0.1, 'First Contact': 0.25, 'Qualified Leads': 0.5, 'Demo': 0.75, 'Closed Won': 1.0, 'Closed Lost': 0.0}
+RECRUITMENT_STAGES = ['Applied', 'Screening', 'Interview', 'Offer', 'Hired']
+RECRUITMENT_SOURCES = ['LinkedIn', 'Indeed', 'Company Website', 'Referral']
+PRODUCTS = ['Product_1', 'Product_2', 'Product_3', 'Product_4', 'Product_5']
+OPEN_STAGE_DAYS = [5, 7, 10, 12]  # mean days a deal spends in each open pipeline stage
+STAGE_ADVANCE_PROBABILITY = 0.7
+ROSTER_TEAM_SIZE = 2  # salespeople per team in the generated roster
+
+DEFAULT_SEED = 42
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+# --- Generation Engine ---
+# Every table is built column-at-a-time: one np.random.Generator draw per
+# column per chunk. Row i of a table is a pure function of i (its date,
+# salesperson, ID, ...) plus those draws, so a table can be produced in
+# fixed-size chunks without ever holding all rows in memory. The same
+# (seed, chunk_size) always yields the same rows.
+
+def _rng(seed, chunk_index):
+    if seed is None:
+        return np.random.default_rng()
+    return np.random.default_rng([seed, chunk_index])
+
+
+def _labels(values, codes):
+    # Take from a tiny array of labels so the column gets the same string dtype
+    # pandas would infer, without converting n Python strings.
+    return pd.Series(list(values)).array.take(codes)
+
+
+def _pick(rng, values, n, p=None):
+    # Draw codes once for the whole column, then take the labels.
+    codes = rng.choice(len(values), size=n, p=p)
+    return _labels(values, codes), codes
+
+
+def _format_ids(prefix, start, n):
+    numbers = pd.Series(np.arange(start + 1, start + n + 1)).astype(str).str.zfill(3)
+    return (prefix + numbers).array
+
+
+def _pipeline_columns(rng, start, n, dates, salespeople):
+    rows = np.arange(start, start + n)
+    stages, _ = _pick(rng, PIPELINE_STAGES, n, p=PIPELINE_STAGE_PROBABILITIES)
+    return {
+        'Date': dates.take(rows // len(salespeople)),
+        'Salesperson': _labels(salespeople, rows % len(salespeople)),
+        'Region': _pick(rng, REGIONS, n)[0],
+        'Revenue': rng.integers(1000, 10000, n),
+        'Deals Closed': rng.integers(0, 5, n),
+        'Pipeline Stage': stages,
+        'First Contact Made': rng.integers(1, 20, n),
+        'Company': _pick(rng, COMPANIES, n)[0],
+        'Opportunity Value': rng.integers(5000, 50000, n),
+        'Orders Placed': rng.integers(0, 5, n),
+        'Invoices Issued': rng.integers(0, 5, n),
+    }
+
+
+def _competition_columns(rng, start, n, dates, salespeople):
+    rows = np.arange(start, start + n)
+    sales = rng.integers(0, 10, n)
+    return {
+        "Date": dates.take(rows // len(salespeople)),
+        "Salesperson": _labels(salespeople, rows % len(salespeople)),
+        "Sales": sales,
+        "Revenue": rng.integers(1000, 10000, n) * sales,
+        "Leads": rng.integers(0, 5, n),
+        "Customer Reviews": rng.integers(0, 3, n),
+    }
+
+
+def _activity_columns(rng, start, n, dates, salespeople):
+    rows = np.arange(start, start + n)
+    return {
+        "Date": dates.take(rows // len(salespeople)),
+        "Salesperson": _labels(salespeople, rows % len(salespeople)),
+        "Calls": rng.integers(5, 20, n),
+        "Emails": rng.integers(10, 30, n),
+        "Demos": rng.integers(0, 3, n),
+        "Social Interactions": rng.integers(2, 15, n),
+    }
+
+
+def _opportunities_columns(rng, start, n, salespeople):
+    stages, stage_codes = _pick(rng, PIPELINE_STAGES, n)
+    values = rng.integers(10000, 100000, n)
+    weights = np.array([STAGE_WEIGHTS[stage] for stage in PIPELINE_STAGES])
+    return {
+        'Opportunity ID': _format_ids('OPP-', start, n),
+        'Salesperson': _pick(rng, salespeople, n)[0],
+        'Stage': stages,
+        'Value': values,
+        'Source': _pick(rng, OPPORTUNITY_SOURCES, n)[0],
+        'Weighted Value': values * weights[stage_codes],
+    }
+
+
+def _recruitment_columns(rng, start, n, jobs):
+    return {
+        'Applicant ID': _format_ids('APP-', start, n),
+        'Job': _pick(rng, jobs, n)[0],
+        'Stage': _pick(rng, RECRUITMENT_STAGES, n)[0],
+        'Source': _pick(rng, RECRUITMENT_SOURCES, n)[0],
+        'Days to Hire': rng.integers(10, 60, n),
+    }
+
+
+def _aircall_columns(rng, start, n, dates, salespeople):
+    return {
+        'Call ID': _format_ids('CALL-', start, n),
+        'Salesperson': _pick(rng, salespeople, n)[0],
+        'Call Time (seconds)': rng.integers(30, 300, n),
+        'Wait Time (seconds)': rng.integers(0, 60, n),
+        'Missed Call': rng.random(n) < 0.1,
+        # The day of the call: the sketches and call totals are per day.
+        'Date': dates.take(rng.integers(0, len(dates), n)),
+    }
+
+
+def _transition_columns(rng, start, n, dates, salespeople):
+    # One deal per row index, exploded into its stage-transition events:
+    # the open stages it reached in order (Prospecting first), then Closed
+    # Won or Closed Lost unless it is still open.
+    deals = np.arange(start, start + n)
+    num_open = len(OPEN_STAGE_DAYS)
+    advanced = rng.random((n, num_open - 1)) < STAGE_ADVANCE_PROBABILITY
+    reached = 1 + np.cumprod(advanced, axis=1).sum(axis=1)
+    closing = rng.random(n)
+    at_demo = reached == num_open
+    won = at_demo & (closing < 0.45)
+    lost = ~won & (closing < np.where(at_demo, 0.8, 0.6))
+
+    stays = rng.exponential(OPEN_STAGE_DAYS, size=(n, num_open))
+    elapsed = np.cumsum(stays, axis=1)
+    offsets = np.zeros((n, num_open + 1))
+    offsets[:, 1:num_open] = elapsed[:, :-1]
+    offsets[:, num_open] = elapsed[np.arange(n), reached - 1]
+    stage_codes = np.tile(np.arange(num_open + 1), (n, 1))
+    stage_codes[:, num_open] = np.where(won, num_open, num_open + 1)
+    valid = np.arange(num_open + 1) < reached[:, None]
+    valid[:, num_open] = won | lost
+
+    opened = dates.take(rng.integers(0, len(dates), n)) + pd.to_timedelta(rng.integers(0, 86400, n), unit="s")
+    per_deal = valid.sum(axis=1)
+    seconds = np.round(offsets[valid] * 86400).astype("int64")
+    return {
+        'Deal ID': np.repeat(_format_ids('DEAL-', start, n), per_deal),
+        'Salesperson': np.repeat(_labels(salespeople, deals % len(salespeople)), per_deal),
+        'Region': np.repeat(_pick(rng, REGIONS, n)[0], per_deal),
+        'Stage': _labels(PIPELINE_STAGES, stage_codes[valid]),
+        'Date': np.repeat(opened.to_numpy(), per_deal) + seconds.astype("timedelta64[s]"),
+    }
+
+
+def _roster_names(salespeople, rows):
+    # The named salespeople first; rows beyond them are "Rep N", formatted
+    # per chunk like the IDs.
+    names = ('Rep ' + pd.Series(rows + 1).astype(str)).array
+    named = rows < len(salespeople)
+    if named.any():
+        names[named] = _labels(salespeople, rows[named])
+    return names
+
+
+def _roster_columns(rng, start, n, salespeople, team_size):
+    # One row per salesperson: consecutive salespeople share a team and each
+    # team sits in one region.
+    rows = np.arange(start, start + n)
+    teams = rows // team_size
+    return {
+        'Salesperson': _roster_names(salespeople, rows),
+        'Team': ('Team ' + pd.Series(teams + 1).astype(str)).array,
+        'Region': _labels(REGIONS, teams % len(REGIONS)),
+    }
+
+
+def _product_columns(rng, start, n, dates, products):
+    rows = np.arange(start, start + n)
+    return {
+        'Date': dates.take(rows // len(products)),
+        'Product': _labels(products, rows % len(products)),
+        'Revenue': rng.integers(50000, 300000, n),
+    }
+
+
+TABLE_BUILDERS = {
+    "pipeline": _pipeline_columns,
+    "competition": _competition_columns,
+    "activity": _activity_columns,
+    "opportunities": _opportunities_columns,
+    "recruitment": _recruitment_columns,
+    "aircall": _aircall_columns,
+    "product_performance": _product_columns,
+    "stage_transitions": _transition_columns,
+    "roster": _roster_columns,
+}
+
+
+def iter_table_chunks(table, num_rows, chunk_size=DEFAULT_CHUNK_SIZE, seed=DEFAULT_SEED, **params):
+    build = TABLE_BUILDERS[table]
+    for chunk_index, start in enumerate(range(0, num_rows, chunk_size)):
+        n = min(chunk_size, num_rows - start)
+        yield pd.DataFrame(build(_rng(seed, chunk_index), start, n, **params))
+
+
+def generate_table(table, num_rows, seed=DEFAULT_SEED, **params):
+    # Whole table as chunk 0, i.e. exactly one draw per column.
+    return pd.DataFrame(TABLE_BUILDERS[table](_rng(seed, 0), 0, num_rows, **params))
+
+
+def table_params(table, num_rows=None, **kwargs):
+    # Resolve the row-dependent parameters (date axis, roster) for a table so
+    # callers can ask for an arbitrary row count. Returns (num_rows, params).
+    salespeople = list(kwargs.get('salespeople') or SALESPEOPLE)
+    if table == "pipeline":
+        num_days = kwargs.get('num_days', 90)
+        if num_rows is not None:
+            num_days = -(-num_rows // len(salespeople))
+        dates = pd.date_range(start='2024-01-01', periods=num_days, freq='D')
+        return num_rows or num_days * len(salespeople), {'dates': dates, 'salespeople': salespeople}
+    if table in ("competition", "activity"):
+        num_days = kwargs.get('num_days', 30)
+        if num_rows is not None:
+            num_days = -(-num_rows // len(salespeople))
+        dates = pd.date_range(end=kwargs.get('end') or pd.Timestamp.now(), periods=num_days)
+        return num_rows or num_days * len(salespeople), {'dates': dates, 'salespeople': salespeople}
+    if table == "opportunities":
+        return num_rows or kwargs.get('num_opportunities', 100), {'salespeople': salespeople}
+    if table == "recruitment":
+        jobs = [f'Job {i+1}' for i in range(kwargs.get('num_jobs', 5))]
+        return num_rows or kwargs.get('num_applicants', 100), {'jobs': jobs}
+    if table == "aircall":
+        num_days = kwargs.get('num_days', 30)
+        dates = pd.date_range(end=kwargs.get('end') or pd.Timestamp.now(), periods=num_days, normalize=True)
+        return num_rows or kwargs.get('num_calls', 200), {'dates': dates, 'salespeople': salespeople}
+    if table == "product_performance":
+        products = list(kwargs.get('products') or PRODUCTS)
+        if kwargs.get('num_products'):
+            products = [f'Product_{i+1}' for i in range(kwargs['num_products'])]
+        num_months = kwargs.get('num_months', 12)
+        if num_rows is not None:
+            num_months = -(-num_rows // len(products))
+        dates = pd.date_range(start='2024-01-01', periods=num_months, freq='MS')  # Monthly data
+        return num_rows or num_months * len(products), {'dates': dates, 'products': products}
+    if table == "stage_transitions":
+        # Rows here are deals; each yields one to five transition events.
+        num_days = kwargs.get('num_days', 90)
+        dates = pd.date_range(start='2024-01-01', periods=num_days, freq='D')
+        return num_rows or kwargs.get('num_deals', 2000), {'dates': dates, 'salespeople': salespeople}
+    if table == "roster":
+        # Rows are salespeople; rows beyond the named roster get "Rep N" names
+        # (see _roster_names).
+        return num_rows or len(salespeople), {'salespeople': salespeople, 'team_size': kwargs.get('team_size', ROSTER_TEAM_SIZE)}
+    raise KeyError(table)
+
+
+# --- Data Generation ---
+def generate_mock_data1(num_days=90, salespeople=None, seed=DEFAULT_SEED):
+    num_rows, params = table_params("pipeline", num_days=num_days, salespeople=salespeople)
+    return generate_table("pipeline", num_rows, seed=seed, **params)
+
+def generate_competition_data(num_days=30, salespeople=None, seed=DEFAULT_SEED):
+    num_rows, params = table_params("competition", num_days=num_days, salespeople=salespeople)
+    return generate_table("competition", num_rows, seed=seed, **params)
+
+def generate_activity_data(num_days=30, salespeople=None, seed=DEFAULT_SEED):
+    num_rows, params = table_params("activity", num_days=num_days, salespeople=salespeople)
+    return generate_table("activity", num_rows, seed=seed, **params)
+
+def generate_opportunities_data(num_opportunities=100, salespeople=None, seed=DEFAULT_SEED):
+    num_rows, params = table_params("opportunities", num_opportunities=num_opportunities, salespeople=salespeople)
+    return generate_table("opportunities", num_rows, seed=seed, **params)
+
+def generate_recruitment_data(num_jobs=5, num_applicants=100, seed=DEFAULT_SEED):
+    num_rows, params = table_params("recruitment", num_jobs=num_jobs, num_applicants=num_applicants)
+    return generate_table("recruitment", num_rows, seed=seed, **params)
+
+def generate_aircall_data(num_calls=200, salespeople=None, num_days=30, seed=DEFAULT_SEED):
+    num_rows, params = table_params("aircall", num_calls=num_calls, num_days=num_days, salespeople=salespeople)
+    return generate_table("aircall", num_rows, seed=seed, **params)
+
+def generate_product_performance_data(num_months=12, products=None, num_products=None, seed=DEFAULT_SEED):
+    num_rows, params = table_params("product_performance", num_months=num_months, products=products, num_products=num_products)
+    return generate_table("product_performance", num_rows, seed=seed, **params)
+
+def generate_stage_transitions(num_deals=2000, num_days=90, salespeople=None, seed=DEFAULT_SEED):
+    num_rows, params = table_params("stage_transitions", num_deals=num_deals, num_days=num_days, salespeople=salespeople)
+    return generate_table("stage_transitions", num_rows, seed=seed, **params)
+
+def generate_roster(salespeople=None, team_size=ROSTER_TEAM_SIZE, seed=DEFAULT_SEED):
+    num_rows, params = table_params("roster", salespeople=salespeople, team_size=team_size)
+    return generate_table("roster", num_rows, seed=seed, **params)
+
+def generate_scaled(table, scale=1.0, seed=DEFAULT_SEED, chunk_size=DEFAULT_CHUNK_SIZE):
+    # The table at `scale` times its default row count, built chunk by chunk.
+    num_rows = max(int(table_params(table)[0] * scale), 1)
+    num_rows, params = table_params(table, num_rows=num_rows)
+    return pd.concat(iter_table_chunks(table, num_rows, chunk_size, seed, **params), ignore_index=True)
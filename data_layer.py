@@ -0,0 +1,429 @@
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future
+
+import pandas as pd
+
+from aggregation_service import aggregation_service
+from competition_rollup import ROLLUP_COLUMNS, CompetitionRollup
+from contingency import CONTINGENCY_TABLES, ContingencyTensor
+from data_sources import get_source, normalize_filters
+from dimensions import ROSTER_COLUMNS, Roster
+from forecasting import FORECAST_COLUMNS, ForecastEngine
+from pipeline_cube import CUBE_COLUMNS, PipelineCube
+from sales_cycle import TRANSITION_COLUMNS, TransitionIndex
+from snapshot import record_result, snapshot_reader
+from streaming import ActivityAggregates, AircallAggregates, FileTailFeed, StreamingTable
+from table_index import TableIndex
+from weighting import WeightingEngine
+
+# --- Table Cache ---
+# Streamlit re-executes SalesDashboard.py on every interaction, but imported
+# modules stay loaded, so a cache held here is shared by every rerun and every
+# session in the process.
+DEFAULT_TTL_SECONDS = float(os.environ.get("SALES_DASHBOARD_CACHE_TTL", 3600))
+DEFAULT_MAX_BYTES = int(float(os.environ.get("SALES_DASHBOARD_CACHE_MB", 512)) * 2**20)
+
+
+def estimate_bytes(value):
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    if hasattr(value, "memory_usage"):
+        return int(value.memory_usage(deep=True).sum())
+    return sys.getsizeof(value)
+
+
+class TableCache:
+    def __init__(self, ttl=DEFAULT_TTL_SECONDS, max_bytes=DEFAULT_MAX_BYTES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (expires_at, nbytes, value), oldest first
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] < time.monotonic():
+                self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key, value):
+        nbytes = estimate_bytes(value)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, nbytes, value)
+            self.nbytes += nbytes
+            # Least recently used first; never evict the entry just stored.
+            while self.nbytes > self.max_bytes and len(self._entries) > 1:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key):
+        _, nbytes, _ = self._entries.pop(key)
+        self.nbytes -= nbytes
+
+    def discard(self, predicate):
+        # Drop every entry whose key matches, e.g. results of an old version.
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.nbytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+table_cache = TableCache()
+
+# Aggregate outputs (see cached_result) get their own, smaller budget.
+DEFAULT_RESULT_MAX_BYTES = int(float(os.environ.get("SALES_DASHBOARD_RESULT_CACHE_MB", 64)) * 2**20)
+
+result_cache = TableCache(max_bytes=DEFAULT_RESULT_MAX_BYTES)
+
+
+# --- Rerun Instrumentation ---
+# One RerunStats per script run; Streamlit runs each session on its own
+# thread, so the current one is tracked thread-locally.
+class RerunStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.load_seconds = 0.0
+        self.loads = []  # (table, "hit" | "miss", seconds)
+        self._lock = threading.Lock()
+
+    def record(self, table, hit, seconds):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self.load_seconds += seconds
+            self.loads.append((table, "hit" if hit else "miss", seconds))
+
+
+_current = threading.local()
+
+
+def begin_rerun():
+    _current.stats = RerunStats()
+    return _current.stats
+
+
+def attach_rerun(stats):
+    # Lets a helper thread (see panels.py) record into a session's rerun.
+    _current.stats = stats
+
+
+def current_rerun():
+    stats = getattr(_current, "stats", None)
+    if stats is None:
+        stats = begin_rerun()
+    return stats
+
+
+# --- Data Access ---
+def _cached(name, key, loader):
+    start = time.perf_counter()
+    value = table_cache.get(key)
+    hit = value is not None
+    if not hit:
+        value = loader()
+        table_cache.put(key, value)
+    current_rerun().record(name, hit, time.perf_counter() - start)
+    return value
+
+
+def load_table(name, columns=None, filters=None):
+    # Tables are materialized on first request only, so a rerun pays for the
+    # tables of the selected tab and nothing else. Sources that push down
+    # columns and filters are cached per query; the rest are cached whole as a
+    # TableIndex and filtered by date slice + bitmap intersection.
+    source = get_source(name)
+    if source.supports_pushdown:
+        key = (name, source.cache_key(), tuple(columns or ()), normalize_filters(filters))
+        return _cached(name, key, lambda: source.read(columns, filters))
+    return load_index(name).filter(filters, columns)
+
+
+def load_index(name):
+    source = get_source(name)
+    return _cached(name, (name, source.cache_key()), lambda: TableIndex(source.read()))
+
+
+def _engine_frame(name, columns):
+    # The rows an engine is built from: pushdown sources read just the
+    # columns; generated tables reuse the cached TableIndex frame instead of
+    # being generated again.
+    source = get_source(name)
+    if source.supports_pushdown:
+        return source.read(columns)
+    return load_index(name).frame[columns]
+
+
+def table_values(name, column):
+    # Distinct values for sidebar options, in order of first appearance.
+    source = get_source(name)
+    if source.supports_pushdown:
+        key = (name, source.cache_key(), "distinct", column)
+        return _cached(name, key, lambda: source.distinct(column))
+    return load_index(name).values(column)
+
+
+def table_bounds(name, column="Date"):
+    source = get_source(name)
+    if source.supports_pushdown:
+        key = (name, source.cache_key(), "bounds", column)
+        return _cached(name, key, lambda: source.bounds(column))
+    return load_index(name).bounds()
+
+
+def load_roster(name, salespeople):
+    # The roster (dimensions.py) restricted to one table's salespeople, built
+    # once per version of the roster and of that table.
+    source = get_source("roster")
+    roster = _cached("roster", ("roster", source.cache_key()), lambda: Roster(_engine_frame("roster", ROSTER_COLUMNS)))
+    key = ("roster", source.cache_key(), name, table_version(name))
+    return _cached("roster", key, lambda: roster.restrict(salespeople))
+
+
+# --- Result Cache ---
+# The small outputs a tab draws (a chart's frame, a metric), never filtered
+# frames, keyed on the tab, the result's name, the versions of the tables it
+# was computed from and a hash of the normalized filter state. Flipping back
+# to a filter combination seen before is a lookup. When a table's version
+# changes, its results from older versions are dropped. Sessions that miss on
+# the same key at the same time share one computation.
+_result_versions = {}
+_result_versions_lock = threading.Lock()
+_inflight = {}  # result key -> Future of the miss being computed
+_inflight_lock = threading.Lock()
+inflight_stats = {"computed": 0, "shared": 0}
+
+
+def _canonical(value):
+    # Equal filter states give equal reprs: dicts by key, selections sorted,
+    # dates and timestamps as ISO strings.
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), _canonical(item)) for key, item in value.items()))
+    if isinstance(value, tuple):
+        return tuple(_canonical(item) for item in value)
+    if isinstance(value, (list, set, frozenset)):
+        return tuple(sorted((_canonical(item) for item in value), key=repr))
+    if hasattr(value, "isoformat"):
+        return pd.Timestamp(value).isoformat()
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+def result_key(tab, name, versions, params):
+    digest = hashlib.sha256(repr(_canonical(params)).encode()).hexdigest()
+    return (tab, name, versions, digest)
+
+
+def table_version(name):
+    stream = _streams.get(name)
+    if stream is not None:
+        return (get_source(name).cache_key(), stream.version)
+    return get_source(name).cache_key()
+
+
+def _invalidate_results(versions):
+    with _result_versions_lock:
+        stale = {table for table, version in versions if _result_versions.get(table, version) != version}
+        _result_versions.update(versions)
+    if stale:
+        result_cache.discard(
+            lambda key: any(table in stale and version != _result_versions[table] for table, version in key[2])
+        )
+
+
+def _compute_once(key, compute):
+    with _inflight_lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _inflight[key] = Future()
+        inflight_stats["computed" if owner else "shared"] += 1
+    if not owner:
+        try:
+            return future.result()
+        except CancelledError:
+            # The computing session was interrupted (a rerun or stop), not
+            # failed: compute here instead.
+            return compute()
+    try:
+        value = compute()
+    except Exception as exc:
+        future.set_exception(exc)
+        raise
+    except BaseException:
+        future.cancel()
+        raise
+    else:
+        future.set_result(value)
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+    return value
+
+
+def cached_result(tab, name, tables, params, compute):
+    # `compute` runs only on a miss and must return a value that callers
+    # treat as read-only; it is shared by every session. A miss is served
+    # from the latest snapshot bundle when it has the key (snapshot.py).
+    versions = tuple((table, table_version(table)) for table in tables)
+    _invalidate_results(versions)
+    key = result_key(tab, name, versions, params)
+    value = result_cache.get(key)
+    if value is None:
+        value = snapshot_reader.get(key)
+        if value is None:
+            value = _compute_once(key, compute)
+        result_cache.put(key, value)
+    record_result(key, value)
+    return value
+
+
+# --- Rollups ---
+# Rollups live for the life of the process. When the source changes they are
+# refreshed incrementally from their last day instead of being rebuilt.
+_rollups = {}
+_rollups_lock = threading.Lock()
+
+
+def _load_rollup(name, table, columns, build):
+    source = get_source(table)
+    source_key = source.cache_key()
+    start = time.perf_counter()
+    with _rollups_lock:
+        entry = _rollups.get(name)
+        hit = entry is not None and entry[0] == source_key
+        if entry is None:
+            batches = source.iter_batches(columns) if source.supports_pushdown else [_engine_frame(table, columns)]
+            rollup = build(batches)
+        else:
+            rollup = entry[1]
+            if not hit:
+                rollup.refresh(source)
+        _rollups[name] = (source_key, rollup)
+    current_rerun().record(name, hit, time.perf_counter() - start)
+    return rollup
+
+
+def load_pipeline_cube():
+    return _load_rollup("pipeline_cube", "pipeline", CUBE_COLUMNS, PipelineCube.from_batches)
+
+
+def pipeline_query(query, filters, **params):
+    # A cube query (aggregation_service.py) over the filtered Sales Pipeline
+    # cells; on the worker pool when SALES_DASHBOARD_WORKERS is set.
+    cube = load_pipeline_cube()
+    version = (get_source("pipeline").cache_key(), cube.version)
+    return aggregation_service.query(query, "pipeline_cube", version, lambda: cube.index, filters=filters, **params)
+
+
+def load_competition_rollup():
+    return _load_rollup("competition_rollup", "competition", ROLLUP_COLUMNS, CompetitionRollup.from_batches)
+
+
+def load_contingency(name):
+    # The table's contingency tensor (contingency.py), built once per version.
+    source = get_source(name)
+    dimensions, measures = CONTINGENCY_TABLES[name]
+    columns = dimensions + measures
+    key = (name, source.cache_key(), "contingency")
+    return _cached(name, key, lambda: ContingencyTensor(_engine_frame(name, columns), dimensions, measures))
+
+
+def load_weighting_engine():
+    # Built once per version of the opportunities table on its contingency
+    # tensor; callers that change weights work on a copy().
+    source = get_source("opportunities")
+    key = ("opportunities", source.cache_key(), "weighting")
+    return _cached("opportunities", key, lambda: WeightingEngine(load_contingency("opportunities")))
+
+
+def load_forecast_engine():
+    # Every product's revenue forecast (forecasting.py), fitted once per
+    # version of the product table.
+    source = get_source("product_performance")
+    key = ("product_performance", source.cache_key(), "forecast")
+    return _cached("product_performance", key, lambda: ForecastEngine(_engine_frame("product_performance", FORECAST_COLUMNS)))
+
+
+def load_transition_index():
+    # Stage-transition events as sorted stays and closes (sales_cycle.py),
+    # built once per version of the table.
+    source = get_source("stage_transitions")
+    key = ("stage_transitions", source.cache_key(), "transitions")
+    return _cached("stage_transitions", key, lambda: TransitionIndex(_engine_frame("stage_transitions", TRANSITION_COLUMNS)))
+
+
+# --- Streams ---
+# Aircall and activity events keep arriving after startup. A stream is seeded
+# once from the table's source, then each load polls its feed and folds the
+# new micro-batch into running aggregates. SALES_DASHBOARD_AIRCALL_FEED and
+# SALES_DASHBOARD_ACTIVITY_FEED name JSON-lines files to tail; attach_feed()
+# plugs in any other feed, such as a streaming.QueueFeed.
+STREAM_AGGREGATES = {
+    "aircall": AircallAggregates,
+    "activity": ActivityAggregates,
+}
+
+_streams = {}
+_streams_lock = threading.Lock()
+
+
+def _stream(name):
+    with _streams_lock:
+        stream = _streams.get(name)
+        if stream is None:
+            path = os.environ.get(f"SALES_DASHBOARD_{name.upper()}_FEED")
+            stream = StreamingTable(STREAM_AGGREGATES[name](), feed=FileTailFeed(path) if path else None)
+            for batch in get_source(name).iter_batches():
+                stream.ingest(batch)
+            _streams[name] = stream
+        return stream
+
+
+def attach_feed(name, feed):
+    _stream(name).feed = feed
+
+
+def load_stream(name):
+    start = time.perf_counter()
+    stream = _stream(name)
+    ingested = stream.poll()
+    current_rerun().record(name, ingested == 0, time.perf_counter() - start)
+    return stream
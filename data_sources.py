@@ -0,0 +1,215 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import data_generation
+from schemas import compact
+
+# --- Filters ---
+# Filters are plain dicts shared by every source:
+#     {"Date": (start, end)}            inclusive range, either end may be None
+#     {"Salesperson": ["Alice", "Bob"]} membership
+# Sources that can, push them down to storage; the rest apply them in pandas.
+
+
+def normalize_filters(filters):
+    normalized = []
+    for column, condition in sorted((filters or {}).items()):
+        if isinstance(condition, tuple):
+            start, end = condition
+            start, end = (None if v is None else pd.Timestamp(v) for v in (start, end))
+            normalized.append((column, "range", (start, end)))
+        else:
+            normalized.append((column, "in", tuple(sorted(condition))))
+    return tuple(normalized)
+
+
+def in_range(values, start, end):
+    # A categorical (the Aircall days) is compared on its categories, then
+    # each row looks its code up.
+    categorical = isinstance(values.dtype, pd.CategoricalDtype)
+    bounded = values.cat.categories if categorical else values
+    condition = np.ones(len(bounded), dtype=bool)
+    if start is not None:
+        condition &= np.asarray(bounded >= start)
+    if end is not None:
+        condition &= np.asarray(bounded <= end)
+    if categorical:
+        condition = np.append(condition, False)[values.cat.codes.to_numpy()]
+    return pd.Series(condition, index=values.index)
+
+
+def apply_filters(df, columns=None, filters=None):
+    mask = None
+    for column, op, value in normalize_filters(filters):
+        if op == "range":
+            condition = in_range(df[column], *value)
+        else:
+            condition = df[column].isin(value)
+        mask = condition if mask is None else mask & condition
+    if mask is not None:
+        df = df[mask]
+    if columns is not None:
+        df = df[list(columns)]
+    return df
+
+
+# --- Sources ---
+# Every source returns frames in the table's compact schema (schemas.py).
+class GeneratedSource:
+    # Synthetic tables from data_generation, `scale` times their default row
+    # count, generated chunk by chunk and filtered in memory. Each read
+    # generates the table again, so data_layer caches it whole (TableIndex)
+    # and builds the engines from that frame; iter_batches() holds one chunk
+    # at a time, for streams and exports.
+    #
+    # Tables dated back from today (competition, activity, aircall) end on
+    # `end`, pinned when the source is created, so every regeneration of a
+    # version has the same dates; the date is part of the cache key.
+    supports_pushdown = False
+
+    def __init__(self, table, scale=1.0, chunk_size=data_generation.DEFAULT_CHUNK_SIZE, end=None):
+        self.table = table
+        self.scale = scale
+        self.chunk_size = chunk_size
+        self.end = pd.Timestamp(end or pd.Timestamp.now()).normalize()
+
+    def cache_key(self):
+        return ("generated", self.table, self.scale, self.chunk_size, self.end)
+
+    def iter_batches(self, columns=None, filters=None):
+        num_rows = max(int(data_generation.table_params(self.table)[0] * self.scale), 1)
+        num_rows, params = data_generation.table_params(self.table, num_rows=num_rows, end=self.end)
+        for chunk in data_generation.iter_table_chunks(self.table, num_rows, self.chunk_size, **params):
+            yield apply_filters(compact(self.table, chunk), columns, filters)
+
+    def read(self, columns=None, filters=None):
+        # Compacted again: chunks whose categoricals saw different values
+        # concatenate to the plain dtype.
+        return compact(self.table, pd.concat(self.iter_batches(columns, filters), ignore_index=True))
+
+
+class ParquetSource:
+    # A Parquet file or a directory of Parquet files, memory-mapped. Reads
+    # project to the requested columns and filters are pushed down as Arrow
+    # expressions, so row groups whose min/max statistics cannot match are
+    # never read. Files sorted by Date (see write_parquet) prune best.
+    supports_pushdown = True
+
+    def __init__(self, table, path):
+        try:
+            import pyarrow.dataset as ds
+            import pyarrow.fs
+        except ImportError as exc:
+            raise ImportError(
+                f"Reading '{table}' from {path} requires pyarrow: pip install pyarrow"
+            ) from exc
+        self.table = table
+        self.path = os.path.abspath(path)
+        self._ds = ds
+        self.dataset = ds.dataset(
+            self.path,
+            format="parquet",
+            filesystem=pyarrow.fs.LocalFileSystem(use_mmap=True),
+        )
+
+    def cache_key(self):
+        # A rewritten export gets a new key, so stale results are not served.
+        return ("parquet", self.path, max(os.stat(f).st_mtime_ns for f in self.dataset.files))
+
+    def _expression(self, filters):
+        import pyarrow as pa
+
+        expression = None
+        for column, op, value in normalize_filters(filters):
+            field = self._ds.field(column)
+            if op == "range":
+                bounds = [field >= pa.scalar(value[0].to_pydatetime())] if value[0] is not None else []
+                if value[1] is not None:
+                    bounds.append(field <= pa.scalar(value[1].to_pydatetime()))
+                if not bounds:
+                    continue
+                condition = bounds[0] if len(bounds) == 1 else bounds[0] & bounds[1]
+            else:
+                condition = field.isin(list(value))
+            expression = condition if expression is None else expression & condition
+        return expression
+
+    def read(self, columns=None, filters=None):
+        table = self.dataset.to_table(
+            columns=list(columns) if columns is not None else None,
+            filter=self._expression(filters),
+        )
+        return compact(self.table, table.to_pandas())
+
+    def iter_batches(self, columns=None, filters=None):
+        # Record batches as they are scanned, for building rollups and exports
+        # over files larger than memory.
+        batches = self.dataset.to_batches(
+            columns=list(columns) if columns is not None else None,
+            filter=self._expression(filters),
+        )
+        for batch in batches:
+            yield compact(self.table, batch.to_pandas())
+
+    def distinct(self, column):
+        import pyarrow.compute as pc
+
+        values = self.dataset.to_table(columns=[column]).column(column)
+        return pc.unique(values).to_pylist()
+
+    def bounds(self, column):
+        # Answered from row-group statistics when every row group has them.
+        lows, highs = [], []
+        for fragment in self.dataset.get_fragments():
+            metadata = fragment.metadata
+            index = metadata.schema.names.index(column)
+            for i in range(metadata.num_row_groups):
+                stats = metadata.row_group(i).column(index).statistics
+                if stats is None or not stats.has_min_max:
+                    values = self.read(columns=[column])[column]
+                    return values.min(), values.max()
+                lows.append(stats.min)
+                highs.append(stats.max)
+        return pd.Timestamp(min(lows)), pd.Timestamp(max(highs))
+
+
+def write_parquet(df, path, sort_by="Date", row_group_size=1_000_000):
+    # Write an export in the layout ParquetSource prunes best: sorted by the
+    # date column so each row group covers a narrow date range.
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if sort_by in df.columns:
+        df = df.sort_values(sort_by, kind="stable")
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, row_group_size=row_group_size)
+
+
+# --- Registry ---
+# SALES_DASHBOARD_DATA_DIR points tabs at real exports: a table named
+# "pipeline" is read from <dir>/pipeline.parquet (a file or a directory of
+# files) when it exists, otherwise it falls back to the synthetic data.
+DATA_DIR = os.environ.get("SALES_DASHBOARD_DATA_DIR")
+
+# SALES_DASHBOARD_SCALE multiplies the row count of every synthetic table
+# (e.g. 100 for 100x the default data), for benchmarking at larger sizes.
+SCALE = float(os.environ.get("SALES_DASHBOARD_SCALE", 1))
+
+_sources = {}
+
+
+def register_source(name, source):
+    _sources[name] = source
+
+
+def get_source(name):
+    source = _sources.get(name)
+    if source is None:
+        path = os.path.join(DATA_DIR, f"{name}.parquet") if DATA_DIR else None
+        if path and os.path.exists(path):
+            source = ParquetSource(name, path)
+        else:
+            source = GeneratedSource(name, scale=SCALE)
+        _sources[name] = source
+    return source
@@ -0,0 +1,69 @@
+import sys
+
+import pandas as pd
+
+# --- Roster ---
+# The salesperson dimension as a region -> team -> salesperson hierarchy, read
+# from the "roster" table (Salesperson, Team, Region; synthetic unless
+# SALES_DASHBOARD_DATA_DIR has roster.parquet). It is built once per version,
+# so the sidebar never scans a fact table for its options. The sidebar selects
+# regions and teams, and expand() turns that selection into the member
+# salespeople on the server. An empty level means all of it, so a widget's
+# state stays as small as what the user picked, however large the roster.
+ROSTER_COLUMNS = ["Salesperson", "Team", "Region"]
+UNASSIGNED = "Unassigned"
+
+
+class Roster:
+    def __init__(self, df):
+        df = df[ROSTER_COLUMNS].astype(object).drop_duplicates("Salesperson")
+        self.regions = []
+        self.teams = {}  # region -> teams
+        self.members = {}  # team -> salespeople
+        self.team_region = {}
+        for salesperson, team, region in df.itertuples(index=False):
+            if team not in self.members:
+                self.members[team] = []
+                self.team_region[team] = region
+                if region not in self.teams:
+                    self.regions.append(region)
+                    self.teams[region] = []
+                self.teams[region].append(team)
+            self.members[team].append(salesperson)
+
+    @property
+    def nbytes(self):
+        names = [name for members in self.members.values() for name in members] + list(self.team_region)
+        return sum(sys.getsizeof(name) for name in names)
+
+    def restrict(self, salespeople):
+        # The roster of one table: its salespeople only, with those missing
+        # from the roster under an Unassigned team and region.
+        present = set(salespeople)
+        known = {salesperson for members in self.members.values() for salesperson in members}
+        rows = [
+            (salesperson, team, self.team_region[team])
+            for team, members in self.members.items()
+            for salesperson in members
+            if salesperson in present
+        ]
+        rows += [(salesperson, UNASSIGNED, UNASSIGNED) for salesperson in salespeople if salesperson not in known]
+        return Roster(pd.DataFrame(rows, columns=ROSTER_COLUMNS))
+
+    def team_options(self, regions=None):
+        return [team for region in (regions or self.regions) for team in self.teams.get(region, [])]
+
+    def salesperson_options(self, regions=None, teams=None):
+        if teams and regions:
+            regions = set(regions)
+            teams = [team for team in teams if self.team_region.get(team) in regions]
+        return [salesperson for team in (teams or self.team_options(regions)) for salesperson in self.members.get(team, [])]
+
+    def expand(self, regions=None, teams=None, salespeople=None):
+        # The salespeople a sidebar selection stands for: the chosen ones
+        # among the members of the chosen teams and regions.
+        members = self.salesperson_options(regions, teams)
+        if salespeople:
+            chosen = set(salespeople)
+            members = [salesperson for salesperson in members if salesperson in chosen]
+        return members
@@ -0,0 +1,97 @@
+import pandas as pd
+
+from data_sources import apply_filters, get_source
+from schemas import decode_ids
+
+# --- Exports ---
+# Filtered rows or filtered group totals of a table written to CSV or
+# Parquet batch by batch, as the source scans them: rows are written and
+# dropped per batch, totals are folded into one small frame per group. The
+# file format follows the extension (.csv or .parquet).
+
+
+def _plain(table, df):
+    # Categoricals back to their values (labels as strings, Aircall days as
+    # timestamps) and IDs back to their prefixed strings, so every batch
+    # writes with the same schema.
+    df = decode_ids(table, df)
+    categorical = [column for column in df.columns if isinstance(df[column].dtype, pd.CategoricalDtype)]
+    return (
+        df.assign(**{column: df[column].astype(df[column].cat.categories.dtype) for column in categorical})
+        if categorical
+        else df
+    )
+
+
+class _Writer:
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.endswith(".parquet")
+        if not self.parquet and not path.endswith(".csv"):
+            raise ValueError(f"Export to .csv or .parquet, not {path}")
+        self._file = None
+        self.rows = 0
+
+    def write(self, df):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self._file is None:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                self._file = pq.ParquetWriter(self.path, table.schema)
+            else:
+                table = pa.Table.from_pandas(df, schema=self._file.schema, preserve_index=False)
+            self._file.write_table(table)
+        else:
+            if self._file is None:
+                self._file = open(self.path, "w", newline="")
+                df.to_csv(self._file, index=False)
+            else:
+                df.to_csv(self._file, index=False, header=False)
+        self.rows += len(df)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def _batches(table, columns, filters):
+    # Filter columns are read along with `columns`; sources that cannot push
+    # filters down are filtered here.
+    read = None
+    if columns is not None:
+        read = list(columns) + [column for column in (filters or {}) if column not in columns]
+    for batch in get_source(table).iter_batches(read, filters):
+        yield apply_filters(batch, columns, filters)
+
+
+def export_rows(table, path, columns=None, filters=None):
+    # Returns the number of rows written.
+    writer = _Writer(path)
+    try:
+        for batch in _batches(table, columns, filters):
+            if len(batch):
+                writer.write(_plain(table, batch))
+    finally:
+        writer.close()
+    return writer.rows
+
+
+def export_totals(table, path, by, columns, filters=None):
+    # Sums of `columns` per `by` group over the filtered rows; each batch's
+    # partial sums are added into the running totals.
+    by, columns = list(by), list(columns)
+    totals = None
+    for batch in _batches(table, by + columns, filters):
+        partial = batch.groupby(by, observed=True)[columns].sum()
+        totals = partial if totals is None else pd.concat([totals, partial]).groupby(level=by).sum()
+    if totals is None:
+        totals = pd.DataFrame(columns=by + columns).set_index(by)
+    totals = _plain(table, totals.reset_index())
+    writer = _Writer(path)
+    try:
+        writer.write(totals)
+    finally:
+        writer.close()
+    return writer.rows
@@ -0,0 +1,123 @@
+import os
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+# --- Forecasting ---
+# Revenue forecasts for the Product Performance tab. Revenue is summed once
+# into a (product, month) matrix and every product is fitted in the same
+# least-squares solve: the design matrix (intercept, linear trend and, given
+# two years of history, month-of-year effects) is shared, so the products are
+# just the columns of the right-hand side. Each product has its own residual
+# variance; the prediction variance factor 1 + x (X'X)^-1 x' depends only on
+# the horizon, so all intervals are one outer product. Months in which a
+# product has no rows count as zero revenue.
+FORECAST_MONTHS = int(os.environ.get("SALES_DASHBOARD_FORECAST_MONTHS", 6))
+FORECAST_INTERVAL = 0.9  # central coverage of Lower..Upper, normal approximation
+FORECAST_COLUMNS = ["Date", "Product", "Revenue"]
+SEASON = 12
+
+
+class ForecastEngine:
+    def __init__(self, df, horizon=FORECAST_MONTHS, interval=FORECAST_INTERVAL):
+        codes, products = pd.factorize(df["Product"])
+        self.products = list(products)
+        months = df["Date"].to_numpy(dtype="datetime64[ns]").astype("datetime64[M]")
+        valid = codes >= 0
+        first = months[valid].min() if valid.any() else np.datetime64("today", "M")
+        offsets = (months[valid] - first).astype(np.int64)
+        num_months = int(offsets.max()) + 1 if len(offsets) else 0
+        cells = codes[valid] * num_months + offsets
+        revenue = df["Revenue"].to_numpy(dtype=np.float64)[valid]
+        self.revenue = np.bincount(
+            cells, weights=revenue, minlength=len(self.products) * num_months
+        ).reshape(len(self.products), num_months)
+        self.months = first + np.arange(num_months + horizon)
+        self._first_month_of_year = int(first.astype(np.int64)) % SEASON
+        self.horizon = horizon
+        self.z = NormalDist().inv_cdf(0.5 + interval / 2)
+        self._fit()
+
+    @property
+    def nbytes(self):
+        return self.revenue.nbytes + self.forecasts.nbytes + self.variances.nbytes
+
+    def _terms(self, num_months):
+        # Intercept only, + trend from 3 months, + month of year from 2 years.
+        if num_months >= 2 * SEASON:
+            return "seasonal"
+        return "trend" if num_months >= 3 else "level"
+
+    def _design(self, t):
+        columns = [np.ones(len(t))]
+        if self.terms != "level":
+            columns.append(t.astype(np.float64))
+        if self.terms == "seasonal":
+            month_of_year = (self._first_month_of_year + t) % SEASON
+            columns.extend((month_of_year == m).astype(np.float64) for m in range(1, SEASON))
+        return np.column_stack(columns)
+
+    def _fit(self):
+        num_products, num_months = self.revenue.shape
+        self.terms = self._terms(num_months)
+        history = self._design(np.arange(num_months))
+        future = self._design(np.arange(num_months, num_months + self.horizon))
+        if num_months == 0 or num_products == 0:
+            self.forecasts = np.zeros((num_products, self.horizon))
+            self.variances = np.full((num_products, self.horizon), np.nan)
+            return
+        coefficients = np.linalg.lstsq(history, self.revenue.T, rcond=None)[0]  # (terms, products)
+        residuals = self.revenue.T - history @ coefficients
+        dof = num_months - history.shape[1]
+        sigma2 = (residuals ** 2).sum(axis=0) / dof if dof > 0 else np.full(num_products, np.nan)
+        factor = 1 + np.einsum("hk,kl,hl->h", future, np.linalg.pinv(history.T @ history), future)
+        self.forecasts = (future @ coefficients).T  # (products, horizon)
+        self.variances = sigma2[:, None] * factor[None, :]
+
+    def _selection(self, products):
+        if products is None:
+            return np.arange(len(self.products))
+        chosen = set(products)
+        return np.array([i for i, product in enumerate(self.products) if product in chosen], dtype=np.intp)
+
+    def _bounds(self, forecast, variance):
+        # Revenue is never negative, so neither are the forecasts and bounds.
+        spread = self.z * np.sqrt(variance)
+        return np.maximum(forecast, 0), np.maximum(forecast - spread, 0), np.maximum(forecast + spread, 0)
+
+    def total(self, products=None):
+        # Monthly revenue of the chosen products summed: Actual for the
+        # history, Forecast/Lower/Upper for the horizon (products independent).
+        selected = self._selection(products)
+        num_months = self.revenue.shape[1]
+        forecast, lower, upper = self._bounds(
+            self.forecasts[selected].sum(axis=0), self.variances[selected].sum(axis=0)
+        )
+        padding = np.full(num_months, np.nan)
+        return pd.DataFrame({
+            "Date": self.months.astype("datetime64[ns]"),
+            "Actual": np.concatenate([self.revenue[selected].sum(axis=0), np.full(self.horizon, np.nan)]),
+            "Forecast": np.concatenate([padding, forecast]),
+            "Lower": np.concatenate([padding, lower]),
+            "Upper": np.concatenate([padding, upper]),
+        })
+
+    def summary(self, products=None):
+        # Next month and whole-horizon forecast per product, largest first;
+        # the horizon interval treats the months' errors as independent.
+        selected = self._selection(products)
+        forecast, lower, upper = self._bounds(self.forecasts[selected, 0], self.variances[selected, 0])
+        horizon, horizon_lower, horizon_upper = self._bounds(
+            self.forecasts[selected].sum(axis=1), self.variances[selected].sum(axis=1)
+        )
+        summary = pd.DataFrame({
+            "Product": np.array(self.products, dtype=object)[selected],
+            "Next Month": forecast,
+            "Next Month Lower": lower,
+            "Next Month Upper": upper,
+            f"Next {self.horizon} Months": horizon,
+            f"Next {self.horizon} Months Lower": horizon_lower,
+            f"Next {self.horizon} Months Upper": horizon_upper,
+        })
+        return summary.sort_values(f"Next {self.horizon} Months", ascending=False, kind="stable").reset_index(drop=True)
@@ -0,0 +1,82 @@
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import streamlit as st
+
+from data_layer import attach_rerun, current_rerun
+
+# --- Panels ---
+# A tab body split into independent panels. add() reserves the panel's place
+# on the page right away (a placeholder caption) and starts its compute
+# function on a shared thread pool; compute builds data and figures and makes
+# no st.* calls. render() then draws the panels on the script thread in the
+# order they finish, so the first chart shows as soon as it is ready instead
+# of after the slowest one. Panels below the fold go in deferred() expanders
+# and are only computed while the expander is open.
+# SALES_DASHBOARD_PANEL_WORKERS=0 computes the panels one by one in render().
+PANEL_WORKERS = int(os.environ.get("SALES_DASHBOARD_PANEL_WORKERS", 4))
+
+_executor = ThreadPoolExecutor(PANEL_WORKERS, thread_name_prefix="panel") if PANEL_WORKERS else None
+
+
+def once(compute):
+    # functools.cache for a zero-argument function that several panels call:
+    # concurrent first callers wait for the one computation.
+    lock = threading.Lock()
+    result = []
+
+    def wrapper():
+        with lock:
+            if not result:
+                result.append(compute())
+        return result[0]
+
+    return wrapper
+
+
+class Panels:
+    def __init__(self, serial=False):
+        # serial: compute in render(), one by one, as with no pool.
+        self.serial = serial or _executor is None
+        self._pending = []  # (future or compute, placeholder, draw)
+
+    def add(self, name, compute, draw, container=st):
+        # draw(value) runs in render() inside the panel's placeholder.
+        placeholder = container.empty()
+        placeholder.caption(f"⏳ Loading {name}…")
+        if self.serial:
+            self._pending.append((compute, placeholder, draw))
+            return
+        stats = current_rerun()
+
+        def run():
+            # Table loads count towards the rerun that asked for the panel.
+            attach_rerun(stats)
+            return compute()
+
+        self._pending.append((_executor.submit(run), placeholder, draw))
+
+    def deferred(self, label, key, container=st):
+        # The expander when it is open, else None. Opening or closing it
+        # reruns the script.
+        expander = container.expander(label, key=key, on_change="rerun")
+        if not expander.open:
+            expander.caption("Open to load.")
+            return None
+        return expander
+
+    def render(self):
+        pending, self._pending = self._pending, []
+        if self.serial:
+            for compute, placeholder, draw in pending:
+                with placeholder.container():
+                    draw(compute())
+            return
+        while pending:
+            done, _ = wait([future for future, _, _ in pending], return_when=FIRST_COMPLETED)
+            for future, placeholder, draw in pending:
+                if future in done:
+                    with placeholder.container():
+                        draw(future.result())
+            pending = [entry for entry in pending if entry[0] not in done]
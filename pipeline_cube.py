@@ -0,0 +1,100 @@
+import pandas as pd
+
+from table_index import TableIndex
+
+# --- Pipeline Rollup Cube ---
+# One cell per (day, Salesperson, Region, Company, Pipeline Stage) with the
+# measures the Sales Pipeline tab charts. Every chart on that tab is a
+# re-aggregation of these cells, so a rerun scans a few thousand cells instead
+# of the raw pipeline history.
+CUBE_DIMENSIONS = ["Date", "Salesperson", "Region", "Company", "Pipeline Stage"]
+CUBE_SUMS = ["Revenue", "Deals Closed", "First Contact Made", "Orders Placed", "Invoices Issued"]
+CUBE_MAXES = ["Opportunity Value"]
+CUBE_COLUMNS = CUBE_DIMENSIONS + CUBE_SUMS + CUBE_MAXES
+
+_AGGREGATIONS = {**{column: "sum" for column in CUBE_SUMS}, **{column: "max" for column in CUBE_MAXES}}
+
+
+def rollup(df):
+    # Works on raw rows and on cells alike: sums of sums and maxes of maxes.
+    df = df[CUBE_COLUMNS].assign(Date=df["Date"].dt.normalize())
+    return df.groupby(CUBE_DIMENSIONS, observed=True, sort=True).agg(_AGGREGATIONS).reset_index()
+
+
+class PipelineCube:
+    def __init__(self):
+        self.cells = pd.DataFrame(columns=CUBE_COLUMNS)
+        self.version = 0
+        self._index = None
+        self._index_version = None
+
+    @classmethod
+    def from_batches(cls, batches):
+        cube = cls()
+        for batch in batches:
+            cube.append(batch)
+        return cube
+
+    @property
+    def last_day(self):
+        return self.cells["Date"].max() if len(self.cells) else None
+
+    def append(self, df_new):
+        # Cells for days after the cube's last day are simply appended; days
+        # that overlap existing cells (a batch boundary splitting a day) are
+        # rolled up together with the new rows.
+        new_cells = rollup(df_new)
+        if len(new_cells) == 0:
+            return
+        if len(self.cells) == 0:
+            self.cells = new_cells
+        elif new_cells["Date"].min() > self.last_day:
+            self.cells = pd.concat([self.cells, new_cells], ignore_index=True)
+        else:
+            overlap = self.cells["Date"] >= new_cells["Date"].min()
+            merged = rollup(pd.concat([self.cells[overlap], new_cells], ignore_index=True))
+            self.cells = pd.concat([self.cells[~overlap], merged], ignore_index=True)
+        self.version += 1
+
+    def replace_from(self, day, df_new):
+        # Re-ingest everything from `day` on, e.g. when the source has grown
+        # and its last day may have been partial when the cube was built.
+        self.cells = self.cells[self.cells["Date"] < pd.Timestamp(day)].reset_index(drop=True)
+        self.append(df_new)
+
+    def refresh(self, source):
+        since = self.last_day
+        if since is None:
+            self.append(source.read(CUBE_COLUMNS))
+            return
+        df_new = source.read(CUBE_COLUMNS, filters={"Date": (since, None)})
+        self.replace_from(since, df_new)
+
+    @property
+    def index(self):
+        # Rebuilt lazily after the cells change.
+        if self._index_version != self.version:
+            self._index = TableIndex(self.cells)
+            self._index_version = self.version
+        return self._index
+
+    def select(self, salespeople, regions, start_date, end_date):
+        return self.index.filter({
+            "Salesperson": salespeople,
+            "Region": regions,
+            "Date": (start_date, end_date),
+        })
+
+
+# --- Queries ---
+# Each takes the selected cells and returns the small frame a chart needs.
+def monthly_totals(cells, column):
+    return cells.resample("ME", on="Date")[column].sum().reset_index()
+
+
+def totals_by(cells, keys, columns):
+    return cells.groupby(keys)[columns].sum().reset_index()
+
+
+def highest_opportunity(cells):
+    return cells.loc[cells["Opportunity Value"].idxmax()]
@@ -0,0 +1,162 @@
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+import weakref
+
+# --- Rerun Profiling ---
+# Each rerun gets a Profiler; tab code wraps its named stages in
+# `with profiler.stage("filter", rows_in=...) as stage:` and reports
+# `stage.rows(len(result))`. When profiling is off, stage() hands back one
+# shared no-op object, so the instrumentation can stay in place in production.
+# Turn it on with SALES_DASHBOARD_PROFILE=1 or the ?profile=1 query parameter.
+# tracemalloc runs only while some rerun is being profiled: the first profiled
+# rerun starts it and the last one to finish stops it. Its counters are
+# process-wide, so bytes_allocated is approximate while other sessions run,
+# and a profiled rerun computes its panels one by one (panels.py).
+PROFILE_ENV = os.environ.get("SALES_DASHBOARD_PROFILE", "") not in ("", "0")
+
+logger = logging.getLogger("sales_dashboard.profile")
+
+
+_profiled = 0  # profiled reruns in progress
+_owns_tracing = False  # tracemalloc was started here, not by the caller
+_tracing_lock = threading.Lock()
+
+
+def _start_tracing():
+    global _profiled, _owns_tracing
+    with _tracing_lock:
+        if _profiled == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _owns_tracing = True
+        _profiled += 1
+
+
+def _stop_tracing():
+    global _profiled, _owns_tracing
+    with _tracing_lock:
+        _profiled -= 1
+        if _profiled == 0 and _owns_tracing:
+            tracemalloc.stop()
+            _owns_tracing = False
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def rows(self, rows_out):
+        pass
+
+
+NULL_STAGE = _NullStage()
+
+
+class Stage:
+    # Stages nest (a "filter" reached from inside an "aggregate"): `seconds`
+    # and `bytes_allocated` are inclusive of the stages opened inside this
+    # one, `self_seconds` excludes them, and `parent` names the enclosing
+    # stage. Summing `self_seconds` counts every second once.
+    def __init__(self, tab, name, rows_in=None, open_stages=None):
+        self.tab = tab
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.seconds = 0.0
+        self.child_seconds = 0.0
+        self.bytes_allocated = 0
+        self.parent = None
+        self._open_stages = open_stages if open_stages is not None else []
+
+    def __enter__(self):
+        # Peak traced memory above the stage's starting point approximates
+        # what the stage allocated. reset_peak() is process-wide, so the
+        # enclosing stage first folds the peak it has seen so far into its
+        # own, and takes this stage's peak back when it closes.
+        current, peak = tracemalloc.get_traced_memory()
+        if self._open_stages:
+            self.parent = self._open_stages[-1]
+            self.parent._peak = max(self.parent._peak, peak)
+        self._open_stages.append(self)
+        self._start_memory = current
+        self._peak = current
+        tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self._start
+        self._peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+        self.bytes_allocated = max(self._peak - self._start_memory, 0)
+        self._open_stages.pop()
+        if self.parent is not None:
+            self.parent._peak = max(self.parent._peak, self._peak)
+            self.parent.child_seconds += self.seconds
+        return False
+
+    def rows(self, rows_out):
+        self.rows_out = rows_out
+
+    def to_record(self):
+        return {
+            "tab": self.tab,
+            "stage": self.name,
+            "parent": self.parent.name if self.parent is not None else None,
+            "seconds": self.seconds,
+            "self_seconds": self.seconds - self.child_seconds,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "bytes_allocated": self.bytes_allocated,
+        }
+
+
+class Profiler:
+    def __init__(self, enabled=False, tab=None):
+        self.enabled = enabled
+        self.tab = tab
+        self.stages = []
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._finish = None
+        self._open = threading.local()  # each thread's stack of open stages
+        if enabled:
+            _start_tracing()
+            # Also released if the rerun is interrupted before finish().
+            self._finish = weakref.finalize(self, _stop_tracing)
+
+    def finish(self):
+        if self._finish is not None:
+            self._finish()
+
+    def stage(self, name, rows_in=None):
+        if not self.enabled:
+            return NULL_STAGE
+        if not hasattr(self._open, "stages"):
+            self._open.stages = []
+        stage = Stage(self.tab, name, rows_in, self._open.stages)
+        self.stages.append(stage)
+        return stage
+
+    def elapsed(self):
+        return time.perf_counter() - self._start
+
+    def to_dict(self):
+        return {
+            "started_at": self.started_at,
+            "tab": self.tab,
+            "total_seconds": self.elapsed(),
+            "stages": [stage.to_record() for stage in self.stages],
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def log(self):
+        if self.enabled:
+            logger.info(json.dumps(self.to_dict()))
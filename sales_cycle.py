@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+
+from data_generation import PIPELINE_STAGES
+
+# --- Sales Cycle ---
+# Sales-cycle metrics from stage-transition events (Deal ID, Salesperson,
+# Region, Stage, Date: when the deal entered the stage). Events are turned
+# once into two sorted event arrays:
+#     stays   one per visit to an open stage, sorted by when it was entered,
+#             with the stage the deal moved to next and the days it stayed
+#     closes  one per closed deal, sorted by close date, with the outcome and
+#             the days since the deal was opened
+# A date window is then two binary searches into the sorted dates and a
+# salesperson/region selection is a code lookup over that slice, so windowed
+# queries over millions of transitions never sort or group raw events.
+OPEN_STAGES = PIPELINE_STAGES[:-2]
+WON = PIPELINE_STAGES.index("Closed Won")
+LOST = PIPELINE_STAGES.index("Closed Lost")
+CYCLE_DIMENSIONS = ["Salesperson", "Region"]
+TRANSITION_COLUMNS = ["Deal ID", "Salesperson", "Region", "Stage", "Date"]
+
+_DAY = np.timedelta64(1, "D")
+
+
+def _sorted_by(arrays, key):
+    order = np.argsort(arrays[key], kind="stable")
+    return {name: values[order] for name, values in arrays.items()}
+
+
+class TransitionIndex:
+    def __init__(self, df):
+        df = df.sort_values(["Deal ID", "Date"], kind="stable")
+        deal = df["Deal ID"].to_numpy()
+        entered = df["Date"].to_numpy(dtype="datetime64[ns]")
+        stage = pd.Categorical(df["Stage"], categories=PIPELINE_STAGES).codes.astype(np.int8)
+        self.labels = {}
+        codes = {}
+        for dimension in CYCLE_DIMENSIONS:
+            column = df[dimension].astype("category")
+            self.labels[dimension] = column.cat.categories.tolist()
+            codes[dimension] = column.cat.codes.to_numpy()
+
+        first = np.r_[True, deal[1:] != deal[:-1]] if len(deal) else np.zeros(0, dtype=bool)
+        last = np.r_[first[1:], True] if len(deal) else first
+        opened = entered[first][np.cumsum(first) - 1]
+        next_stage = np.where(last, -1, np.r_[stage[1:], -1]).astype(np.int8)
+        exited = np.where(last, np.datetime64("NaT"), np.r_[entered[1:], np.datetime64("NaT", "ns")])
+
+        is_open = stage < len(OPEN_STAGES)
+        self.stays = _sorted_by({
+            "date": entered[is_open],
+            "stage": stage[is_open],
+            "next_stage": next_stage[is_open],
+            "days": (exited[is_open] - entered[is_open]) / _DAY,
+            **{dimension: values[is_open] for dimension, values in codes.items()},
+        }, "date")
+        is_closed = ~is_open
+        self.closes = _sorted_by({
+            "date": entered[is_closed],
+            "won": stage[is_closed] == WON,
+            "days": (entered[is_closed] - opened[is_closed]) / _DAY,
+            **{dimension: values[is_closed] for dimension, values in codes.items()},
+        }, "date")
+
+    @property
+    def nbytes(self):
+        return sum(values.nbytes for events in (self.stays, self.closes) for values in events.values())
+
+    def _window(self, events, start=None, end=None, salespeople=None, regions=None):
+        # Positions of the events dated in [start, end] (a date end covers
+        # the whole day) for the selected salespeople and regions.
+        dates = events["date"]
+        lo, hi = 0, len(dates)
+        if start is not None:
+            lo = int(np.searchsorted(dates, pd.Timestamp(start).to_datetime64(), side="left"))
+        if end is not None:
+            end = pd.Timestamp(end)
+            if end == end.normalize():
+                end += pd.Timedelta(days=1)
+                hi = int(np.searchsorted(dates, end.to_datetime64(), side="left"))
+            else:
+                hi = int(np.searchsorted(dates, end.to_datetime64(), side="right"))
+        positions = np.arange(lo, max(lo, hi))
+        for dimension, chosen in zip(CYCLE_DIMENSIONS, (salespeople, regions)):
+            if chosen is None:
+                continue
+            chosen = set(chosen)
+            allowed = np.array([label in chosen for label in self.labels[dimension]], dtype=bool)
+            positions = positions[allowed[events[dimension][positions]]]
+        return positions
+
+    def cycle_lengths(self, start=None, end=None, salespeople=None, regions=None, won=True):
+        # Days from first stage to close, for deals won (or lost) in the window.
+        positions = self._window(self.closes, start, end, salespeople, regions)
+        positions = positions[self.closes["won"][positions] == won]
+        return self.closes["days"][positions]
+
+    def close_ratio(self, start=None, end=None, salespeople=None, regions=None):
+        positions = self._window(self.closes, start, end, salespeople, regions)
+        won = int(self.closes["won"][positions].sum())
+        lost = len(positions) - won
+        return {"won": won, "lost": lost, "close_ratio": won / (won + lost) * 100 if won + lost else 0.0}
+
+    def conversion_rates(self, start=None, end=None, salespeople=None, regions=None):
+        # Per open stage entered in the window: how many deals moved on to the
+        # next stage, were lost there, or are still in it. The rate is over
+        # the resolved ones (advanced or lost).
+        positions = self._window(self.stays, start, end, salespeople, regions)
+        stage = self.stays["stage"][positions]
+        next_stage = self.stays["next_stage"][positions]
+        size = len(OPEN_STAGES)
+        entered = np.bincount(stage, minlength=size)
+        advanced = np.bincount(stage[next_stage == stage + 1], minlength=size)
+        lost = np.bincount(stage[next_stage == LOST], minlength=size)
+        resolved = advanced + lost
+        return pd.DataFrame({
+            "Stage": OPEN_STAGES,
+            "Entered": entered,
+            "Advanced": advanced,
+            "Lost": lost,
+            "Open": entered - resolved,
+            "Conversion Rate": np.divide(
+                advanced * 100, resolved, out=np.zeros(size), where=resolved > 0
+            ),
+        })
+
+    def time_in_stage(self, start=None, end=None, salespeople=None, regions=None):
+        # Days spent in each open stage, over the visits entered in the window
+        # that have since left the stage.
+        positions = self._window(self.stays, start, end, salespeople, regions)
+        positions = positions[self.stays["next_stage"][positions] >= 0]
+        stage = self.stays["stage"][positions]
+        days = self.stays["days"][positions]
+        size = len(OPEN_STAGES)
+        exits = np.bincount(stage, minlength=size)
+        totals = np.bincount(stage, weights=days, minlength=size)
+        order = np.argsort(stage, kind="stable")
+        groups = np.split(days[order], np.cumsum(exits)[:-1])
+        return pd.DataFrame({
+            "Stage": OPEN_STAGES,
+            "Exits": exits,
+            "Mean Days": np.divide(totals, exits, out=np.full(size, np.nan), where=exits > 0),
+            "Median Days": [np.median(group) if len(group) else np.nan for group in groups],
+        })
+
+    def summary_by(self, dimension, start=None, end=None, salespeople=None, regions=None):
+        # Won, lost, close ratio and average won-deal cycle per salesperson or
+        # region, for deals closed in the window.
+        positions = self._window(self.closes, start, end, salespeople, regions)
+        codes = self.closes[dimension][positions]
+        won = self.closes["won"][positions]
+        size = len(self.labels[dimension])
+        won_count = np.bincount(codes[won], minlength=size)
+        lost_count = np.bincount(codes[~won], minlength=size)
+        won_days = np.bincount(codes[won], weights=self.closes["days"][positions][won], minlength=size)
+        closed = won_count + lost_count
+        summary = pd.DataFrame({
+            dimension: self.labels[dimension],
+            "Won": won_count,
+            "Lost": lost_count,
+            "Close Ratio (%)": np.divide(won_count * 100, closed, out=np.zeros(size), where=closed > 0),
+            "Avg Cycle (days)": np.divide(won_days, won_count, out=np.full(size, np.nan), where=won_count > 0),
+        })
+        return summary[closed > 0].reset_index(drop=True)
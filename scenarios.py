@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+# --- Scenario Engine ---
+# Revenue projections for the Sales Pipeline tab. Revenue is summed once into
+# a (Salesperson, Region) matrix; a scenario is a growth rate per cell (a base
+# rate plus per-rep and per-region adjustments), so projecting again after a
+# slider change costs O(salespeople x regions), never O(rows). With a
+# spread, each salesperson's base rate is uniform over growth +/- spread, so
+# their projection is uniform too and its percentiles are exact in closed
+# form: O(salespeople), with no sampling.
+SCENARIO_DIMENSIONS = ["Salesperson", "Region"]
+SCENARIO_QUANTILES = (0.1, 0.9)
+
+
+class Scenario:
+    # Rates in percent. `spread` is the +/- range the base rate is drawn from
+    # (uniformly) in quantiles(); 0 makes the scenario deterministic.
+    def __init__(self, name, growth=0.0, spread=0.0, rep_growth=None, region_growth=None):
+        self.name = name
+        self.growth = float(growth)
+        self.spread = float(spread)
+        self.rep_growth = rep_growth or {}
+        self.region_growth = region_growth or {}
+
+
+class ScenarioEngine:
+    def __init__(self, df, value_column="Revenue"):
+        self.labels = {}
+        codes = []
+        for dimension in SCENARIO_DIMENSIONS:
+            column = df[dimension].astype("category")
+            self.labels[dimension] = column.cat.categories.tolist()
+            codes.append(column.cat.codes.to_numpy())
+        shape = tuple(len(self.labels[dimension]) for dimension in SCENARIO_DIMENSIONS)
+        cells = np.ravel_multi_index(codes, shape) if len(df) else np.zeros(0, dtype=np.int64)
+        values = df[value_column].to_numpy(dtype=np.float64)
+        self.revenue = np.bincount(cells, weights=values, minlength=int(np.prod(shape))).reshape(shape)
+        self.revenue_by_rep = self.revenue.sum(axis=1)
+
+    @property
+    def nbytes(self):
+        return self.revenue.nbytes + self.revenue_by_rep.nbytes
+
+    def _adjustments(self, dimension, growth):
+        return np.array([growth.get(label, 0.0) for label in self.labels[dimension]], dtype=np.float64) / 100
+
+    def _fixed(self, scenario):
+        # Projected revenue per salesperson without the base rate:
+        # sum over regions of revenue * (1 + rep + region).
+        rep = self._adjustments("Salesperson", scenario.rep_growth)
+        region = self._adjustments("Region", scenario.region_growth)
+        return self.revenue_by_rep * (1 + rep) + self.revenue @ region
+
+    def project(self, scenario):
+        return self._fixed(scenario) + self.revenue_by_rep * scenario.growth / 100
+
+    def quantiles(self, scenario, quantiles=SCENARIO_QUANTILES):
+        # Quantiles of the projected revenue per salesperson, one row each:
+        # the base rate's quantile, mirrored where a rep's revenue is negative.
+        q = np.asarray(quantiles, dtype=np.float64)[:, None]
+        rate_q = np.where(self.revenue_by_rep >= 0, q, 1 - q)
+        rates = (scenario.growth - scenario.spread + 2 * scenario.spread * rate_q) / 100
+        return self._fixed(scenario) + self.revenue_by_rep * rates
+
+    def comparison(self, scenarios):
+        # Long frame for a grouped bar chart: the actual revenue and each
+        # scenario per salesperson, with the 10th-90th percentile range as
+        # distances below and above the projection (0 for deterministic
+        # scenarios).
+        salespeople = self.labels["Salesperson"]
+        frames = [
+            pd.DataFrame({
+                "Salesperson": salespeople,
+                "Revenue Type": "Revenue",
+                "Revenue Value": self.revenue_by_rep,
+                "Range Below": 0.0,
+                "Range Above": 0.0,
+            })
+        ]
+        for scenario in scenarios:
+            projected = self.project(scenario)
+            below = above = np.zeros(len(salespeople))
+            if scenario.spread:
+                low, high = self.quantiles(scenario)
+                below, above = np.maximum(projected - low, 0), np.maximum(high - projected, 0)
+            frames.append(pd.DataFrame({
+                "Salesperson": salespeople,
+                "Revenue Type": scenario.name,
+                "Revenue Value": projected,
+                "Range Below": below,
+                "Range Above": above,
+            }))
+        return pd.concat(frames, ignore_index=True)
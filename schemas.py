@@ -0,0 +1,185 @@
+import numpy as np
+import pandas as pd
+
+# --- Table Schemas ---
+# The compact dtype of every column, applied as a table is loaded: counts and
+# amounts are downcast to the narrowest integer that holds their range,
+# low-cardinality labels become categoricals and prefixed IDs ("CALL-001")
+# are stored as their integer part. Columns a schema does not list, and
+# columns already in the declared dtype, are left as they are. Real data is
+# checked before it is narrowed: integers that do not fit the declared dtype
+# (or are not whole numbers) keep the dtype they were loaded with, columns
+# with missing values get the nullable dtype ("Int8", "boolean"), and IDs
+# that are not all "<prefix><number>" become a categorical of the strings.
+# Date columns stay datetime64, which the rollups, streams, Parquet pushdown
+# and SQL backend compare as timestamps, except Aircall's: calls are only
+# ever grouped by day, so their Date is a categorical of days (2 bytes a row
+# instead of 8), and range filters compare its categories (data_sources.py).
+
+
+def to_integer(values, dtype):
+    # `values` as `dtype` if every present value fits, else unchanged.
+    if pd.api.types.is_bool_dtype(values.dtype) or not pd.api.types.is_numeric_dtype(values.dtype):
+        numbers = pd.to_numeric(values, errors="coerce")
+        if numbers.isna().sum() != values.isna().sum():
+            return values  # text that is not a number
+    else:
+        numbers = values
+    missing = numbers.isna().any()
+    present = numbers.dropna() if missing else numbers
+    if len(present):
+        info = np.iinfo(dtype)
+        if present.min() < info.min or present.max() > info.max:
+            return values
+        if pd.api.types.is_float_dtype(present.dtype) and not (np.mod(present.to_numpy(), 1) == 0).all():
+            return values
+    return numbers.astype(dtype.capitalize() if missing else dtype)
+
+
+def _convert(values, dtype):
+    if dtype.startswith("int"):
+        return to_integer(values, dtype)
+    if dtype == "bool" and values.isna().any():
+        return values.astype("boolean")
+    return values.astype(dtype)
+
+
+class IntegerId:
+    # "<prefix><zero-padded number>" stored as the number.
+    def __init__(self, prefix, dtype="int32"):
+        self.prefix = prefix
+        self.dtype = dtype
+
+    def encode(self, values):
+        if pd.api.types.is_numeric_dtype(values.dtype):
+            return to_integer(values, self.dtype)
+        digits = values.str.slice(len(self.prefix))
+        length = digits.str.len()
+        # Only IDs that decode back to themselves are stored as numbers:
+        # the prefix, then digits zero-padded to exactly three places.
+        valid = (
+            values.str.startswith(self.prefix)
+            & digits.str.isdigit()
+            & ((length == 3) | ((length > 3) & (length <= 18) & ~digits.str.startswith("0")))
+        )
+        if not (valid.fillna(False) | values.isna()).all():
+            return values.astype("category")
+        return to_integer(digits.astype("Int64" if values.isna().any() else "int64"), self.dtype)
+
+    def decode(self, values):
+        if not pd.api.types.is_integer_dtype(values.dtype):
+            return values  # stored as the strings (see encode)
+        return (self.prefix + values.astype(str).str.zfill(3)).where(values.notna())
+
+
+SCHEMAS = {
+    "pipeline": {
+        "Salesperson": "category",
+        "Region": "category",
+        "Revenue": "int32",
+        "Deals Closed": "int8",
+        "Pipeline Stage": "category",
+        "First Contact Made": "int8",
+        "Company": "category",
+        "Opportunity Value": "int32",
+        "Orders Placed": "int8",
+        "Invoices Issued": "int8",
+    },
+    "competition": {
+        "Salesperson": "category",
+        "Sales": "int8",
+        "Revenue": "int32",
+        "Leads": "int8",
+        "Customer Reviews": "int8",
+    },
+    "activity": {
+        "Salesperson": "category",
+        "Calls": "int16",
+        "Emails": "int16",
+        "Demos": "int8",
+        "Social Interactions": "int16",
+    },
+    "opportunities": {
+        "Opportunity ID": IntegerId("OPP-"),
+        "Salesperson": "category",
+        "Stage": "category",
+        "Value": "int32",
+        "Source": "category",
+        "Weighted Value": "float32",
+    },
+    "recruitment": {
+        "Applicant ID": IntegerId("APP-"),
+        "Job": "category",
+        "Stage": "category",
+        "Source": "category",
+        "Days to Hire": "int8",
+    },
+    "aircall": {
+        "Call ID": IntegerId("CALL-"),
+        "Salesperson": "category",
+        "Call Time (seconds)": "int16",
+        "Wait Time (seconds)": "int16",
+        "Missed Call": "bool",
+        "Date": "category",
+    },
+    "stage_transitions": {
+        "Deal ID": IntegerId("DEAL-"),
+        "Salesperson": "category",
+        "Region": "category",
+        "Stage": "category",
+    },
+    "roster": {
+        "Salesperson": "category",
+        "Team": "category",
+        "Region": "category",
+    },
+    "product_performance": {
+        "Product": "category",
+        "Revenue": "int32",
+    },
+}
+
+
+def compact(table, df):
+    schema = SCHEMAS.get(table, {})
+    converted = {}
+    for column, dtype in schema.items():
+        if column not in df.columns:
+            continue
+        if isinstance(dtype, IntegerId):
+            converted[column] = dtype.encode(df[column])
+        elif df[column].dtype != dtype:
+            converted[column] = _convert(df[column], dtype)
+    return df.assign(**converted) if converted else df
+
+
+def decode_ids(table, df):
+    # Back to the prefixed strings, e.g. for display or export.
+    schema = SCHEMAS.get(table, {})
+    decoded = {
+        column: dtype.decode(df[column])
+        for column, dtype in schema.items()
+        if isinstance(dtype, IntegerId) and column in df.columns
+    }
+    return df.assign(**decoded) if decoded else df
+
+
+def table_bytes(df):
+    return int(df.memory_usage(deep=True, index=False).sum())
+
+
+def schema_report(tables):
+    # Bytes per table before and after compact(); `tables` maps a table name
+    # to its frame as loaded without a schema.
+    rows = []
+    for table, df in tables.items():
+        before = table_bytes(df)
+        after = table_bytes(compact(table, df))
+        rows.append({
+            "Table": table,
+            "Rows": len(df),
+            "Bytes Before": before,
+            "Bytes After": after,
+            "Reduction": before / after if after else np.nan,
+        })
+    return pd.DataFrame(rows)
@@ -0,0 +1,120 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# --- Quantile Sketches ---
+# DDSketch-style sketches of one measure (e.g. talk time) per (day,
+# salesperson). A positive value v is counted in bucket ceil(log_gamma(v)),
+# gamma = (1 + a) / (1 - a), and a bucket reports its representative
+# 2 * gamma^k / (gamma + 1), which is within relative error a of every value
+# in it; values <= 0 share ZERO_KEY and report 0. Merging sketches is adding
+# their bucket counts, so the sketch of any date range and set of salespeople
+# is exact with respect to its parts and carries the same bound:
+#
+#   - a quantile is within a * x of the exact value x at the same rank
+#     (pandas interpolation="lower"), whatever the number of calls;
+#   - a histogram counts each value in the display bin of its bucket's
+#     representative, so only values within a * x of a bin edge can land in
+#     the neighbouring bin.
+#
+# Storage grows with the buckets actually hit (about log(max/min) / (2a) per
+# day and salesperson), not with the number of calls.
+# SALES_DASHBOARD_SKETCH_ACCURACY sets a (default 1%).
+SKETCH_ACCURACY = float(os.environ.get("SALES_DASHBOARD_SKETCH_ACCURACY", 0.01))
+SKETCH_QUANTILES = (0.5, 0.9, 0.99)
+ZERO_KEY = np.iinfo(np.int32).min
+
+
+def quantile_label(q):
+    return f"p{q * 100:g}"
+
+
+class QuantileSketches:
+    def __init__(self, accuracy=SKETCH_ACCURACY):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = np.log(self.gamma)
+        self.counts = None  # (Date, Salesperson, Bucket) -> values
+
+    def keys(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        keys = np.full(len(values), ZERO_KEY, dtype=np.int64)
+        positive = values > 0
+        keys[positive] = np.ceil(np.log(values[positive]) / self._log_gamma)
+        return keys
+
+    def values(self, keys):
+        keys = np.asarray(keys, dtype=np.int64)
+        powers = np.power(self.gamma, np.where(keys == ZERO_KEY, 0, keys).astype(np.float64))
+        return np.where(keys == ZERO_KEY, 0.0, 2 * powers / (self.gamma + 1))
+
+    @property
+    def nbytes(self):
+        return 0 if self.counts is None else int(self.counts.memory_usage(index=True, deep=True))
+
+    def update(self, days, salespeople, values):
+        # `days` and `salespeople` are aligned with `values` (one per call).
+        batch = pd.DataFrame({
+            "Date": np.asarray(days, dtype="datetime64[ns]"),
+            "Salesperson": pd.array(salespeople),
+            "Bucket": self.keys(values),
+        })
+        counts = batch.groupby(["Date", "Salesperson", "Bucket"], observed=True).size().astype("int64")
+        if self.counts is None:
+            self.counts = counts
+        else:
+            self.counts = self.counts.add(counts, fill_value=0).astype("int64")
+
+    # --- Queries ---
+    # Every query merges the sketches of the days in [start, end] (either may
+    # be None) and the given salespeople (everyone when None).
+    def _select(self, start=None, end=None, salespeople=None):
+        if self.counts is None:
+            return pd.Series(
+                [], dtype="int64",
+                index=pd.MultiIndex.from_tuples([], names=["Date", "Salesperson", "Bucket"]),
+            )
+        index = self.counts.index
+        days = index.get_level_values("Date")
+        mask = np.ones(len(index), dtype=bool)
+        if salespeople is not None:
+            mask &= index.get_level_values("Salesperson").isin(salespeople)
+        if start is not None:
+            mask &= days >= pd.Timestamp(start).normalize()
+        if end is not None:
+            mask &= days <= pd.Timestamp(end).normalize()
+        return self.counts[mask]
+
+    def merge(self, start=None, end=None, salespeople=None):
+        # Bucket -> values, ascending by bucket.
+        return self._select(start, end, salespeople).groupby(level="Bucket").sum()
+
+    def _quantiles(self, merged, quantiles):
+        counts = merged.to_numpy()
+        total = counts.sum()
+        if total == 0:
+            return np.full(len(quantiles), np.nan)
+        positions = np.searchsorted(np.cumsum(counts), np.asarray(quantiles) * (total - 1), side="right")
+        return self.values(merged.index.to_numpy()[positions])
+
+    def quantiles(self, quantiles=SKETCH_QUANTILES, start=None, end=None, salespeople=None):
+        values = self._quantiles(self.merge(start, end, salespeople), quantiles)
+        return pd.Series(values, index=[quantile_label(q) for q in quantiles])
+
+    def quantiles_by(self, level, quantiles=SKETCH_QUANTILES, start=None, end=None, salespeople=None):
+        # One row of quantiles per Date or Salesperson.
+        grouped = self._select(start, end, salespeople).groupby(level=[level, "Bucket"]).sum()
+        rows = {
+            name: self._quantiles(group.droplevel(0), quantiles)
+            for name, group in grouped.groupby(level=0)
+        }
+        return pd.DataFrame.from_dict(
+            rows, orient="index", columns=[quantile_label(q) for q in quantiles]
+        ).rename_axis(level)
+
+    def histogram(self, bin_width, start=None, end=None, salespeople=None):
+        # Counts per display bin of width `bin_width`, indexed by bin start.
+        merged = self.merge(start, end, salespeople)
+        bins = np.floor(self.values(merged.index.to_numpy()) / bin_width) * bin_width
+        return merged.groupby(bins).sum()
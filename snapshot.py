@@ -0,0 +1,162 @@
+import contextlib
+import hashlib
+import json
+import os
+import pickle
+import re
+import shutil
+import threading
+import time
+
+# --- Snapshots ---
+# A snapshot bundle holds the dashboard's results for its default views,
+# precomputed by build_snapshot.py: every cached_result() value (pickled,
+# under the hash of its result key) and every figure (plotly JSON). Bundles
+# are versioned directories under SALES_DASHBOARD_SNAPSHOT_DIR and LATEST
+# names the newest one. The app looks a result up in the latest bundle
+# before computing it; the key carries the table versions and the filter
+# state, so only views whose filters match the snapshot's (the defaults) and
+# whose data has not changed since are served from it.
+# Bundles are pickles: only point the app at bundles you built.
+SNAPSHOT_DIR = os.environ.get(
+    "SALES_DASHBOARD_SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshots"),
+)
+SNAPSHOT_FORMAT = 1
+
+
+def entry_name(key):
+    return hashlib.sha256(repr(key).encode()).hexdigest()
+
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+class SnapshotWriter:
+    def __init__(self, root=SNAPSHOT_DIR):
+        self.root = root
+        self.version = time.strftime("%Y%m%dT%H%M%S")
+        self.path = os.path.join(root, f".{self.version}.tmp")
+        os.makedirs(os.path.join(self.path, "results"))
+        os.makedirs(os.path.join(self.path, "figures"))
+        self.results = {}
+        self.figures = {}
+        self._lock = threading.Lock()
+
+    def add_result(self, key, value):
+        name = entry_name(key)
+        with self._lock:
+            if name in self.results:
+                return
+            with open(os.path.join(self.path, "results", f"{name}.pkl"), "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            self.results[name] = {
+                "tab": key[0],
+                "name": key[1],
+                "tables": {table: repr(version) for table, version in key[2]},
+            }
+
+    def add_figure(self, tab, title, fig):
+        slug = _slug(f"{tab} {title}")
+        with self._lock:
+            if slug in self.figures:
+                return
+            with open(os.path.join(self.path, "figures", f"{slug}.json"), "w") as f:
+                f.write(fig.to_json())
+            self.figures[slug] = {"tab": tab, "title": title}
+
+    def commit(self):
+        # The bundle appears under its version, then LATEST moves to it.
+        with open(os.path.join(self.path, "manifest.json"), "w") as f:
+            json.dump({
+                "format": SNAPSHOT_FORMAT,
+                "version": self.version,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "results": self.results,
+                "figures": self.figures,
+            }, f, indent=1)
+        final = os.path.join(self.root, self.version)
+        os.rename(self.path, final)
+        latest = os.path.join(self.root, "LATEST")
+        with open(f"{latest}.tmp", "w") as f:
+            f.write(self.version)
+        os.replace(f"{latest}.tmp", latest)
+        return final
+
+    def abort(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+class SnapshotReader:
+    # Follows LATEST; a newly committed bundle is picked up on the next lookup.
+    def __init__(self, root=SNAPSHOT_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        self._latest_mtime = None
+        self.path = None
+        self.manifest = None
+        self.hits = 0
+
+    def _current(self):
+        latest = os.path.join(self.root, "LATEST")
+        try:
+            mtime = os.stat(latest).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            if mtime != self._latest_mtime:
+                with open(latest) as f:
+                    path = os.path.join(self.root, f.read().strip())
+                with open(os.path.join(path, "manifest.json")) as f:
+                    manifest = json.load(f)
+                if manifest.get("format") != SNAPSHOT_FORMAT:
+                    path, manifest = None, None
+                self.path, self.manifest, self._latest_mtime = path, manifest, mtime
+            return self.manifest
+
+    def get(self, key):
+        manifest = self._current()
+        if manifest is None:
+            return None
+        name = entry_name(key)
+        if name not in manifest["results"]:
+            return None
+        with open(os.path.join(self.path, "results", f"{name}.pkl"), "rb") as f:
+            value = pickle.load(f)
+        self.hits += 1
+        return value
+
+    def stats(self):
+        manifest = self._current()
+        return {
+            "version": manifest["version"] if manifest else None,
+            "results": len(manifest["results"]) if manifest else 0,
+            "hits": self.hits,
+        }
+
+
+snapshot_reader = SnapshotReader()
+
+# The writer build_snapshot.py records into, while it drives the dashboard.
+_writer = None
+
+
+@contextlib.contextmanager
+def recording(writer):
+    global _writer
+    _writer = writer
+    try:
+        yield writer
+    finally:
+        _writer = None
+
+
+def record_result(key, value):
+    if _writer is not None:
+        _writer.add_result(key, value)
+
+
+def record_figure(tab, title, fig):
+    if _writer is not None:
+        _writer.add_figure(tab, title, fig)
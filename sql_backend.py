@@ -0,0 +1,171 @@
+import os
+import threading
+
+import pandas as pd
+
+from data_layer import load_index
+from data_sources import ParquetSource, get_source, normalize_filters
+
+# --- SQL Backend ---
+# With SALES_DASHBOARD_BACKEND=duckdb the tab aggregations below run as SQL in
+# an embedded DuckDB instead of pandas: multi-threaded, vectorized, and over
+# Parquet sources straight from the files, spilling to disk past
+# SALES_DASHBOARD_SQL_MEMORY (e.g. "4GB") rather than loading the table.
+# Synthetic tables are registered as the frames data_layer already caches
+# (load_index), so they are not generated again. Each session thread queries
+# on its own cursor, so sessions run their queries concurrently. Each query
+# returns the same small frame as its pandas path (benchmarks/sql_parity.py
+# checks this); date ranges are whole days, as in the rollups and streams.
+# Filters compare the raw columns with bound values, so DuckDB pushes them
+# into the Parquet scan. Stream feeds (SALES_DASHBOARD_*_FEED) are folded into
+# the pandas aggregates only, so the SQL answers cover what the source tables
+# hold; likewise a table without a Date column (an Aircall export without
+# one) is not narrowed by the date range, where the streams date its rows by
+# arrival.
+# DuckDB is optional: pip install duckdb.
+BACKEND = os.environ.get("SALES_DASHBOARD_BACKEND", "pandas")
+SQL_THREADS = int(os.environ.get("SALES_DASHBOARD_SQL_THREADS", os.cpu_count() or 1))
+SQL_MEMORY = os.environ.get("SALES_DASHBOARD_SQL_MEMORY")
+
+
+def _identifier(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(value):
+    # Views cannot take prepared parameters.
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def where(filters, columns=None):
+    # The shared filter dict as a WHERE clause and its parameters; filters on
+    # columns the table lacks are skipped.
+    clauses, params = [], []
+    for column, op, value in normalize_filters(filters):
+        if columns is not None and column not in columns:
+            continue
+        field = _identifier(column)
+        if op == "range":
+            if value[0] is not None:
+                clauses.append(f"{field} >= ?")
+                params.append(value[0].normalize().to_pydatetime())
+            if value[1] is not None:
+                clauses.append(f"{field} < ?")
+                params.append((value[1].normalize() + pd.Timedelta(days=1)).to_pydatetime())
+        elif value:
+            clauses.append(f"{field} IN ({', '.join('?' * len(value))})")
+            params.extend(v.item() if hasattr(v, "item") else v for v in value)
+        else:
+            clauses.append("FALSE")
+    return ("WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+class SQLBackend:
+    def __init__(self, backend=BACKEND, threads=SQL_THREADS, memory_limit=SQL_MEMORY):
+        self.enabled = backend == "duckdb"
+        self.threads = threads
+        self.memory_limit = memory_limit
+        self._connection = None
+        self._tables = {}  # name -> (source cache key, columns, frame or None)
+        self._lock = threading.Lock()
+        self._local = threading.local()  # this thread's cursor and registered frames
+
+    def _connect(self):
+        try:
+            import duckdb
+        except ImportError as exc:
+            raise ImportError("SALES_DASHBOARD_BACKEND=duckdb requires duckdb: pip install duckdb") from exc
+        connection = duckdb.connect()
+        connection.execute(f"SET threads = {int(self.threads)}")
+        if self.memory_limit:
+            connection.execute("SET memory_limit = ?", [self.memory_limit])
+        return connection
+
+    def _cursor(self):
+        # One cursor per thread on the shared database: Parquet views are in
+        # its catalog, but registered frames are only visible to the cursor
+        # that registered them, so each cursor registers its own.
+        local = self._local
+        if getattr(local, "cursor", None) is None:
+            with self._lock:
+                if self._connection is None:
+                    self._connection = self._connect()
+                local.cursor = self._connection.cursor()
+            local.registered = {}  # name -> source cache key
+        return local.cursor
+
+    def _table(self, name):
+        # Creates (or replaces after the source changes) a view named after
+        # the table, or registers its cached frame; returns its columns.
+        source = get_source(name)
+        key = source.cache_key()
+        cursor = self._cursor()
+        with self._lock:
+            table = self._tables.get(name)
+            if table is None or table[0] != key:
+                if isinstance(source, ParquetSource):
+                    files = ", ".join(_literal(path) for path in source.dataset.files)
+                    self._connection.execute(
+                        f"CREATE OR REPLACE VIEW {_identifier(name)} AS SELECT * FROM read_parquet([{files}])"
+                    )
+                    described = self._connection.execute(f"DESCRIBE {_identifier(name)}").fetchall()
+                    columns, frame = [row[0] for row in described], None
+                else:
+                    frame = load_index(name).frame
+                    columns = list(frame.columns)
+                table = (key, columns, frame)
+                self._tables[name] = table
+        key, columns, frame = table
+        if frame is not None and self._local.registered.get(name) != key:
+            cursor.register(name, frame)
+            self._local.registered[name] = key
+        return columns
+
+    def query(self, table, sql, filters=None):
+        # `sql` names the table by itself and has a {where} placeholder.
+        columns = self._table(table)
+        clause, params = where(filters, columns)
+        return self._cursor().execute(sql.format(where=clause), params).df()
+
+    # --- Queries ---
+    # One per tab aggregation, named after the pandas path it replaces.
+    def stage_totals(self, filters):
+        return self.query("pipeline", """
+            SELECT "Pipeline Stage", CAST(SUM("Revenue") AS BIGINT) AS "Revenue"
+            FROM pipeline {where} GROUP BY 1 ORDER BY 1
+        """, filters)
+
+    def leaderboard(self, start, end):
+        return self.query("competition", """
+            SELECT "Salesperson", CAST(SUM("Revenue") AS BIGINT) AS "Revenue", CAST(SUM("Sales") AS BIGINT) AS "Sales"
+            FROM competition {where} GROUP BY 1 ORDER BY 2 DESC, 1
+        """, {"Date": (start, end)})
+
+    def activity_totals(self, filters):
+        return self.query("activity", """
+            SELECT CAST(SUM("Calls") AS BIGINT) AS "Calls", CAST(SUM("Emails") AS BIGINT) AS "Emails",
+                   CAST(SUM("Demos") AS BIGINT) AS "Demos",
+                   CAST(SUM("Social Interactions") AS BIGINT) AS "Social Interactions"
+            FROM activity {where}
+        """, filters).fillna(0).astype("int64").iloc[0]
+
+    def call_time_leaderboard(self, filters):
+        return self.query("aircall", """
+            SELECT "Salesperson", CAST(SUM("Call Time (seconds)") AS BIGINT) AS "Call Time (seconds)"
+            FROM aircall {where} GROUP BY 1 ORDER BY 2 DESC, 1
+        """, filters)
+
+    def total_calls_leaderboard(self, filters):
+        return self.query("aircall", """
+            SELECT "Salesperson", COUNT(*) AS "Total Calls"
+            FROM aircall {where} GROUP BY 1 ORDER BY 2 DESC, 1
+        """, filters)
+
+    def product_revenue(self, filters):
+        return self.query("product_performance", """
+            SELECT "Product", CAST(SUM("Revenue") AS BIGINT) AS "Revenue"
+            FROM product_performance {where} GROUP BY 1 ORDER BY 1
+        """, filters)
+
+
+sql_backend = SQLBackend()
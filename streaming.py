@@ -0,0 +1,213 @@
+import json
+import os
+import queue
+import threading
+
+import pandas as pd
+
+from sketches import QuantileSketches
+
+# --- Feeds ---
+# A feed hands over new events (dicts keyed by the table's column names) in
+# micro-batches. QueueFeed is the in-process stand-in; FileTailFeed follows a
+# JSON-lines file that another process appends to.
+
+
+class QueueFeed:
+    def __init__(self, events=None):
+        self.queue = events if events is not None else queue.Queue()
+
+    def put(self, event):
+        self.queue.put(event)
+
+    def poll(self, max_events):
+        events = []
+        while len(events) < max_events:
+            try:
+                events.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+
+class FileTailFeed:
+    def __init__(self, path, from_start=True):
+        self.path = path
+        self.offset = 0
+        if not from_start and os.path.exists(path):
+            self.offset = os.path.getsize(path)
+
+    def poll(self, max_events):
+        if not os.path.exists(self.path):
+            return []
+        if os.path.getsize(self.path) < self.offset:
+            self.offset = 0  # truncated or rotated
+        events = []
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            while len(events) < max_events:
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    break  # end of file or a line still being written
+                self.offset += len(line)
+                if line.strip():
+                    events.append(json.loads(line))
+        return events
+
+
+# --- Running Aggregates ---
+# Each update() folds one micro-batch into totals that are small (salespeople,
+# or days x salespeople), so the tabs never rescan the event history.
+def _accumulate(totals, batch_totals):
+    if totals is None:
+        return batch_totals
+    return totals.add(batch_totals, fill_value=0).astype("int64")
+
+
+def _call_days(batch):
+    # Sources and feeds without a Date column date calls by the day they arrive.
+    if "Date" in batch:
+        return pd.to_datetime(batch["Date"]).dt.normalize().rename("Date")
+    return pd.Series(pd.Timestamp.now().normalize(), index=batch.index, name="Date")
+
+
+class AircallAggregates:
+    # Call totals per (day, salesperson), plus talk- and wait-time quantile
+    # sketches (sketches.py) at the same grain for the percentiles and the
+    # call-time histogram.
+    def __init__(self, bin_width=10):
+        self.bin_width = bin_width
+        self.daily = None  # (Date, Salesperson) -> Call Time, Calls, Missed Calls, Wait Time
+        self.talk_time = QuantileSketches()
+        self.wait_time = QuantileSketches()
+
+    def update(self, batch):
+        days = _call_days(batch)
+        grouped = batch.groupby([days, batch["Salesperson"]], observed=True).agg(**{
+            "Call Time": ("Call Time (seconds)", "sum"),
+            "Calls": ("Call Time (seconds)", "size"),
+            "Missed Calls": ("Missed Call", "sum"),
+            "Wait Time": ("Wait Time (seconds)", "sum"),
+        })
+        self.daily = _accumulate(self.daily, grouped.astype("int64")).sort_index()
+        self.talk_time.update(days, batch["Salesperson"], batch["Call Time (seconds)"])
+        self.wait_time.update(days, batch["Salesperson"], batch["Wait Time (seconds)"])
+
+    def salespeople(self):
+        if self.daily is None:
+            return []
+        return self.daily.index.get_level_values("Salesperson").unique().tolist()
+
+    def bounds(self):
+        days = self.daily.index.get_level_values("Date")
+        return days.min(), days.max()
+
+    def _select(self, salespeople, start=None, end=None):
+        if self.daily is None:
+            return pd.DataFrame(columns=["Call Time", "Calls", "Missed Calls", "Wait Time"], dtype="int64")
+        days = self.daily.index.get_level_values("Date")
+        mask = self.daily.index.get_level_values("Salesperson").isin(salespeople)
+        if start is not None:
+            mask &= days >= pd.Timestamp(start).normalize()
+        if end is not None:
+            mask &= days <= pd.Timestamp(end).normalize()
+        return self.daily[mask].groupby(level="Salesperson", observed=True).sum()
+
+    def metrics(self, salespeople, start=None, end=None):
+        totals = self._select(salespeople, start, end).sum()
+        calls = totals["Calls"]
+        return {
+            "avg_talk_time": totals["Call Time"] / calls if calls else float("nan"),
+            "avg_wait_time": totals["Wait Time"] / calls if calls else float("nan"),
+            "missed_call_rate": totals["Missed Calls"] / calls * 100 if calls else float("nan"),
+        }
+
+    def call_time_leaderboard(self, salespeople, start=None, end=None):
+        selected = self._select(salespeople, start, end)["Call Time"].sort_values(ascending=False)
+        return selected.rename("Call Time (seconds)").rename_axis("Salesperson").reset_index()
+
+    def total_calls_leaderboard(self, salespeople, start=None, end=None):
+        selected = self._select(salespeople, start, end)["Calls"].sort_values(ascending=False)
+        return selected.rename("Total Calls").rename_axis("Salesperson").reset_index()
+
+    def call_time_histogram(self, salespeople, start=None, end=None):
+        counts = self.talk_time.histogram(self.bin_width, start, end, salespeople)
+        return counts.rename("Count").rename_axis("Call Time (seconds)").reset_index()
+
+    def percentiles(self, salespeople, start=None, end=None):
+        # Talk and wait time percentiles over the selection, one row each.
+        return pd.DataFrame({
+            "Talk Time (seconds)": self.talk_time.quantiles(start=start, end=end, salespeople=salespeople),
+            "Wait Time (seconds)": self.wait_time.quantiles(start=start, end=end, salespeople=salespeople),
+        }).T
+
+    def percentiles_by(self, level, salespeople, start=None, end=None):
+        # Talk and wait time percentiles per Salesperson or per Date.
+        talk = self.talk_time.quantiles_by(level, start=start, end=end, salespeople=salespeople)
+        wait = self.wait_time.quantiles_by(level, start=start, end=end, salespeople=salespeople)
+        return pd.concat({"Talk Time": talk, "Wait Time": wait}, axis=1)
+
+
+ACTIVITY_MEASURES = ["Calls", "Emails", "Demos", "Social Interactions"]
+
+
+class ActivityAggregates:
+    def __init__(self):
+        self.daily = None  # (day, Salesperson) -> activity totals
+
+    def update(self, batch):
+        days = pd.to_datetime(batch["Date"]).dt.normalize().rename("Date")
+        grouped = batch.groupby([days, batch["Salesperson"]], observed=True)[ACTIVITY_MEASURES].sum()
+        self.daily = _accumulate(self.daily, grouped.astype("int64")).sort_index()
+
+    def salespeople(self):
+        if self.daily is None:
+            return []
+        return self.daily.index.get_level_values("Salesperson").unique().tolist()
+
+    def bounds(self):
+        days = self.daily.index.get_level_values("Date")
+        return days.min(), days.max()
+
+    def select(self, start_date, end_date, salespeople):
+        daily = self.daily.reset_index()
+        return daily[
+            (daily["Date"] >= pd.Timestamp(start_date))
+            & (daily["Date"] <= pd.Timestamp(end_date))
+            & (daily["Salesperson"].isin(salespeople))
+        ]
+
+
+# --- Streaming Tables ---
+class StreamingTable:
+    def __init__(self, aggregates, feed=None, max_batch=10_000):
+        self.aggregates = aggregates
+        self.feed = feed
+        self.max_batch = max_batch
+        self.events = 0
+        self.version = 0
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+
+    def ingest(self, batch):
+        if not isinstance(batch, pd.DataFrame):
+            batch = pd.DataFrame(batch)
+        if batch.empty:
+            return 0
+        with self._lock:
+            self.aggregates.update(batch)
+            self.events += len(batch)
+            self.version += 1
+        return len(batch)
+
+    def poll(self):
+        # Drain whatever the feed has buffered, one micro-batch at a time.
+        if self.feed is None:
+            return 0
+        ingested = 0
+        with self._poll_lock:
+            while True:
+                events = self.feed.poll(self.max_batch)
+                if not events:
+                    return ingested
+                ingested += self.ingest(events)
@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+
+from data_sources import normalize_filters
+
+# --- Table Index ---
+# A loaded table kept sorted by Date, with its low-cardinality columns
+# converted to categoricals. A date range becomes a binary-search slice and a
+# membership filter becomes an OR of per-code row bitmaps, so filtering a tab
+# never compares strings row by row.
+INDEXED_COLUMNS = ["Salesperson", "Region", "Pipeline Stage", "Stage", "Source", "Job", "Company", "Product"]
+
+# Packed bitmaps cost rows/8 bytes per code; above this many codes a column is
+# filtered with a code lookup table instead.
+BITMAP_MAX_CARDINALITY = 256
+
+
+class TableIndex:
+    def __init__(self, df, date_column="Date", indexed_columns=INDEXED_COLUMNS):
+        if date_column in df.columns:
+            df = df.sort_values(date_column, kind="stable").reset_index(drop=True)
+            self.dates = df[date_column].to_numpy()
+        else:
+            df = df.reset_index(drop=True)
+            self.dates = None
+        self.date_column = date_column
+        columns = [column for column in indexed_columns if column in df.columns]
+        df = df.assign(**{column: df[column].astype("category") for column in columns})
+        self.frame = df
+        self.codes = {}
+        self.bitmaps = {}
+        self.options = {}  # column -> distinct values in order of first appearance
+        for column in columns:
+            codes = df[column].cat.codes.to_numpy()
+            self.codes[column] = codes
+            self.options[column] = df[column].cat.categories.take(pd.unique(codes[codes >= 0])).tolist()
+            num_codes = len(df[column].cat.categories)
+            if num_codes <= BITMAP_MAX_CARDINALITY:
+                self.bitmaps[column] = [np.packbits(codes == code) for code in range(num_codes)]
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def nbytes(self):
+        bitmap_bytes = sum(bitmap.nbytes for bitmaps in self.bitmaps.values() for bitmap in bitmaps)
+        return int(self.frame.memory_usage(deep=True).sum()) + bitmap_bytes
+
+    def bounds(self):
+        return pd.Timestamp(self.dates[0]), pd.Timestamp(self.dates[-1])
+
+    def values(self, column):
+        # Sidebar options: built with the index, so reruns never scan for them.
+        options = self.options.get(column)
+        if options is None:
+            options = self.options[column] = self.frame[column].dropna().unique().tolist()
+        return options
+
+    def date_slice(self, start=None, end=None):
+        lo, hi = 0, len(self.frame)
+        if start is not None:
+            lo = int(np.searchsorted(self.dates, pd.Timestamp(start).to_datetime64(), side="left"))
+        if end is not None:
+            hi = int(np.searchsorted(self.dates, pd.Timestamp(end).to_datetime64(), side="right"))
+        return lo, max(lo, hi)
+
+    def _selected_codes(self, column, values):
+        categories = self.frame[column].cat.categories
+        codes = categories.get_indexer(list(values))
+        return np.unique(codes[codes >= 0])
+
+    def _bitmap(self, column, codes, first_byte, last_byte):
+        # OR of the selected codes' bitmaps over [first_byte, last_byte); when
+        # most codes are selected, negate the OR of the unselected ones.
+        bitmaps = self.bitmaps[column]
+        invert = len(codes) > len(bitmaps) // 2
+        if invert:
+            codes = np.setdiff1d(np.arange(len(bitmaps)), codes)
+        acc = np.zeros(last_byte - first_byte, dtype=np.uint8)
+        for code in codes:
+            np.bitwise_or(acc, bitmaps[code][first_byte:last_byte], out=acc)
+        return np.invert(acc, out=acc) if invert else acc
+
+    def positions(self, filters=None):
+        # Row positions matching `filters` (the data_sources filter dicts), or
+        # a (lo, hi) slice when only the date range narrows the rows.
+        lo, hi = 0, len(self.frame)
+        bitmap_filters = []
+        mask_filters = []
+        for column, op, value in normalize_filters(filters):
+            if op == "range" and column == self.date_column and self.dates is not None:
+                lo, hi = self.date_slice(*value)
+            elif op == "in" and column in self.codes:
+                codes = self._selected_codes(column, value)
+                if len(codes) == len(self.frame[column].cat.categories):
+                    continue
+                if column in self.bitmaps:
+                    bitmap_filters.append((column, codes))
+                else:
+                    mask_filters.append((column, op, codes))
+            else:
+                mask_filters.append((column, op, value))
+        if not bitmap_filters and not mask_filters:
+            return lo, hi
+
+        first_byte, last_byte = lo // 8, (hi + 7) // 8
+        bits = None
+        for column, codes in bitmap_filters:
+            bitmap = self._bitmap(column, codes, first_byte, last_byte)
+            bits = bitmap if bits is None else np.bitwise_and(bits, bitmap, out=bits)
+        offset = first_byte * 8
+        if bits is None:
+            mask = np.ones(hi - lo, dtype=bool)
+        else:
+            mask = np.unpackbits(bits)[lo - offset:hi - offset].astype(bool)
+        for column, op, value in mask_filters:
+            if op == "in" and column in self.codes:
+                allowed = np.zeros(len(self.frame[column].cat.categories), dtype=bool)
+                allowed[value] = True
+                mask &= allowed[self.codes[column][lo:hi]]
+            elif op == "range":
+                values = self.frame[column].to_numpy()[lo:hi]
+                if value[0] is not None:
+                    mask &= values >= value[0].to_datetime64()
+                if value[1] is not None:
+                    mask &= values <= value[1].to_datetime64()
+            else:
+                mask &= self.frame[column].iloc[lo:hi].isin(value).to_numpy()
+        return lo + np.flatnonzero(mask)
+
+    def filter(self, filters=None, columns=None):
+        frame = self.frame if columns is None else self.frame[list(columns)]
+        rows = self.positions(filters)
+        if isinstance(rows, tuple):
+            rows = slice(*rows)
+            result = frame.iloc[rows]
+        else:
+            result = frame.take(rows)
+        # Drop categories that no longer occur so value_counts() and groupby()
+        # only report what the filter kept. Done on the codes directly, which
+        # is much cheaper than Series.cat.remove_unused_categories().
+        compacted = {}
+        for column, codes in self.codes.items():
+            if column not in result.columns:
+                continue
+            kept = codes[rows]
+            categories = self.frame[column].cat.categories
+            used = np.bincount(kept[kept >= 0], minlength=len(categories)) > 0
+            if not used.all():
+                remap = np.where(kept >= 0, (np.cumsum(used) - 1)[kept], -1)
+                compacted[column] = pd.Series(
+                    pd.Categorical.from_codes(remap, categories[used]), index=result.index
+                )
+        return result.assign(**compacted) if compacted else result
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+from data_generation import STAGE_WEIGHTS
+
+# --- Weighting Engine ---
+# Weighted pipeline value for the Sales Opportunities tab, on top of the
+# opportunities' (Salesperson, Stage, Source) contingency tensor
+# (contingency.py): a weighted total is its Value tensor times one weight
+# vector per dimension. Changing a weight recomputes only that label's
+# slice of the weighted tensor, from its weight and the outer product of the
+# other dimensions' weights, so nothing rescans the opportunity rows. A
+# missing or non-finite weight (a cleared editor cell) falls back to the
+# label's default.
+WEIGHT_DIMENSIONS = ["Salesperson", "Stage", "Source"]
+
+
+class WeightingEngine:
+    def __init__(self, tensor, value_column="Value", stage_weights=None, source_weights=None, salesperson_weights=None):
+        self.tensor = tensor
+        self.labels = tensor.labels
+        self.values = tensor.sums[value_column]
+        self.counts = tensor.counts
+        self.weights = {dimension: np.ones(n) for dimension, n in zip(WEIGHT_DIMENSIONS, tensor.shape)}
+        self.defaults = {dimension: weights.copy() for dimension, weights in self.weights.items()}
+        self.weighted = self.values.copy()
+        self.set_weights("Stage", STAGE_WEIGHTS if stage_weights is None else stage_weights)
+        self.set_weights("Source", source_weights or {})
+        self.set_weights("Salesperson", salesperson_weights or {})
+        self.defaults = {dimension: weights.copy() for dimension, weights in self.weights.items()}
+
+    @property
+    def nbytes(self):
+        # The value and count tensors belong to the contingency tensor.
+        return self.weighted.nbytes
+
+    def copy(self):
+        # Shares the contingency tensor; weights are per copy.
+        engine = object.__new__(WeightingEngine)
+        engine.tensor = self.tensor
+        engine.labels = self.labels
+        engine.values = self.values
+        engine.counts = self.counts
+        engine.weights = {dimension: weights.copy() for dimension, weights in self.weights.items()}
+        engine.defaults = self.defaults
+        engine.weighted = self.weighted.copy()
+        return engine
+
+    def _slice(self, dimension, i):
+        index = [slice(None)] * len(WEIGHT_DIMENSIONS)
+        index[WEIGHT_DIMENSIONS.index(dimension)] = i
+        return tuple(index)
+
+    def set_weight(self, dimension, label, weight):
+        if label not in self.labels[dimension]:
+            return
+        i = self.labels[dimension].index(label)
+        weight = float(weight) if weight is not None else np.nan
+        if not np.isfinite(weight):
+            weight = self.defaults[dimension][i]
+        if self.weights[dimension][i] == weight:
+            return
+        self.weights[dimension][i] = weight
+        cells = self._slice(dimension, i)
+        others = [self.weights[other] for other in WEIGHT_DIMENSIONS if other != dimension]
+        self.weighted[cells] = self.values[cells] * (weight * np.multiply.outer(*others))
+
+    def set_weights(self, dimension, weights):
+        for label, weight in weights.items():
+            self.set_weight(dimension, label, weight)
+
+    def weight_table(self, dimension):
+        return pd.DataFrame({dimension: self.labels[dimension], "Weight": self.weights[dimension]})
+
+    def totals(self, salespeople=None, stages=None, sources=None):
+        cells = self.tensor.selection(dict(zip(WEIGHT_DIMENSIONS, (salespeople, stages, sources))))
+        return {
+            "count": int(self.counts[cells].sum()),
+            "value": float(self.values[cells].sum()),
+            "weighted_value": float(self.weighted[cells].sum()),
+        }
+
+    def weighted_values(self, df, value_column="Value"):
+        # Row-level weighted values: one code lookup per dimension.
+        factor = np.ones(len(df))
+        for dimension in WEIGHT_DIMENSIONS:
+            codes = pd.Categorical(df[dimension], categories=self.labels[dimension]).codes
+            factor *= np.where(codes >= 0, self.weights[dimension][codes], 0.0)
+        return df[value_column].to_numpy(dtype=np.float64) * factor